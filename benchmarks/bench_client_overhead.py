@@ -0,0 +1,321 @@
+"""
+Client-side overhead of every PetApi / StoreApi / FilesApi method: the time
+and memory our own stack (build_url, Logger.add_request/add_response, the
+allure steps, JSON encoding) adds on top of the bare session.request() it
+wraps. Both run against a zero-latency stand-in in a separate process, so
+only the client is timed and traced; each call alternates with its bare
+equivalent and the overhead is the median of the paired differences.
+
+Each case runs with logging off/on (NullLogger / buffered Logger at DEBUG)
+and allure off/on (no listener / a reporter collecting steps and attachments
+as allure-pytest does). Results go to --output as JSON; with a baseline the
+script exits 1 when a case's overhead or peak memory regressed.
+
+    python -m benchmarks.bench_client_overhead --calls 200
+    python -m benchmarks.bench_client_overhead --write-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import TestResult, TestStepResult
+from allure_commons.reporter import AllureReporter
+from allure_commons.utils import now
+
+from benchmarks.bench_uploads import free_port, start_stub
+from src.api.base_api import ApiClient
+from src.api.files_api import FilesApi
+from src.api.pet_api import PetApi
+from src.api.store_api import StoreApi
+from src.factories.file_factory import FileFactory
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+from utils.enums import PetStatus
+from utils.logger import LogLevel, Logger, NullLogger
+from utils.multipart import MultipartStream
+
+BASELINE = os.path.join(os.path.dirname(__file__), "client_overhead_baseline.json")
+CONFIGS = {
+    "logging=off allure=off": (False, False),
+    "logging=on allure=off": (True, False),
+    "logging=off allure=on": (False, True),
+    "logging=on allure=on": (True, True),
+}
+
+
+class AllureRecorder:
+    """Minimal allure listener: steps and attachments land in one open test result"""
+
+    def __init__(self, results_dir: str):
+        self.reporter = AllureReporter()
+        self.file_logger = AllureFileLogger(results_dir)
+        self.test_uuid = None
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.reporter.start_step(None, uuid, TestStepResult(name=title, start=now()))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        self.reporter.stop_step(uuid, stop=now())
+
+    @allure_commons.hookimpl
+    def attach_data(self, body, name, attachment_type, extension):
+        self.reporter.attach_data(uuid.uuid4(), body, name=name, attachment_type=attachment_type)
+
+    def __enter__(self):
+        allure_commons.plugin_manager.register(self.file_logger)
+        allure_commons.plugin_manager.register(self)
+        self.test_uuid = str(uuid.uuid4())
+        self.reporter.schedule_test(self.test_uuid, TestResult(uuid=self.test_uuid, name="overhead"))
+        return self
+
+    def __exit__(self, *exc):
+        self.reporter.drop_test(self.test_uuid)
+        allure_commons.plugin_manager.unregister(self)
+        allure_commons.plugin_manager.unregister(self.file_logger)
+
+
+class Stand:
+    """The API objects under test plus a bare session for the reference calls"""
+
+    def __init__(self, base_url: str, logger):
+        self.client = ApiClient(logger, base_url=base_url)
+        self.pets = PetApi(self.client)
+        self.store = StoreApi(self.client)
+        self.files = FilesApi(logger, base_url=base_url, session=self.client.session)
+        self.session = self.client.session
+        self.base_url = base_url.rstrip("/")
+
+    def raw(self, method: str, path: str, **kwargs):
+        return self.session.request(method, self.base_url + path, timeout=30, **kwargs)
+
+    def created_pets(self, n: int) -> list:
+        pets = list(PetFactory.batch(n))
+        for pet in pets:
+            self.raw("POST", "/pet", json=pet)
+        return pets
+
+    def created_orders(self, n: int) -> list:
+        orders = list(OrderFactory.batch(n, pet_ids=[pet["id"] for pet in self.created_pets(1)]))
+        for order in orders:
+            self.raw("POST", "/store/order", json=order)
+        return orders
+
+
+def with_multipart(pet_id: int, image) -> tuple:
+    """(pet_id, image, prebuilt multipart body, its content type) for the bare upload"""
+    with MultipartStream({}, {"file": image}) as body:
+        return pet_id, image, body.read(), body.content_type
+
+
+# name -> (prepare(stand, n) -> n call arguments, client call, bare call)
+CASES = {
+    "PetApi.add_pet": (
+        lambda s, n: list(PetFactory.batch(n)),
+        lambda s, pet: s.pets.add_pet(pet),
+        lambda s, pet: s.raw("POST", "/pet", json=pet),
+    ),
+    "PetApi.update_pet": (
+        lambda s, n: s.created_pets(n),
+        lambda s, pet: s.pets.update_pet({**pet, "name": "updated"}),
+        lambda s, pet: s.raw("PUT", "/pet", json={**pet, "name": "updated"}),
+    ),
+    "PetApi.find_pet_by_id": (
+        lambda s, n: [pet["id"] for pet in s.created_pets(n)],
+        lambda s, pet_id: s.pets.find_pet_by_id(pet_id),
+        lambda s, pet_id: s.raw("GET", f"/pet/{pet_id}"),
+    ),
+    "PetApi.find_pet_by_status": (
+        lambda s, n: [PetStatus.PENDING] * n,
+        lambda s, status: s.pets.find_pet_by_status(status),
+        lambda s, status: s.raw("GET", f"/pet/findByStatus?status={status.value}"),
+    ),
+    "PetApi.iter_pets_by_status": (
+        lambda s, n: [PetStatus.PENDING] * n,
+        lambda s, status: list(s.pets.iter_pets_by_status(status)),
+        lambda s, status: s.raw("GET", f"/pet/findByStatus?status={status.value}").json(),
+    ),
+    "PetApi.update_pet_with_form_data": (
+        lambda s, n: [pet["id"] for pet in s.created_pets(n)],
+        lambda s, pet_id: s.pets.update_pet_with_form_data(pet_id, "updated", "sold"),
+        lambda s, pet_id: s.raw(
+            "POST", f"/pet/{pet_id}", data={"name": "updated", "status": "sold"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        ),
+    ),
+    "PetApi.delete_pet": (
+        lambda s, n: [pet["id"] for pet in s.created_pets(n)],
+        lambda s, pet_id: s.pets.delete_pet(pet_id),
+        lambda s, pet_id: s.raw("DELETE", f"/pet/{pet_id}"),
+    ),
+    "StoreApi.get_inventory": (
+        lambda s, n: [None] * n,
+        lambda s, _: s.store.get_inventory(),
+        lambda s, _: s.raw("GET", "/store/inventory"),
+    ),
+    "StoreApi.place_order": (
+        lambda s, n: list(OrderFactory.batch(n, pet_ids=[1])),
+        lambda s, order: s.store.place_order(order),
+        lambda s, order: s.raw("POST", "/store/order", json=order),
+    ),
+    "StoreApi.get_info_about_placed_order_by_id": (
+        lambda s, n: [order["id"] for order in s.created_orders(n)],
+        lambda s, order_id: s.store.get_info_about_placed_order_by_id(order_id),
+        lambda s, order_id: s.raw("GET", f"/store/order/{order_id}"),
+    ),
+    "StoreApi.delete_placed_order": (
+        lambda s, n: [order["id"] for order in s.created_orders(n)],
+        lambda s, order_id: s.store.delete_placed_order(order_id),
+        lambda s, order_id: s.raw("DELETE", f"/store/order/{order_id}"),
+    ),
+    "FilesApi.upload_image": (
+        lambda s, n: [
+            with_multipart(pet["id"], FileFactory.synthetic_image(16 * 1024)) for pet in s.created_pets(n)
+        ],
+        lambda s, arg: s.files.upload_image(arg[0], arg[1]),
+        lambda s, arg: s.raw(
+            "POST", f"/pet/{arg[0]}/uploadImage", data=arg[2], headers={"Content-Type": arg[3]}
+        ),
+    ),
+}
+
+
+def timed(stand: Stand, case: tuple, calls: int) -> tuple:
+    """
+    (median client us, median bare us, median of the paired differences us):
+    the two calls alternate, so drift (e.g. a growing store) cancels out
+    """
+    prepare, client_call, bare_call = case
+    client_args, bare_args = prepare(stand, calls), prepare(stand, calls)
+    client_times, bare_times = [], []
+    for client_arg, bare_arg in zip(client_args, bare_args):
+        started = time.perf_counter()
+        bare_call(stand, bare_arg)
+        bare_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        client_call(stand, client_arg)
+        client_times.append(time.perf_counter() - started)
+    return (
+        statistics.median(client_times) * 1e6,
+        statistics.median(bare_times) * 1e6,
+        statistics.median(c - b for c, b in zip(client_times, bare_times)) * 1e6,
+    )
+
+
+def traced(stand: Stand, call, args: list) -> tuple:
+    """(median peak KB above the pre-call level, retained bytes per call)"""
+    peaks = []
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for arg in args:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        call(stand, arg)
+        peaks.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+    retained = (tracemalloc.get_traced_memory()[0] - start) / len(args)
+    tracemalloc.stop()
+    return statistics.median(peaks), retained
+
+
+def measure(calls: int, traced_calls: int, work_dir: str) -> dict:
+    """Every config gets a fresh stand-in, so the store doesn't grow from one config to the next"""
+    results = {}
+    for config, (logging, allure_on) in CONFIGS.items():
+        port = free_port()
+        stub = start_stub(port)
+        base_url = f"http://127.0.0.1:{port}/v2"
+        Logger.file_name = os.path.join(work_dir, f"{config.replace(' ', '_')}.log")
+        Logger.level, Logger.writer = LogLevel.DEBUG, None
+        stand = Stand(base_url, Logger if logging else NullLogger)
+        recorder = AllureRecorder(os.path.join(work_dir, "allure")) if allure_on else None
+        if recorder:
+            recorder.__enter__()
+        results[config] = {}
+        try:
+            for name, case in CASES.items():
+                client_us, bare_us, overhead_us = timed(stand, case, calls)
+                peak_kb, retained = traced(stand, case[1], case[0](stand, traced_calls))
+                bare_peak_kb, _ = traced(stand, case[2], case[0](stand, traced_calls))
+                results[config][name] = {
+                    "client_us": round(client_us, 1),
+                    "bare_us": round(bare_us, 1),
+                    "overhead_us": round(overhead_us, 1),
+                    "peak_kb": round(peak_kb, 1),
+                    "bare_peak_kb": round(bare_peak_kb, 1),
+                    "retained_bytes_per_call": round(retained),
+                }
+        finally:
+            if recorder:
+                recorder.__exit__(None, None, None)
+            Logger.close()
+            stand.client.close()
+            stub.terminate()
+            stub.wait()
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float, slack_us: float, slack_kb: float) -> list:
+    found = []
+    for config, cases in results.items():
+        for name, current in cases.items():
+            before = baseline.get(config, {}).get(name)
+            if before is None:
+                continue
+            if current["overhead_us"] > max(before["overhead_us"], 0) * (1 + tolerance) + slack_us:
+                found.append(f"{config} {name}: overhead {before['overhead_us']} -> {current['overhead_us']} us")
+            if current["peak_kb"] > before["peak_kb"] * (1 + tolerance) + slack_kb:
+                found.append(f"{config} {name}: peak {before['peak_kb']} -> {current['peak_kb']} KB")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--traced-calls", type=int, default=30)
+    parser.add_argument("--output", default="output/benchmarks/client_overhead.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative growth")
+    parser.add_argument("--slack-us", type=float, default=50)
+    parser.add_argument("--slack-kb", type=float, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = measure(args.calls, args.traced_calls, work_dir)
+
+    print(f"{'case':<45} {'config':<24} {'overhead':>10} {'client':>10} {'peak':>9} {'retained':>9}")
+    for config, cases in results.items():
+        for name, row in cases.items():
+            print(
+                f"{name:<45} {config:<24} {row['overhead_us']:8.1f}us {row['client_us']:8.1f}us "
+                f"{row['peak_kb']:7.1f}KB {row['retained_bytes_per_call']:8d}B"
+            )
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"calls": args.calls, "results": results}, file, indent=2)
+    if args.write_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            found = regressions(results, json.load(file), args.tolerance, args.slack_us, args.slack_kb)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
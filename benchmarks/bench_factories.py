@@ -0,0 +1,50 @@
+"""
+Payloads/sec of the per-call PetFactory.default_pet() / OrderFactory.default_order()
+against the lazy PetFactory.batch() / OrderFactory.batch() generators.
+
+    python -m benchmarks.bench_factories --payloads 100000
+"""
+
+import argparse
+import time
+
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+
+
+def rate(payloads, total: int) -> float:
+    started = time.perf_counter()
+    for _ in payloads:
+        pass
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payloads", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    total = args.payloads
+
+    cases = [
+        (
+            "pets",
+            lambda: (PetFactory.default_pet() for _ in range(total)),
+            lambda: PetFactory.batch(total, seed=args.seed),
+        ),
+        (
+            "orders",
+            lambda: (OrderFactory.default_order() for _ in range(total)),
+            lambda: OrderFactory.batch(total, seed=args.seed),
+        ),
+    ]
+    for name, per_call, batch in cases:
+        before = rate(per_call(), total)
+        after = rate(batch(), total)
+        print(
+            f"{name:<7} per-call={before:10.0f}/s  batch={after:10.0f}/s  x{after / before:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
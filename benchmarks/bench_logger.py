@@ -0,0 +1,74 @@
+"""
+Per-request logging overhead (one add_request + add_response pair) of the
+old synchronous open/append/close writer against the buffered LogWriter,
+plus the end-to-end cost (hot path + writer drain) for a large response
+body such as /pet/findByStatus with truncation or level filtering.
+
+    python -m benchmarks.bench_logger --requests 20000 --body-kb 2048
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from utils.logger import LogFormat, LogLevel, Logger
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, size: int):
+        item = b'{"id": 1, "name": "Rex", "status": "available"},'
+        self._content = self.content = b"[" + item * max(size // len(item), 1) + b"]"
+
+
+def log_requests(total: int, response) -> float:
+    body = {"id": 1, "name": "Rex"}
+    started = time.perf_counter()
+    for _ in range(total):
+        Logger.add_request("http://127.0.0.1/v2/pet", method="POST", body=body)
+        Logger.add_response(response, body=body)
+    return time.perf_counter() - started
+
+
+def scenario(log_dir: str, name: str, total: int, response, buffered=True, **settings):
+    Logger.level, Logger.log_format, Logger.max_body_chars = LogLevel.DEBUG, LogFormat.TEXT, None
+    Logger.configure(**settings)
+    Logger.buffered = buffered
+    Logger.file_name = os.path.join(log_dir, f"{name}.log")
+    Logger.writer = None
+    hot = log_requests(total, response)
+    started = time.perf_counter()
+    Logger.close()
+    drain = time.perf_counter() - started
+    size = os.path.getsize(Logger.file_name) if os.path.exists(Logger.file_name) else 0
+    print(
+        f"{name:<24} hot path {hot / total * 1e6:9.2f} us/request   "
+        f"hot+drain {(hot + drain) / total * 1e6:9.2f} us/request   "
+        f"{size / 2 ** 20:8.1f} MB written"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--body-kb", type=int, default=2048)
+    args = parser.parse_args()
+
+    small, large = FakeResponse(64), FakeResponse(args.body_kb * 1024)
+    large_total = max(args.requests // 200, 10)
+    with tempfile.TemporaryDirectory() as log_dir:
+        scenario(log_dir, "small sync", args.requests, small, buffered=False)
+        scenario(log_dir, "small buffered", args.requests, small)
+        scenario(log_dir, "small jsonl", args.requests, small, log_format=LogFormat.JSONL)
+        scenario(log_dir, "small level=ERROR", args.requests, small, level=LogLevel.ERROR)
+        print(f"-- {large_total} responses of {args.body_kb} KB --")
+        scenario(log_dir, "large sync full body", large_total, large, buffered=False)
+        scenario(log_dir, "large buffered full", large_total, large)
+        scenario(log_dir, "large max_body=2000", large_total, large, max_body_chars=2000)
+        scenario(log_dir, "large level=ERROR", large_total, large, level=LogLevel.ERROR)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Memory per object and throughput of the __slots__ Pet/Order models against
+the plain dicts: bytes a parsed /pet/findByStatus listing retains
+(tracemalloc), items/s parsing and serializing the listing (json alone
+against json plus from_json/to_json) and a two-field partial update
+(dict copy + update against merge()).
+
+    python -m benchmarks.bench_models --items 100000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+from src.models.pet import Pet
+from src.models.store import Order
+
+
+def retained(build) -> tuple:
+    """(bytes per item that build() leaves allocated, its result)"""
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(items), items
+
+
+def rate(total: int, run) -> float:
+    started = time.perf_counter()
+    run()
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+    total = args.items
+
+    cases = [
+        (
+            "pets",
+            Pet,
+            list(PetFactory.batch(total, seed=1, status=("available", "pending", "sold"))),
+            {"name": "Alfredicus", "status": "sold"},
+        ),
+        ("orders", Order, list(OrderFactory.batch(total, seed=1)), {"status": "delivered", "complete": True}),
+    ]
+    for name, model, payloads, update in cases:
+        body = json.dumps(payloads)
+        dict_bytes, dicts = retained(lambda: json.loads(body))
+        model_bytes, models = retained(lambda: [model.from_json(item) for item in json.loads(body)])
+        print(f"{name}: {total} items, {len(body) / 2 ** 20:.1f} MB of JSON")
+        print(f"  retained     dict {dict_bytes:8.0f} B/item  model {model_bytes:8.0f} B/item  "
+              f"x{dict_bytes / model_bytes:.1f}")
+
+        def dict_update():
+            for item in dicts:
+                copied = item.copy()
+                copied.update(update)
+
+        results = [
+            (
+                "parse",
+                rate(total, lambda: json.loads(body)),
+                rate(total, lambda: [model.from_json(item) for item in json.loads(body)]),
+            ),
+            (
+                "serialize",
+                rate(total, lambda: json.dumps(dicts)),
+                rate(total, lambda: json.dumps([item.to_json() for item in models])),
+            ),
+            ("update", rate(total, dict_update), rate(total, lambda: [item.merge(update) for item in models])),
+        ]
+        for case, before, after in results:
+            print(f"  {case:<12} dict {before:10.0f}/s  model {after:10.0f}/s  x{after / before:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Items/sec validating a large /pet/findByStatus payload: the ad-hoc key loop
+the tests used (required keys only) against the compiled PET schema (keys,
+types, status enum, nested category/tags), on parsed items and end to end
+through the streaming parser.
+
+    python -m benchmarks.bench_schemas --pets 200000
+"""
+
+import argparse
+import json
+import time
+
+from src.factories.pet_factory import PetFactory
+from utils.json_stream import iter_json_array
+from utils.schemas import PET
+
+
+def key_loop(pet):
+    assert isinstance(pet, dict), f"Expected pet object, got {pet!r}"
+    for key in ["id", "category", "name", "photoUrls", "tags", "status"]:
+        assert key in pet, f"Missing key in response: {key}"
+    assert isinstance(pet["id"], int)
+
+
+def rate(total: int, run) -> float:
+    started = time.perf_counter()
+    run()
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pets", type=int, default=200000)
+    args = parser.parse_args()
+
+    pets = list(PetFactory.batch(args.pets, seed=1))
+    body = json.dumps(pets).encode()
+    chunks = [body[i:i + 64 * 1024] for i in range(0, len(body), 64 * 1024)]
+    print(f"{args.pets} pets, {len(body) / 2 ** 20:.1f} MB")
+
+    def loop_all():
+        for pet in pets:
+            key_loop(pet)
+
+    def streamed():
+        report = PET.batch(iter_json_array(chunks))
+        assert report.ok, report.summary()
+
+    def parse_only():
+        for _ in iter_json_array(chunks):
+            pass
+
+    results = [
+        ("key loop (parsed)", rate(args.pets, loop_all)),
+        ("PET.errors (parsed)", rate(args.pets, lambda: [PET.errors(pet) for pet in pets])),
+        ("PET.batch (parsed)", rate(args.pets, lambda: PET.batch(pets))),
+        ("stream parse only", rate(args.pets, parse_only)),
+        ("stream + PET.batch", rate(args.pets, streamed)),
+    ]
+    for name, items_per_s in results:
+        print(f"{name:<22} {items_per_s:12.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
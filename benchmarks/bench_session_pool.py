@@ -0,0 +1,55 @@
+"""
+Requests/sec of the old per-call requests.<verb>() against the pooled
+ApiClient session, measured against the local stand-in server.
+
+    python -m benchmarks.bench_session_pool --requests 2000 --threads 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.api.base_api import ApiClient
+from utils.logger import NullLogger
+from utils.petstore_stub import PetstoreStub
+
+
+def unpooled_get(url: str):
+    return requests.get(url, timeout=30)
+
+
+def run(call, total: int, threads: int) -> float:
+    started = time.perf_counter()
+    if threads == 1:
+        for _ in range(total):
+            call()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(call) for _ in range(total)]:
+                future.result()
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with PetstoreStub() as stub:
+        client = ApiClient(NullLogger, base_url=stub.base_url, pool_size=args.threads)
+        url = client.build_url("/store/inventory")
+        for threads in sorted({1, args.threads}):
+            before = run(lambda: unpooled_get(url), args.requests, threads)
+            after = run(lambda: client.get("/store/inventory"), args.requests, threads)
+            print(
+                f"threads={threads:<3} before={before:8.0f} req/s  "
+                f"after={after:8.0f} req/s  x{after / before:.2f}"
+            )
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
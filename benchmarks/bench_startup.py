@@ -0,0 +1,141 @@
+"""
+Startup cost of the harness, paid again by every xdist worker: import time of
+each project module (cumulative, from python -X importtime in a fresh
+interpreter) and wall time of pytest --collect-only per test module.
+Each case is the median of --repeat runs; with a budget file the script
+exits 1 when any case exceeds its budget or has none (a new module or test
+file needs --write-budget, so the gate can't go stale unnoticed).
+
+Budgets are multiples of a reference measured in the same run, so they hold
+on a faster or slower machine: import cases of `import requests`, collect
+cases of collecting an empty test file outside the repo (interpreter and
+plugin startup without the harness). --write-budget stores
+(ms * --headroom + --slack-ms) / reference.
+
+    python -m benchmarks.bench_startup                  # check against benchmarks/startup_budget.json
+    python -m benchmarks.bench_startup --write-budget   # accept current timings
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODULES = [
+    "src.api.base_api",
+    "src.api.pet_api",
+    "src.api.store_api",
+    "src.api.files_api",
+    "src.api.async_base_api",
+    "src.factories.pet_factory",
+    "src.factories.order_factory",
+    "utils.logger",
+    "utils.entity_pool",
+    "utils.cassette",
+    "utils.petstore_stub",
+    "utils.durations",
+    "utils.resource_tracker",
+    "src.api.rate_limiter",
+    "src.api.single_flight",
+    "src.models.pet",
+    "src.models.store",
+]
+BUDGET = os.path.join(os.path.dirname(__file__), "startup_budget.json")
+REFERENCE_MODULE = "requests"
+
+
+def import_ms(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package" -- top level has no indent
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith("  "):
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"{module} missing from -X importtime output")
+
+
+def collect_ms(test_file: str, cwd: str = None) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider",
+            "-o", "addopts=", test_file,  # no html/allure output from a collect-only run
+        ],
+        capture_output=True, check=True, cwd=cwd,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(repeat: int) -> tuple:
+    """(ms per case, ms of the reference per case kind)"""
+    cases = {f"import {module}": (import_ms, module) for module in MODULES}
+    for test_file in sorted(glob.glob("tests/test_*.py")):
+        cases[f"collect {test_file}"] = (collect_ms, test_file)
+    timings = {
+        name: statistics.median(func(arg) for _ in range(repeat)) for name, (func, arg) in cases.items()
+    }
+    with tempfile.TemporaryDirectory() as empty:
+        with open(os.path.join(empty, "test_empty.py"), "w", encoding="utf-8") as file:
+            file.write("def test_empty():\n    pass\n")
+        references = {
+            "import": statistics.median(import_ms(REFERENCE_MODULE) for _ in range(repeat)),
+            "collect": statistics.median(collect_ms("test_empty.py", cwd=empty) for _ in range(repeat)),
+        }
+    return timings, references
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", default=BUDGET)
+    parser.add_argument("--write-budget", action="store_true")
+    parser.add_argument("--headroom", type=float, default=1.5)
+    parser.add_argument("--slack-ms", type=float, default=10, help="added to every budget, absorbs noise")
+    args = parser.parse_args()
+
+    timings, references = measure(args.repeat)
+    print(
+        f"reference: import {REFERENCE_MODULE} {references['import']:.1f} ms, "
+        f"collect an empty test file {references['collect']:.1f} ms"
+    )
+    if args.write_budget:
+        ratios = {
+            name: round((ms * args.headroom + args.slack_ms) / references[name.split()[0]], 3)
+            for name, ms in timings.items()
+        }
+        with open(args.budget, "w", encoding="utf-8") as file:
+            json.dump(ratios, file, indent=2)
+            file.write("\n")
+        print(f"budget written to {args.budget}")
+
+    budget = {}
+    if os.path.exists(args.budget):
+        with open(args.budget, encoding="utf-8") as file:
+            budget = json.load(file)
+    over = []
+    for name, ms in timings.items():
+        limit = budget.get(name)
+        if limit is not None:
+            limit *= references[name.split()[0]]
+        if limit is None:
+            flag = "  NO BUDGET" if budget else ""
+        else:
+            flag = "" if ms <= limit else "  OVER BUDGET"
+        print(f"{name:<45} {ms:8.1f} ms" + (f"  (budget {limit:.1f})" if limit else "") + flag)
+        if flag:
+            over.append(name)
+    if over:
+        print(f"{len(over)} startup case(s) over budget or without one")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Image upload throughput (MB/s) and client-side peak memory of the old
+requests.post(files={"file": open(...)}) upload, which builds the whole
+multipart body in memory, against the streaming FilesApi.upload_image, plus
+bulk FilesApi.upload_images at increasing concurrency. The stand-in server
+runs in a separate process so only the client's memory is traced.
+
+    python -m benchmarks.bench_uploads --sizes-mb 1 16 64 --bulk 64
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+from src.api.files_api import FilesApi
+from src.factories.file_factory import FileFactory
+from utils.logger import NullLogger
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub(port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "utils.petstore_stub", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Petstore stub did not start")
+
+
+def traced(upload) -> tuple:
+    """(seconds, peak traced MB) of one upload"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = upload()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    assert response.status_code == 200, response.text
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--bulk", type=int, default=64, help="number of 1 MB images for bulk uploads")
+    args = parser.parse_args()
+
+    port = free_port()
+    stub = start_stub(port)
+    api = FilesApi(NullLogger, base_url=f"http://127.0.0.1:{port}/v2", pool_size=16)
+    url = api.build_url("/pet/1/uploadImage")
+    try:
+        for size_mb in args.sizes_mb:
+            size = int(size_mb * 1e6)
+            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as file:
+                file.write(FileFactory.synthetic_image(size)[1])
+            try:
+                def old_upload():
+                    with open(file.name, "rb") as image:
+                        return requests.post(url, files={"file": image}, timeout=60)
+
+                before, before_peak = traced(old_upload)
+                after, after_peak = traced(lambda: api.upload_image(1, file.name))
+            finally:
+                os.remove(file.name)
+            print(
+                f"{size_mb:>6.1f} MB  before={size / 1e6 / before:7.1f} MB/s peak {before_peak:7.1f} MB  "
+                f"after={size / 1e6 / after:7.1f} MB/s peak {after_peak:7.1f} MB"
+            )
+
+        image = FileFactory.synthetic_image(1_000_000)
+        for concurrency in (1, 4, 16):
+            report = api.upload_images([(1, image)] * args.bulk, concurrency=concurrency)
+            print(f"bulk concurrency={concurrency:<3} {report.summary()}")
+    finally:
+        api.close()
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import asyncio
+import functools
+import inspect
+import json
+
+from src.api.base_api import DEFAULT_BASE_URL, ApiClient
+from src.api.single_flight import AsyncSingleFlight
+from utils.lazy import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+allure = lazy_import("allure")
+
+
+def async_step(title: str):
+    """
+    allure.step for coroutines. allure nests a new step under whichever step
+    is open in the thread, so steps held open across an await would nest the
+    concurrent tasks into each other; the step is reported when the call
+    finishes, and a call that raises reports it failed with the exception.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            name = title.format(**signature.bind(*args, **kwargs).arguments)
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                with allure.step(name):
+                    raise
+            with allure.step(name):
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+async def _closing(session: "aiohttp.ClientSession"):
+    """Closes the session when its loop shuts down its async generators (asyncio.run() does)"""
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+class AsyncResponse:
+    """Fully read aiohttp response exposing the requests.Response attributes the tests use"""
+
+    def __init__(self, status_code: int, headers, content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncApiClient:
+
+    build_url = ApiClient.build_url
+
+    def __init__(
+        self,
+        logger,
+        base_url: str = DEFAULT_BASE_URL,
+        pool_size: int = 100,
+        timeout: float = 30,
+        single_flight: AsyncSingleFlight = None,
+    ):
+        """
+        The aiohttp session is created lazily inside the running event loop,
+        one per loop the client is used from (e.g. one asyncio.run() per
+        test). It is closed by aclose() in that loop or, failing that, when
+        the loop shuts down its async generators, as asyncio.run() does.
+        With single_flight set, concurrent identical GETs share one request.
+        """
+        self.base_url = base_url
+        self.logger = logger
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.single_flight = single_flight
+        self._sessions = {}  # loop -> (session, _closing generator)
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(loop)
+        if entry is None or entry[0].closed:
+            for finished in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[finished]
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, limit_per_host=self.pool_size
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            entry = self._sessions[loop] = (session, _closing(session))
+            await entry[1].__anext__()  # starting it registers it with the loop
+        return entry[0]
+
+    async def aclose(self):
+        """Closes the session of the running loop"""
+        entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def request(self, method: str, resource: str, body=None, **kwargs) -> AsyncResponse:
+        url = self.build_url(resource)
+        self.logger.add_request(url, method=method, body=body)
+        if self.single_flight is not None and method == "GET":
+            response = await self.single_flight.do(
+                resource, kwargs.get("params"), lambda: self._fetch(method, url, kwargs)
+            )
+        else:
+            try:
+                response = await self._fetch(method, url, kwargs)
+            finally:
+                if self.single_flight is not None:
+                    self.single_flight.invalidate()
+        self.logger.add_response(response, body=body)
+        return response
+
+    async def _fetch(self, method: str, url: str, kwargs: dict) -> AsyncResponse:
+        session = await self._get_session()
+        async with session.request(method, url, **kwargs) as raw:
+            return AsyncResponse(raw.status, raw.headers, await raw.read(), url)
+
+    async def get(self, resource: str, params: dict = None) -> AsyncResponse:
+        return await self.request("GET", resource, body=params, params=params)
+
+    async def post(self, resource: str, body: dict) -> AsyncResponse:
+        return await self.request("POST", resource, body=body, json=body)
+
+    async def delete(self, resource: str, params: dict = None) -> AsyncResponse:
+        return await self.request("DELETE", resource, body=params, params=params)
+
+    async def put(self, resource: str, body: dict) -> AsyncResponse:
+        return await self.request("PUT", resource, body=body, json=body)
+
+    async def post_form(self, resource: str, body: dict, headers: dict = None) -> AsyncResponse:
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        return await self.request("POST", resource, body=body, data=body, headers=headers)
@@ -0,0 +1,22 @@
+import os
+
+from src.api.async_base_api import AsyncApiClient
+from utils.lazy import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+
+
+class AsyncFilesApi(AsyncApiClient):
+
+    async def upload_pet_image(
+        self, pet_id: int, file_path: str, additional_metadata: str = None
+    ):
+        data = (
+            {"additionalMetadata": additional_metadata} if additional_metadata else {}
+        )
+        with open(file_path, "rb") as image:
+            form = aiohttp.FormData(data)
+            form.add_field("file", image, filename=os.path.basename(file_path))
+            return await self.request(
+                "POST", f"/pet/{pet_id}/uploadImage", body=data, data=form
+            )
@@ -0,0 +1,42 @@
+from src.api.async_base_api import AsyncApiClient, async_step
+from utils.enums import PetStatus
+from utils.lazy import lazy_import
+
+allure = lazy_import("allure")
+
+
+class AsyncPetApi:
+
+    def __init__(self, client: AsyncApiClient):
+        self.client = client
+
+    @async_step("POST /pet")
+    async def add_pet(self, pet_body: dict):
+        return await self.client.post("/pet", body=pet_body)
+
+    @async_step("PUT /pet")
+    async def update_pet(self, pet_body: dict):
+        return await self.client.put("/pet", body=pet_body)
+
+    @async_step("GET /pet/findByStatus")
+    async def find_pet_by_status(self, status=PetStatus):  # pending/sold
+        return await self.client.get(f"/pet/findByStatus?status={status.value}")
+
+    @async_step("GET /pet/{{petId}}")
+    async def find_pet_by_id(self, pet_id: int):
+        return await self.client.get(f"/pet/{pet_id}")
+
+    @async_step("POST /pet/{pet_id}")
+    async def update_pet_with_form_data(self, pet_id: int, name: str, status: str):
+        body = {"name": name, "status": status}
+        return await self.client.post_form(f"pet/{pet_id}", body=body)
+
+    @async_step("DELETE /pet/{{petId}}")
+    async def delete_pet(self, pet_id: int):
+        response = await self.client.delete(f"/pet/{pet_id}")
+        allure.attach(
+            f"Delete response: {response.status_code}\n{response.text}",
+            name=f"delete_pet_{pet_id}",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+        return response
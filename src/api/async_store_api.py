@@ -0,0 +1,23 @@
+from src.api.async_base_api import AsyncApiClient, async_step
+
+
+class AsyncStoreApi:
+
+    def __init__(self, client: AsyncApiClient):
+        self.client = client
+
+    @async_step("GET /store/inventory")
+    async def get_inventory(self):
+        return await self.client.get("/store/inventory")
+
+    @async_step("GET /store/order/order_id")
+    async def get_info_about_placed_order_by_id(self, order_id: int):
+        return await self.client.get(f"/store/order/{order_id}")
+
+    @async_step("POST /store/order")
+    async def place_order(self, body: dict):
+        return await self.client.post("/store/order", body)
+
+    @async_step("DELETE /store/order/order_id")
+    async def delete_placed_order(self, order_id: int):
+        return await self.client.delete(f"/store/order/{order_id}")
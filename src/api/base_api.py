@@ -1,59 +1,163 @@
-import datetime
-import random
+import os
+import time
 
-import allure
 import requests
 
+from src.api.rate_limiter import AdaptiveLimiter
+from src.api.response_cache import ResponseCache
+from src.api.single_flight import SingleFlight
+from utils.cassette import Cassette
+from utils.metrics import ApiMetrics, TimedHTTPAdapter, route_template, take_connect_time
+
+DEFAULT_BASE_URL = os.environ.get("PETSTORE_BASE_URL", "https://petstore.swagger.io/v2")
+
 
 class ApiClient:
 
     def __init__(
         self,
         logger,
-        base_url: str = "https://petstore.swagger.io/v2",
+        base_url: str = DEFAULT_BASE_URL,
+        session: requests.Session = None,
+        pool_size: int = 10,
+        timeout: float = 30,
+        metrics: ApiMetrics = None,
+        cache: ResponseCache = None,
+        cassette: Cassette = None,
+        limiter: AdaptiveLimiter = None,
+        single_flight: SingleFlight = None,
     ):
+        """
+        All requests go through one keep-alive session with a connection pool
+        of pool_size connections per host. Pass session=other_client.session
+        to share one pool between PetApi, StoreApi and FilesApi clients.
+        With metrics set, every request is timed per phase into it.
+        With cache set, successful GETs are served from it until they expire
+        or a write through this client invalidates them.
+        With cassette set, traffic is recorded to or replayed from its
+        current tape; replay never opens a connection.
+        With limiter set, every request that goes to the network waits for
+        its rate and concurrency budget and reports back how it went.
+        With single_flight set, identical GETs issued while one is already
+        in flight wait for that one instead of sending their own.
+        """
         self.base_url = base_url
         self.logger = logger
+        self.timeout = timeout
+        self.metrics = metrics
+        self.cache = cache
+        self.cassette = cassette
+        self.limiter = limiter
+        self.single_flight = single_flight
+        self.session = session or self.create_session(pool_size)
+
+    @staticmethod
+    def create_session(pool_size: int = 10, pool_block: bool = False) -> requests.Session:
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
 
-    # def build_url(self, resource: str) -> str:
-    #     return f"{self.base_url}{resource}"
+    def close(self):
+        self.session.close()
 
     def build_url(self, resource: str) -> str:
         return f"{self.base_url.rstrip('/')}/{resource.lstrip('/')}"
 
-    def get(self, resource: str, params: dict = None) -> requests.Response:
+    def request(self, method: str, resource: str, body=None, **kwargs) -> requests.Response:
+        cache = None if kwargs.get("stream") else self.cache
         url = self.build_url(resource)
-        self.logger.add_request(url, method="GET", body=params)
-        response = requests.get(url)
-        self.logger.add_response(response, body=params)
+        if cache is not None and method == "GET":
+            cached = cache.get(resource, kwargs.get("params"))
+            if cached is not None:
+                self.logger.add_request(url, method=method, body=body)
+                self.logger.add_response(cached, body=body, cached=True)
+                return cached
+        self.logger.add_request(url, method=method, body=body)
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            if self.cassette is not None and self.cassette.replaying:
+                response = self.cassette.replay(
+                    method, url, resource, kwargs.get("params"), body, kwargs.get("stream", False)
+                )
+            elif self.single_flight is not None and method == "GET" and not kwargs.get("stream"):
+                response = self.single_flight.do(
+                    resource, kwargs.get("params"), lambda: self._fetch(method, resource, url, kwargs)
+                )
+            else:
+                response = self._fetch(method, resource, url, kwargs)
+        finally:
+            # GETs from now on must see this write, also one that raised after the server applied it
+            if method != "GET":
+                if self.single_flight is not None:
+                    self.single_flight.invalidate()
+                if cache is not None:
+                    cache.invalidate(method, resource, body)
+        if self.cassette is not None and not self.cassette.replaying:
+            self.cassette.record(method, resource, kwargs.get("params"), body, response)
+        self.logger.add_response(response, body=body)
+        if cache is not None and method == "GET":
+            cache.put(resource, kwargs.get("params"), response)
         return response
 
-    def post(self, resource: str, body: dict) -> requests.Response:
-        url = self.build_url(resource)
-        self.logger.add_request(url, method="POST", body=body)
-        response = requests.post(url, json=body)
-        self.logger.add_response(response, body=body)
+    def _fetch(self, method: str, resource: str, url: str, kwargs: dict):
+        if self.limiter is not None:
+            return self._limited_request(method, resource, url, kwargs)
+        return self._send(method, resource, url, kwargs)
+
+    def _send(self, method: str, resource: str, url: str, kwargs: dict):
+        if self.metrics is None:
+            return self.session.request(method, url, **kwargs)
+        return self._timed_request(method, resource, url, kwargs)
+
+    def _limited_request(self, method: str, resource: str, url: str, kwargs: dict):
+        self.limiter.acquire()
+        started = time.perf_counter()
+        status = None
+        try:
+            response = self._send(method, resource, url, kwargs)
+            status = response.status_code
+            return response
+        finally:
+            self.limiter.release(time.perf_counter() - started, status, f"{method} {route_template(resource)}")
+
+    def _timed_request(self, method: str, resource: str, url: str, kwargs: dict):
+        take_connect_time()
+        started = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        total = time.perf_counter() - started
+        connect = take_connect_time()
+        # requests' elapsed ends when the headers are parsed, before the body is read
+        headers_at = response.elapsed.total_seconds()
+        self.metrics.record(
+            method,
+            resource,
+            {
+                "total": total,
+                "connect": connect or None,
+                "ttfb": max(headers_at - connect, 0.0),
+                "body": max(total - headers_at, 0.0),
+            },
+        )
         return response
 
+    def get(self, resource: str, params: dict = None, stream: bool = False) -> requests.Response:
+        """stream=True leaves the body unread (and uncached) for response.iter_content()"""
+        return self.request("GET", resource, body=params, params=params, stream=stream)
+
+    def post(self, resource: str, body: dict) -> requests.Response:
+        return self.request("POST", resource, body=body, json=body)
+
     def delete(self, resource: str, params: dict = None) -> requests.Response:
-        url = self.build_url(resource)
-        self.logger.add_request(url, method="DELETE", body=params)
-        response = requests.delete(url)
-        self.logger.add_response(response, body=params)
-        return response
+        return self.request("DELETE", resource, body=params, params=params)
 
     def put(self, resource: str, body: dict) -> requests.Response:
-        url = self.build_url(resource)
-        self.logger.add_request(url, method="PUT", body=body)
-        response = requests.put(url, json=body)
-        self.logger.add_response(response, body=body)
-        return response
+        return self.request("PUT", resource, body=body, json=body)
 
-    def post_form(self, resource: str, body: dict, headers: dict) -> requests.Response:
-        url = self.build_url(resource)
+    def post_form(self, resource: str, body: dict, headers: dict = None) -> requests.Response:
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        self.logger.add_request(url, method="POST", body=body)
-        response = requests.post(url, data=body, headers=headers)
-        self.logger.add_response(response, body=body)
-
-        return response
+        return self.request("POST", resource, body=body, data=body, headers=headers)
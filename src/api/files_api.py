@@ -1,6 +1,34 @@
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from src.api.base_api import ApiClient
+from utils.lazy import lazy_import
+from utils.multipart import MultipartStream
+
+allure = lazy_import("allure")
+
+
+class UploadReport:
+    """Responses of a bulk upload in input order, plus bytes sent and throughput"""
+
+    def __init__(self, responses: list, total_bytes: int, elapsed: float):
+        self.responses = responses
+        self.total_bytes = total_bytes
+        self.elapsed = elapsed
+
+    @property
+    def failures(self) -> list:
+        return [response for response in self.responses if response.status_code != 200]
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.total_bytes / 1e6 / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.responses)} uploads, {len(self.failures)} failed, "
+            f"{self.total_bytes / 1e6:.1f} MB in {self.elapsed:.2f}s ({self.mb_per_s:.1f} MB/s)"
+        )
 
 
 class FilesApi(ApiClient):
@@ -8,11 +36,56 @@ class FilesApi(ApiClient):
     def upload_pet_image(
         self, pet_id: int, file_path: str, additional_metadata: str = None
     ):
-        url = self.build_url(f"/pet/{pet_id}/uploadImage")
-        files = {"file": open(file_path, "rb")}
+        return self.upload_image(pet_id, file_path, additional_metadata)
+
+    def upload_image(self, pet_id: int, image, additional_metadata: str = None):
+        """
+        image is a file path or a (filename, bytes) pair, e.g. from
+        FileFactory.synthetic_image(). The multipart body is streamed, so
+        the file is never read into memory as a whole.
+        """
+        return self._send_image(pet_id, image, additional_metadata)[0]
+
+    def _send_image(self, pet_id: int, image, additional_metadata: str = None) -> tuple:
+        """(response, multipart body size)"""
         data = (
             {"additionalMetadata": additional_metadata} if additional_metadata else {}
         )
-        response = requests.post(url, files=files, data=data)
-        files["file"].close()
-        return response
+        with MultipartStream(data, {"file": image}) as body:
+            response = self.request(
+                "POST",
+                f"/pet/{pet_id}/uploadImage",
+                body=data,
+                data=body,
+                headers={"Content-Type": body.content_type},
+            )
+            return response, len(body)
+
+    def upload_images(
+        self, pairs, concurrency: int = 8, additional_metadata: str = None
+    ) -> UploadReport:
+        """
+        Uploads (pet_id, image) pairs on `concurrency` threads sharing this
+        client's connection pool (keep concurrency <= its pool_size so every
+        connection is reused).
+        """
+        pairs = list(pairs)
+        with allure.step(f"POST /pet/{{petId}}/uploadImage x{len(pairs)}"):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                sent = list(
+                    pool.map(
+                        lambda pair: self._send_image(pair[0], pair[1], additional_metadata),
+                        pairs,
+                    )
+                )
+            elapsed = time.perf_counter() - started
+            report = UploadReport(
+                [response for response, _ in sent], sum(size for _, size in sent), elapsed
+            )
+            allure.attach(
+                report.summary(),
+                name="upload_throughput",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+        return report
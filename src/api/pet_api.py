@@ -1,33 +1,87 @@
-import allure
+import itertools
 
 from src.api.base_api import ApiClient
+from src.models.base import as_json
 from utils.enums import PetStatus
+from utils.json_stream import iter_json_array, merge_parallel
+from utils.lazy import lazy_import
+from utils.resource_tracker import ResourceTracker
+
+allure = lazy_import("allure")
 
 
 class PetApi:
 
-    def __init__(self, client: ApiClient):
+    def __init__(self, client: ApiClient, tracker: ResourceTracker = None):
+        """With tracker set, created pets are registered for the bulk cleanup at the end"""
         self.client = client
+        self.tracker = tracker
 
     def add_pet(self, pet_body: dict):
+        pet_body = as_json(pet_body)
         with allure.step("POST /pet"):
-            return self.client.post("/pet", body=pet_body)
+            response = self.client.post("/pet", body=pet_body)
+        if self.tracker is not None:
+            self.tracker.track(ResourceTracker.PET, response, pet_body.get("id"))
+        return response
 
     def update_pet(self, pet_body: dict):
         with allure.step("PUT /pet"):
-            return self.client.put("/pet", body=pet_body)
+            return self.client.put("/pet", body=as_json(pet_body))
 
     def find_pet_by_status(self, status=PetStatus):  # pending/sold
         with allure.step("GET /pet/findByStatus"):
             return self.client.get(f"/pet/findByStatus?status={status.value}")
 
+    def iter_pets_by_status(
+        self, status=PetStatus.AVAILABLE, validate=None, limit: int = None, until=None,
+        chunk_size: int = 64 * 1024, model=None,
+    ):
+        """
+        Streams GET /pet/findByStatus and yields pets one at a time, so memory
+        stays bounded however long the list is. Several statuses are fetched
+        in parallel and merged in arrival order. validate(pet) runs on every
+        pet before it is yielded (raise to fail); iteration stops after
+        `limit` pets or right after the first pet for which until(pet) holds.
+        With model=Pet the pets are yielded as Pet objects (validate still
+        sees the parsed dicts).
+        """
+        statuses = [status] if isinstance(status, PetStatus) else list(status)
+        if len(statuses) == 1:
+            pets = self._stream_status(statuses[0], chunk_size)
+        else:
+            pets = merge_parallel(
+                [lambda status=status: self._stream_status(status, chunk_size) for status in statuses]
+            )
+        try:
+            for pet in itertools.islice(pets, limit):
+                if validate is not None:
+                    validate(pet)
+                if model is not None:
+                    pet = model.from_json(pet)
+                yield pet
+                if until is not None and until(pet):
+                    return
+        finally:
+            pets.close()
+
+    def _stream_status(self, status: PetStatus, chunk_size: int):
+        with allure.step(f"GET /pet/findByStatus?status={status.value} (stream)"):
+            response = self.client.get(f"/pet/findByStatus?status={status.value}", stream=True)
+        with response:
+            if response.status_code != 200:
+                raise AssertionError(
+                    f"GET /pet/findByStatus?status={status.value} returned "
+                    f"{response.status_code}: {response.text[:200]}"
+                )
+            yield from iter_json_array(response.iter_content(chunk_size))
+
     def find_pet_by_id(self, pet_id: int):
         with allure.step("GET /pet/{petId}"):
             return self.client.get(f"/pet/{pet_id}")
 
-    @allure.step("POST /pet/pet_id")
     def update_pet_with_form_data(self, pet_id: int, name: str, status: str):
-        with allure.step(f"POST /pet/{pet_id}"):
+        with allure.step("POST /pet/pet_id"), allure.step(f"POST /pet/{pet_id}"):
             headers = {"Content-Type": "application/x-www-form-urlencoded"}
             body = {"name": name, "status": status}
             return self.client.post_form(f"pet/{pet_id}", body=body, headers=headers)
@@ -40,4 +94,6 @@ class PetApi:
                 name=f"delete_pet_{pet_id}",
                 attachment_type=allure.attachment_type.TEXT,
             )
-            return response
+        if self.tracker is not None:
+            self.tracker.untrack(ResourceTracker.PET, response, pet_id)
+        return response
@@ -0,0 +1,188 @@
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): every process keeps its own budget
+    fcntl = None
+
+# tokens, refilled_at, rate, decreased_at; times are time.monotonic(), which is system-wide
+_STATE = struct.Struct("<4d")
+
+
+class _ProcessState:
+    """Bucket state of this process only"""
+
+    def __init__(self, initial: tuple):
+        self.lock = threading.Lock()
+        self.values = list(initial)
+
+    def update(self, change):
+        with self.lock:
+            return change(self.values)
+
+    def close(self):
+        pass
+
+
+class _FileState:
+    """Bucket state in a small file shared by every process that opens it, serialized by flock"""
+
+    def __init__(self, path: str, initial: tuple):
+        self.initial = initial
+        self.lock = threading.Lock()  # flock doesn't exclude threads sharing one descriptor
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def update(self, change):
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(self.fd, _STATE.size, 0)
+                values = list(_STATE.unpack(data) if len(data) == _STATE.size else self.initial)
+                result = change(values)
+                os.pwrite(self.fd, _STATE.pack(*values), 0)
+                return result
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket (rate requests/s, bursts of up to burst) plus a cap on this
+    process' requests in flight, both adapted AIMD-style from the responses.
+    A healthy response adds a little: about +increase req/s per second of
+    traffic, and one more in-flight slot per full window. An overload signal
+    multiplies both by backoff, at most once per cooldown. The signals are
+    429, a 5xx, a failed request, or a latency above latency_factor times
+    the usual one for the same endpoint (the caller's route key), so a large
+    listing or an upload is only compared with its own kind.
+    With shared_path the bucket and its rate live in that file, so every
+    xdist worker draws from (and adapts) one budget.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float = None,
+        max_concurrency: int = 8,
+        min_rate: float = 1.0,
+        max_rate: float = None,
+        increase: float = 1.0,
+        backoff: float = 0.7,
+        latency_factor: float = 3.0,
+        latency_floor: float = 0.05,
+        cooldown: float = 1.0,
+        shared_path: str = None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.burst = max(burst if burst is not None else rate, 1.0)
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.latency_floor = latency_floor
+        self.cooldown = cooldown
+        self.clock = clock
+        self.sleep = sleep
+        initial = (self.burst, clock(), float(rate), float("-inf"))
+        if shared_path is not None and fcntl is not None:
+            self.state = _FileState(shared_path, initial)
+        else:
+            self.state = _ProcessState(initial)
+        self.condition = threading.Condition()
+        self.limit = float(max_concurrency)
+        self.decreased_at = float("-inf")
+        self.in_flight = 0
+        self.latency = {}  # route -> EWMA of its healthy latencies
+        self.requests = 0
+        self.waited = 0.0
+        self.overloads = 0
+        self.rate_cuts = 0
+
+    def acquire(self) -> float:
+        """Blocks until there is a free slot and a token; returns the seconds waited"""
+        started = self.clock()
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+        delay = self.state.update(self._take)
+        if delay > 0:
+            self.sleep(delay)
+        waited = self.clock() - started
+        with self.condition:
+            self.requests += 1
+            self.waited += waited
+        return waited
+
+    def release(self, latency: float, status: int = None, route: str = None):
+        """status None: the request failed without a response; route keys the latency baseline"""
+        overloaded = status is None or status == 429 or status >= 500
+        now = self.clock()
+        with self.condition:
+            self.in_flight -= 1
+            usual = self.latency.get(route)
+            if not overloaded and usual is not None:
+                overloaded = latency > max(usual * self.latency_factor, self.latency_floor)
+            if not overloaded:
+                self.latency[route] = latency if usual is None else 0.9 * usual + 0.1 * latency
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+            else:
+                self.overloads += 1
+                if now - self.decreased_at >= self.cooldown:
+                    self.decreased_at = now
+                    self.limit = max(self.limit * self.backoff, 1.0)
+            self.condition.notify_all()
+        if self.state.update(lambda values: self._adapt(values, now, overloaded)):
+            with self.condition:
+                self.rate_cuts += 1
+
+    def _refill(self, values: list, now: float):
+        tokens, refilled_at, rate, _ = values
+        values[0] = min(tokens + (now - refilled_at) * rate, self.burst)
+        values[1] = max(now, refilled_at)
+
+    def _take(self, values: list) -> float:
+        """Takes a token, going into debt if there is none; returns how long to wait for it"""
+        self._refill(values, self.clock())
+        values[0] -= 1
+        return -values[0] / values[2] if values[0] < 0 else 0.0
+
+    def _adapt(self, values: list, now: float, overloaded: bool) -> bool:
+        """True when this call cut the shared rate"""
+        self._refill(values, now)
+        if not overloaded:
+            values[2] = min(values[2] + self.increase / values[2], self.max_rate)
+            return False
+        if now - values[3] < self.cooldown:
+            return False  # another request (or worker) already cut for this episode
+        values[2] = max(values[2] * self.backoff, self.min_rate)
+        values[3] = now
+        return True
+
+    @property
+    def rate(self) -> float:
+        return self.state.update(lambda values: values[2])
+
+    def stats(self) -> dict:
+        rate = self.rate
+        with self.condition:
+            return {
+                "rate": round(rate, 2),
+                "concurrency_limit": int(self.limit),
+                "requests": self.requests,
+                "waited_s": round(self.waited, 3),
+                "overloads": self.overloads,
+                "rate_cuts": self.rate_cuts,
+            }
+
+    def close(self):
+        self.state.close()
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+from utils.metrics import route_template
+
+# write route -> GET routes whose cached responses it makes stale
+INVALIDATES = {
+    "/pet": ("/pet/{petId}", "/pet/findByStatus", "/store/inventory"),
+    "/pet/{petId}": ("/pet/{petId}", "/pet/findByStatus", "/store/inventory"),
+    "/pet/{petId}/uploadImage": ("/pet/{petId}", "/pet/findByStatus"),
+    "/store/order": ("/store/order/{orderId}",),
+    "/store/order/{orderId}": ("/store/order/{orderId}",),
+}
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for successful GET responses, keyed on path and query
+    params, bounded by total body size. A write through the same client
+    evicts the routes it affects (see INVALIDATES; unknown writes clear
+    everything) and, because the server is only eventually consistent,
+    keeps those routes uncached for `settle` seconds so a stale read
+    right after the write is not cached either.
+    """
+
+    def __init__(self, ttl: float = 30, max_bytes: int = 32 * 1024 * 1024, settle: float = None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.settle = ttl if settle is None else settle
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, size, template, response)
+        self.no_store_until = {}  # path or template -> monotonic time
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def split(resource: str, params: dict = None) -> tuple:
+        path, _, query = resource.partition("?")
+        path = "/" + path.strip("/")
+        items = parse_qsl(query) + [(str(k), str(v)) for k, v in (params or {}).items()]
+        return path, tuple(sorted(items))
+
+    def get(self, resource: str, params: dict = None):
+        key = self.split(resource, params)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_saved += entry[1]
+            return entry[3]
+
+    def put(self, resource: str, params: dict, response):
+        if not 200 <= response.status_code < 300:
+            return
+        key = self.split(resource, params)
+        template = route_template(key[0])
+        size = len(response.content)
+        now = time.monotonic()
+        with self.lock:
+            if size > self.max_bytes or any(
+                self.no_store_until.get(blocked, 0) > now for blocked in (key[0], template)
+            ):
+                return
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (now + self.ttl, size, template, response)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, method: str, resource: str, body=None):
+        """Called for every non-GET request that went through the client"""
+        path = self.split(resource)[0]
+        template = route_template(path)
+        entity_id = path.rsplit("/", 1)[-1] if template != path else None
+        if entity_id is None and isinstance(body, dict) and "id" in body:
+            entity_id = str(body["id"])
+        if template == "/pet/{petId}/uploadImage":
+            entity_id = path.split("/")[2]
+
+        targets = set()
+        for affected in INVALIDATES.get(template, ()):
+            if "{" in affected and entity_id is not None:
+                targets.add(affected.replace("{petId}", entity_id).replace("{orderId}", entity_id))
+            else:
+                targets.add(affected)
+        now = time.monotonic()
+        with self.lock:
+            if len(self.no_store_until) > 4096:
+                self.no_store_until = {
+                    blocked: until for blocked, until in self.no_store_until.items() if until > now
+                }
+            if template not in INVALIDATES:
+                dropped = list(self.entries)
+            else:
+                dropped = [
+                    key for key, entry in self.entries.items()
+                    if key[0] in targets or entry[2] in targets
+                ]
+                for target in targets:
+                    self.no_store_until[target] = now + self.settle
+            for key in dropped:
+                self._drop(key)
+            self.invalidations += len(dropped)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.no_store_until.clear()
+            self.size = 0
+
+    def _drop(self, key):
+        """Called with self.lock held"""
+        self.size -= self.entries.pop(key)[1]
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "bytes_saved": self.bytes_saved,
+            }
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+from src.api.response_cache import ResponseCache
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Concurrent identical GETs (same path and query) share one request: the
+    first caller sends it, the ones arriving while it is in flight wait for
+    it and get the same response, or the same exception. A write through
+    the client calls invalidate(), after which GETs start a new flight
+    instead of joining one that began before the write.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # (generation, path, query) -> _Call
+        self.generation = 0
+        self.flights = 0
+        self.coalesced = 0
+
+    def key(self, resource: str, params: dict = None) -> tuple:
+        return (self.generation,) + ResponseCache.split(resource, params)
+
+    def do(self, resource: str, params: dict, send):
+        with self.lock:
+            key = self.key(resource, params)
+            call = self.calls.get(key)
+            if call is None:
+                call = self.calls[key] = _Call()
+                self.flights += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+        try:
+            call.response = send()
+            return call.response
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def invalidate(self):
+        with self.lock:
+            self.generation += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            requested = self.flights + self.coalesced
+            return {
+                "flights": self.flights,
+                "coalesced": self.coalesced,
+                "in_flight": len(self.calls),
+                "coalesced_rate": self.coalesced / requested if requested else None,
+            }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    The same for coroutines. The request runs as its own task that every
+    caller awaits through asyncio.shield, so one cancelled caller doesn't
+    cancel it for the others; it is cancelled when no caller is left, and
+    forgotten at once, so a caller arriving next starts a new flight
+    instead of joining the dying one.
+    """
+
+    async def do(self, resource: str, params: dict, send):
+        key = self.key(resource, params)
+        entry = self.calls.get(key)
+        if entry is None or entry[0].get_loop() is not asyncio.get_running_loop():
+            entry = self.calls[key] = [asyncio.ensure_future(send()), 0]
+            entry[0].add_done_callback(lambda task: self._forget(key, task))
+            self.flights += 1
+        else:
+            self.coalesced += 1
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                if self.calls.get(key) is entry:
+                    del self.calls[key]
+                task.cancel()
+
+    def _forget(self, key: tuple, task):
+        if key in self.calls and self.calls[key][0] is task:
+            del self.calls[key]
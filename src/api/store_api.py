@@ -1,25 +1,37 @@
-import allure
-
 from src.api.base_api import ApiClient
+from src.models.base import as_json
+from utils.lazy import lazy_import
+from utils.resource_tracker import ResourceTracker
+
+allure = lazy_import("allure")
 
 
 class StoreApi:
 
-    def __init__(self, client: ApiClient):
+    def __init__(self, client: ApiClient, tracker: ResourceTracker = None):
+        """With tracker set, placed orders are registered for the bulk cleanup at the end"""
         self.client = client
+        self.tracker = tracker
 
-    @allure.step("GET /store/inventory")
     def get_inventory(self):
-        return self.client.get("/store/inventory")
+        with allure.step("GET /store/inventory"):
+            return self.client.get("/store/inventory")
 
-    @allure.step("GET /store/order/order_id")
     def get_info_about_placed_order_by_id(self, order_id: int):
-        return self.client.get(f"/store/order/{order_id}")
+        with allure.step("GET /store/order/order_id"):
+            return self.client.get(f"/store/order/{order_id}")
 
-    @allure.step("POST /store/order")
     def place_order(self, body: dict):
-        return self.client.post("/store/order", body)
+        body = as_json(body)
+        with allure.step("POST /store/order"):
+            response = self.client.post("/store/order", body)
+        if self.tracker is not None:
+            self.tracker.track(ResourceTracker.ORDER, response, body.get("id"))
+        return response
 
-    @allure.step("DELETE /store/order/order_id")
     def delete_placed_order(self, order_id: int):
-        return self.client.delete(f"/store/order/{order_id}")
+        with allure.step("DELETE /store/order/order_id"):
+            response = self.client.delete(f"/store/order/{order_id}")
+        if self.tracker is not None:
+            self.tracker.untrack(ResourceTracker.ORDER, response, order_id)
+        return response
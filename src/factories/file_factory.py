@@ -1,4 +1,12 @@
 import os.path
+import struct
+import zlib
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
 
 
 class FileFactory:
@@ -6,3 +14,21 @@ class FileFactory:
     @staticmethod
     def pet_image(filename: str = "test_dog.jpg") -> str:
         return os.path.join(os.path.dirname(__file__), "resources", filename)
+
+    @staticmethod
+    def synthetic_image(size: int = 1024 * 1024, filename: str = "synthetic.png") -> tuple:
+        """
+        (filename, bytes) of a valid 1x1 PNG padded to exactly `size` bytes
+        with an ancillary chunk viewers ignore, for upload tests of any size
+        without files on disk. Accepted wherever FilesApi takes an image.
+        """
+        head = (
+            _PNG_SIGNATURE
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(b"\x00\x80"))
+        )
+        tail = _png_chunk(b"IEND", b"")
+        padding = size - len(head) - len(tail) - 12
+        if padding < 0:
+            raise ValueError(f"A synthetic PNG needs at least {len(head) + len(tail) + 12} bytes")
+        return filename, head + _png_chunk(b"paDd", bytes(padding)) + tail
@@ -0,0 +1,55 @@
+import itertools
+import os
+import random
+import threading
+
+
+class IdAllocator:
+    """
+    Hands out ids that never repeat within a run: the 31-bit id space is
+    split into one slice per xdist worker and ids are taken sequentially
+    from a (seeded or random) offset inside this worker's slice, so
+    thousands of entities created in parallel can't collide.
+    """
+
+    LIMIT = (1 << 31) - 1
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, worker_index: int = None, worker_count: int = None, seed=None):
+        if worker_index is None:
+            worker_index, worker_count = self.current_worker()
+        if not 0 <= worker_index < worker_count:
+            raise ValueError(f"worker_index {worker_index} is outside 0..{worker_count - 1}")
+        self.span = self.LIMIT // worker_count
+        self.low = 1 + worker_index * self.span
+        self.offset = random.Random(seed).randrange(self.span)
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def current_worker() -> tuple:
+        """(index, count) of this xdist worker, (0, 1) outside xdist"""
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+        index = int(worker[2:]) if worker[2:].isdigit() else 0
+        return index, max(count, index + 1)
+
+    @classmethod
+    def shared(cls) -> "IdAllocator":
+        """Process-wide allocator used when callers don't bring their own"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def next_id(self) -> int:
+        with self.lock:
+            step = next(self.counter)
+        if step >= self.span:
+            raise RuntimeError(f"Id slice of {self.span} ids is exhausted")
+        return self.low + (self.offset + step) % self.span
+
+    def __iter__(self):
+        return iter(self.next_id, None)
@@ -1,6 +1,9 @@
+import itertools
 import random
 import datetime
 
+from src.factories.id_allocator import IdAllocator
+
 
 class OrderFactory:
     @staticmethod
@@ -29,3 +32,36 @@ class OrderFactory:
             "complete": complete,
         }
         return body
+
+    @staticmethod
+    def batch(
+        n: int = None,
+        seed=None,
+        pet_ids=None,
+        quantity: int = 1,
+        shipDate: str = None,
+        status: str = "placed",
+        complete: bool = True,
+        ids: IdAllocator = None,
+    ):
+        """
+        Lazily yields n order payloads (endlessly when n is None) shaped like
+        default_order(), with collision-free ids from an IdAllocator.
+        pet_ids are cycled through when given, otherwise random; shipDate is
+        taken once for the whole batch.
+        """
+        rnd = random.Random(seed)
+        ids = ids or (IdAllocator(seed=seed) if seed is not None else IdAllocator.shared())
+        pets = itertools.cycle(pet_ids) if pet_ids else iter(lambda: rnd.randint(1, 10000), None)
+        if shipDate is None:
+            shipDate = datetime.datetime.now().isoformat()
+
+        for order_id, pet_id in zip(itertools.islice(ids, n), pets):
+            yield {
+                "id": order_id,
+                "petId": pet_id,
+                "quantity": quantity,
+                "shipDate": shipDate,
+                "status": status,
+                "complete": complete,
+            }
@@ -1,23 +1,67 @@
+import functools
+import itertools
 import random
-import uuid
 
-from faker import Faker
+from src.factories.id_allocator import IdAllocator
+from utils.lazy import Lazy, lazy_import
 
-fake = Faker()
+faker = lazy_import("faker")
+fake = Lazy(lambda: faker.Faker())  # built on first use, not when collection imports the module
 
 
 class PetFactory:
+    # batch() draws from pre-sampled Faker values instead of calling Faker per pet
+    POOL_BITS = 10
+
     @staticmethod
     def default_pet(name=None, status="available") -> dict:
         return {
-            "id": uuid.uuid4().int & (1 << 31) - 1,  # Unique id + character limit
-            "category": {"id": uuid.uuid4().int & (1 << 31) - 1, "name": fake.word()},
+            # random rather than uuid4, so cassette runs can seed it per test
+            "id": random.getrandbits(31),  # Unique id + character limit
+            "category": {"id": random.getrandbits(31), "name": fake.word()},
             "name": name or fake.first_name(),
             "photoUrls": [fake.image_url()],
-            "tags": [{"id": uuid.uuid4().int & (1 << 31) - 1, "name": fake.word()}],
+            "tags": [{"id": random.getrandbits(31), "name": fake.word()}],
             "status": status,
         }
 
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def pools(seed=None) -> tuple:
+        """(first names, words, image urls), 2**POOL_BITS of each"""
+        generator = faker.Faker()
+        generator.seed_instance(seed)
+        size = 1 << PetFactory.POOL_BITS
+        return (
+            tuple(generator.first_name() for _ in range(size)),
+            tuple(generator.word() for _ in range(size)),
+            tuple(generator.image_url() for _ in range(size)),
+        )
+
+    @staticmethod
+    def batch(n: int = None, seed=None, status="available", ids: IdAllocator = None):
+        """
+        Lazily yields n pet payloads (endlessly when n is None) shaped like
+        default_pet(). The same seed on the same xdist worker gives the same
+        payloads; pet ids come from a collision-free IdAllocator.
+        status may be a single value or a sequence to pick from at random.
+        """
+        names, words, urls = PetFactory.pools(seed)
+        rnd = random.Random(seed)
+        ids = ids or (IdAllocator(seed=seed) if seed is not None else IdAllocator.shared())
+        statuses = (status,) if isinstance(status, str) else tuple(status)
+        pick, bits = rnd.getrandbits, PetFactory.POOL_BITS
+
+        for pet_id in itertools.islice(ids, n):
+            yield {
+                "id": pet_id,
+                "category": {"id": pick(31), "name": words[pick(bits)]},
+                "name": names[pick(bits)],
+                "photoUrls": [urls[pick(bits)]],
+                "tags": [{"id": pick(31), "name": words[pick(bits)]}],
+                "status": statuses[0] if len(statuses) == 1 else rnd.choice(statuses),
+            }
+
 
 class UpdatePetFactory:
     @staticmethod
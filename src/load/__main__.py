@@ -0,0 +1,150 @@
+"""
+Load mode: drives weighted PetApi/StoreApi scenarios for a fixed duration.
+
+    python -m src.load --local --rps 100 --duration 30
+    python -m src.load --base-url http://host/v2 --concurrency 20 \
+        --scenario pet_lifecycle=3 --scenario order_lifecycle=1
+    python -m src.load --local --concurrency 8 --duration 3600 --soak-interval 10 \
+        --max-slope rss_kb=256 --max-slope fds=0.5
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from src.api.base_api import DEFAULT_BASE_URL, ApiClient
+from src.api.pet_api import PetApi
+from src.api.response_cache import ResponseCache
+from src.api.single_flight import SingleFlight
+from src.api.store_api import StoreApi
+from src.load.runner import LoadRunner, format_report
+from src.load.scenarios import SCENARIOS
+from src.load.soak import METRICS, SoakMonitor, parse_slopes
+from utils.logger import Logger, NullLogger
+from utils.petstore_stub import PetstoreStub
+from utils.resource_tracker import ResourceTracker
+
+
+def parse_weights(values: list) -> dict:
+    scenarios = {}
+    for value in values or ["pet_lifecycle=2", "order_lifecycle=2", "browse_inventory=1"]:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}, choose from {sorted(SCENARIOS)}")
+        scenarios[name] = (float(weight or 1), SCENARIOS[name])
+    return scenarios
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    target.add_argument("--local", action="store_true", help="start the in-process Petstore emulator")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rps", type=float, help="open-loop arrival rate of scenario iterations")
+    mode.add_argument("--concurrency", type=int, help="closed-loop virtual users")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--scenario", action="append", help="name=weight, repeatable")
+    parser.add_argument("--max-workers", type=int, default=64)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--cache-ttl", type=float, help="cache GET responses for this many seconds")
+    parser.add_argument(
+        "--single-flight", action="store_true", help="let concurrent identical GETs share one request"
+    )
+    parser.add_argument(
+        "--keep-data", action="store_true", help="don't delete the pets and orders left behind at the end"
+    )
+    parser.add_argument("--log", action="store_true", help="write request/response logs")
+    parser.add_argument(
+        "--soak-interval",
+        type=float,
+        help="soak mode: sample memory, fds and sockets every this many seconds",
+    )
+    parser.add_argument("--soak-warmup", type=float, default=60, help="seconds left out of the slope fit")
+    parser.add_argument(
+        "--max-slope",
+        action="append",
+        help=f"metric=limit growth per minute, exit 1 above it; metrics: {', '.join(METRICS)}",
+    )
+    parser.add_argument("--max-error-rate", type=float, help="exit 1 if any endpoint exceeds it")
+    parser.add_argument("--output", default="output/load")
+    args = parser.parse_args(argv)
+    if args.rps is None and args.concurrency is None:
+        args.rps = 20
+    started_at = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    monitor = None
+    if args.soak_interval:
+        monitor = SoakMonitor(
+            interval=args.soak_interval,
+            warmup=args.soak_warmup,
+            max_slopes=parse_slopes(args.max_slope),
+            series_path=os.path.join(args.output, f"soak_{started_at}.jsonl"),
+        )
+
+    stub = PetstoreStub().start() if args.local else None
+    client = ApiClient(
+        Logger if args.log else NullLogger,
+        base_url=stub.base_url if stub else args.base_url,
+        pool_size=args.concurrency or args.max_workers,
+        cache=ResponseCache(ttl=args.cache_ttl) if args.cache_ttl else None,
+        single_flight=SingleFlight() if args.single_flight else None,
+    )
+    tracker = None if args.keep_data else ResourceTracker()
+    runner = LoadRunner(
+        PetApi(client, tracker=tracker),
+        StoreApi(client, tracker=tracker),
+        parse_weights(args.scenario),
+        duration=args.duration,
+        rps=args.rps,
+        concurrency=args.concurrency,
+        max_workers=args.max_workers,
+        seed=args.seed,
+    )
+    try:
+        if monitor is not None:
+            with monitor:
+                report = runner.run()
+            report["soak"] = monitor.report()
+        else:
+            report = runner.run()
+        if tracker is not None:
+            # aborted iterations leave their pets and orders behind
+            report["cleanup"] = tracker.cleanup(PetApi(client), StoreApi(client))
+        if client.cache is not None:
+            report["cache"] = client.cache.stats()
+        if client.single_flight is not None:
+            report["single_flight"] = client.single_flight.stats()
+    finally:
+        client.close()
+        if stub:
+            stub.stop()
+
+    print(format_report(report))
+    if "cache" in report:
+        print(f"Response cache: {report['cache']}")
+    if "cleanup" in report:
+        print(f"Cleanup: {report['cleanup']}")
+    if "single_flight" in report:
+        print(f"Single flight: {report['single_flight']}")
+    if monitor is not None:
+        print(f"Soak: {monitor.summary()}\nSeries: {monitor.series_path}")
+    os.makedirs(args.output, exist_ok=True)
+    report_file = os.path.join(args.output, f"load_{started_at}.json")
+    with open(report_file, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Report: {report_file}")
+
+    if args.max_error_rate is not None:
+        worst = max((data["error_rate"] for data in report["endpoints"].values()), default=0)
+        if worst > args.max_error_rate:
+            print(f"Error rate {worst:.2%} exceeds {args.max_error_rate:.2%}")
+            return 1
+    if monitor is not None and monitor.violations():
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.factories.id_allocator import IdAllocator
+from utils.metrics import LatencyHistogram
+
+
+class LoadStats:
+    """Thread-safe per-endpoint latency histograms and status-code counts"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(LatencyHistogram)
+        self.statuses = defaultdict(Counter)
+        self.scenarios = Counter()
+
+    def record(self, endpoint: str, latency: float, status):
+        with self.lock:
+            self.latencies[endpoint].record(latency)
+            self.statuses[endpoint][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        with self.lock:
+            for endpoint, latencies in sorted(self.latencies.items()):
+                statuses = self.statuses[endpoint]
+                errors = sum(
+                    count
+                    for status, count in statuses.items()
+                    if not (isinstance(status, int) and status < 400)
+                )
+                endpoints[endpoint] = {
+                    "requests": latencies.count,
+                    "throughput_rps": latencies.count / elapsed,
+                    "error_rate": errors / latencies.count,
+                    "statuses": {str(status): count for status, count in statuses.items()},
+                    "latency_ms": {
+                        name: latencies.percentile(fraction) * 1000
+                        for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+                    },
+                }
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "throughput_rps": total / elapsed if elapsed else 0,
+            "scenarios": dict(self.scenarios),
+            "endpoints": endpoints,
+        }
+
+
+class ScenarioContext:
+    """
+    Handed to scenario functions. call() times one request: the first call of
+    an iteration is measured from the *scheduled* start, so time spent queued
+    behind a saturated pool shows up as latency (no coordinated omission).
+    Scenarios take entity ids from `ids`, so concurrent virtual users never
+    overwrite or delete each other's pets and orders.
+    """
+
+    def __init__(self, pet_api, store_api, stats: LoadStats, scheduled_at: float, ids: IdAllocator = None):
+        self.pet_api = pet_api
+        self.store_api = store_api
+        self.stats = stats
+        self.ids = ids or IdAllocator.shared()
+        self.mark = scheduled_at
+
+    def call(self, endpoint: str, func, *args):
+        try:
+            response = func(*args)
+            status = response.status_code
+        except Exception as e:
+            response, status = None, f"error:{type(e).__name__}"
+        now = time.perf_counter()
+        self.stats.record(endpoint, now - self.mark, status)
+        self.mark = now
+        if response is None:
+            raise ScenarioAborted(status)
+        return response
+
+
+class ScenarioAborted(Exception):
+    pass
+
+
+class LoadRunner:
+    """
+    Runs weighted scenarios for a fixed duration, either open-loop at a
+    target rate (rps: iterations are scheduled on a fixed timetable whether
+    or not earlier ones finished) or closed-loop with `concurrency` virtual
+    users that start the next iteration as soon as the previous one ends.
+    """
+
+    def __init__(
+        self,
+        pet_api,
+        store_api,
+        scenarios: dict,
+        duration: float = 10,
+        rps: float = None,
+        concurrency: int = None,
+        max_workers: int = 64,
+        seed: int = None,
+    ):
+        if (rps is None) == (concurrency is None):
+            raise ValueError("Set exactly one of rps (open loop) or concurrency (closed loop)")
+        self.pet_api = pet_api
+        self.store_api = store_api
+        self.names = list(scenarios)
+        self.funcs = [scenarios[name][1] for name in self.names]
+        self.weights = [scenarios[name][0] for name in self.names]
+        self.duration = duration
+        self.rps = rps
+        self.concurrency = concurrency
+        self.max_workers = concurrency or max_workers
+        self.random = random.Random(seed)
+        self.ids = IdAllocator(seed=seed) if seed is not None else IdAllocator.shared()
+        self.stats = LoadStats()
+
+    def pick(self) -> int:
+        return self.random.choices(range(len(self.funcs)), self.weights)[0]
+
+    def run_iteration(self, index: int, scheduled_at: float):
+        with self.stats.lock:
+            self.stats.scenarios[self.names[index]] += 1
+        ctx = ScenarioContext(self.pet_api, self.store_api, self.stats, scheduled_at, self.ids)
+        try:
+            self.funcs[index](ctx)
+        except ScenarioAborted:
+            pass
+
+    def run(self) -> dict:
+        started = time.perf_counter()
+        stop_at = started + self.duration
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if self.rps:
+                interval = 1 / self.rps
+                for iteration in range(int(self.duration * self.rps)):
+                    scheduled_at = started + iteration * interval
+                    delay = scheduled_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    pool.submit(self.run_iteration, self.pick(), scheduled_at)
+            else:
+                def virtual_user(seed: int):
+                    user_random = random.Random(seed)
+                    while time.perf_counter() < stop_at:
+                        index = user_random.choices(range(len(self.funcs)), self.weights)[0]
+                        self.run_iteration(index, time.perf_counter())
+
+                for user in range(self.concurrency):
+                    pool.submit(virtual_user, self.random.random())
+        return self.stats.report(time.perf_counter() - started)
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['requests']} requests in {report['elapsed_s']:.1f}s "
+        f"({report['throughput_rps']:.1f} req/s), scenarios: {report['scenarios']}",
+        f"{'endpoint':<30}{'req':>7}{'req/s':>9}{'err%':>7}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}  statuses",
+    ]
+    for endpoint, data in report["endpoints"].items():
+        latency = data["latency_ms"]
+        lines.append(
+            f"{endpoint:<30}{data['requests']:>7}{data['throughput_rps']:>9.1f}"
+            f"{data['error_rate'] * 100:>7.1f}{latency['p50']:>9.1f}{latency['p90']:>9.1f}"
+            f"{latency['p99']:>9.1f}{latency['max']:>9.1f}  {data['statuses']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,37 @@
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+
+
+def pet_lifecycle(ctx):
+    pet_payload = PetFactory.default_pet()
+    pet_payload["id"] = ctx.ids.next_id()
+    response = ctx.call("POST /pet", ctx.pet_api.add_pet, pet_payload)
+    if response.status_code != 200:
+        return
+    ctx.call("GET /pet/{petId}", ctx.pet_api.find_pet_by_id, pet_payload["id"])
+    ctx.call("DELETE /pet/{petId}", ctx.pet_api.delete_pet, pet_payload["id"])
+
+
+def order_lifecycle(ctx):
+    order_payload = OrderFactory.default_order(id=ctx.ids.next_id())
+    response = ctx.call("POST /store/order", ctx.store_api.place_order, order_payload)
+    if response.status_code != 200:
+        return
+    order_id = order_payload["id"]
+    ctx.call(
+        "GET /store/order/{orderId}",
+        ctx.store_api.get_info_about_placed_order_by_id,
+        order_id,
+    )
+    ctx.call("DELETE /store/order/{orderId}", ctx.store_api.delete_placed_order, order_id)
+
+
+def browse_inventory(ctx):
+    ctx.call("GET /store/inventory", ctx.store_api.get_inventory)
+
+
+SCENARIOS = {
+    "pet_lifecycle": pet_lifecycle,
+    "order_lifecycle": order_lifecycle,
+    "browse_inventory": browse_inventory,
+}
@@ -0,0 +1,220 @@
+"""
+Soak mode: a long load run while a background thread samples this
+process every `interval` seconds: RSS, open file descriptors and sockets,
+threads, live objects and tracemalloc's traced total. Every `top_interval`
+seconds and at the end it also lists the allocation sites that grew most
+since the warm-up (grouping a snapshot takes seconds on a big heap, too
+slow for every sample). A least-squares slope per minute is fitted to each
+series after the warm-up and checked against the limits, so a leak on the
+hot path fails the run long before it would hurt anyone. Samples are
+appended to a JSONL file as they are taken, so an aborted run still leaves
+its series behind.
+
+    python -m src.load --local --concurrency 8 --duration 3600 --soak-interval 10 \
+        --max-slope rss_kb=256 --max-slope fds=0.5 --max-slope sockets=0.5
+"""
+
+import gc
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+METRICS = ("rss_kb", "fds", "sockets", "threads", "objects", "traced_kb")
+PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * PAGE_KB
+    except OSError:
+        return None
+
+
+def descriptors() -> tuple:
+    """(open fds, of which sockets); sockets are only known from /proc"""
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        if not directory.startswith("/proc"):
+            return len(names), None
+        sockets = 0
+        for name in names:
+            try:
+                sockets += os.readlink(os.path.join(directory, name)).startswith("socket:")
+            except OSError:
+                pass  # the fd listdir itself used, closed by now
+        return len(names), sockets
+    return None, None
+
+
+def slope(points) -> float:
+    """Least-squares slope of (minute, value) points, None with fewer than 3"""
+    points = [(t, value) for t, value in points if value is not None]
+    if len(points) < 3:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_value = sum(value for _, value in points) / len(points)
+    variance = sum((t - mean_t) ** 2 for t, _ in points)
+    if not variance:
+        return None
+    return sum((t - mean_t) * (value - mean_value) for t, value in points) / variance
+
+
+class SoakMonitor:
+    """
+    Samples the process from start() to stop() (or as a context manager).
+    max_slopes: metric -> largest allowed growth per minute, e.g.
+    {"rss_kb": 256, "fds": 0.5}; samples in the first `warmup` seconds
+    (pools and caches filling up) are left out of the fit.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10,
+        warmup: float = 60,
+        max_slopes: dict = None,
+        series_path: str = None,
+        top: int = 5,
+        top_interval: float = 300,
+    ):
+        self.interval = interval
+        self.warmup = warmup
+        self.max_slopes = dict(max_slopes or {})
+        unknown = set(self.max_slopes) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown soak metrics {sorted(unknown)}, expected some of {METRICS}")
+        self.series_path = series_path
+        self.top = top
+        self.top_interval = top_interval
+        self.samples = []
+        self.top_growth = []
+        self.started = None
+        self.baseline = None  # tracemalloc snapshot at the end of the warm-up
+        self._top_at = None
+        self._first = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._series = None
+        self._own_tracing = False
+
+    def start(self) -> "SoakMonitor":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracing = True
+        if self.series_path:
+            os.makedirs(os.path.dirname(self.series_path) or ".", exist_ok=True)
+            self._series = open(self.series_path, "w", encoding="utf-8")
+        self.started = time.perf_counter()
+        self._first = tracemalloc.take_snapshot()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="soak-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        if self.baseline is None:  # shorter than the warm-up: growth over the whole run
+            self.baseline = self._first
+        self.top_growth = self._growth()
+        if self._series is not None:
+            self._series.close()
+        if self._own_tracing:
+            tracemalloc.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def _growth(self) -> list:
+        stats = tracemalloc.take_snapshot().compare_to(self.baseline, "lineno")
+        return [
+            {"at": str(stat.traceback[0]), "kb": stat.size_diff // 1024, "count": stat.count_diff}
+            for stat in stats[: self.top]
+            if stat.size_diff > 0
+        ]
+
+    def sample(self) -> dict:
+        t = time.perf_counter() - self.started
+        fds, sockets = descriptors()
+        sample = {
+            "t": round(t, 3),
+            "rss_kb": rss_kb(),
+            "fds": fds,
+            "sockets": sockets,
+            "threads": threading.active_count(),
+            "objects": len(gc.get_objects()),
+            "traced_kb": tracemalloc.get_traced_memory()[0] // 1024,
+        }
+        if self.baseline is None and t >= self.warmup:
+            self.baseline, self._top_at, self._first = tracemalloc.take_snapshot(), t, None
+        elif self.baseline is not None and t - self._top_at >= self.top_interval:
+            sample["top_growth"], self._top_at = self._growth(), t
+        self.samples.append(sample)
+        if self._series is not None:
+            self._series.write(json.dumps(sample) + "\n")
+            self._series.flush()
+        return sample
+
+    def slopes(self) -> dict:
+        """Growth per minute of every metric after the warm-up"""
+        steady = [sample for sample in self.samples if sample["t"] >= self.warmup]
+        return {
+            metric: slope([(sample["t"] / 60, sample[metric]) for sample in steady]) for metric in METRICS
+        }
+
+    def violations(self) -> list:
+        slopes = self.slopes()
+        return [
+            f"{metric} grows {slopes[metric]:.2f}/min, limit {limit}/min"
+            for metric, limit in self.max_slopes.items()
+            if slopes[metric] is not None and slopes[metric] > limit
+        ]
+
+    def report(self) -> dict:
+        return {
+            "interval_s": self.interval,
+            "warmup_s": self.warmup,
+            "samples": len(self.samples),
+            "series": self.series_path,
+            "slopes_per_min": self.slopes(),
+            "max_slopes_per_min": self.max_slopes,
+            "violations": self.violations(),
+            "first": self.samples[0] if self.samples else None,
+            "last": self.samples[-1] if self.samples else None,
+            "top_growth": self.top_growth,
+        }
+
+    def summary(self) -> str:
+        first, last = self.samples[0], self.samples[-1]
+        lines = [f"{len(self.samples)} samples over {last['t']:.0f}s (warm-up {self.warmup:.0f}s)"]
+        for metric, value in self.slopes().items():
+            limit = self.max_slopes.get(metric)
+            lines.append(
+                f"  {metric:<10} {first[metric]!s:>10} -> {last[metric]!s:<10}"
+                + (f" slope {value:+.2f}/min" if value is not None else "")
+                + (f" (limit {limit})" if limit is not None else "")
+            )
+        lines += [f"  grew most: {entry['at']} +{entry['kb']} KB" for entry in self.top_growth]
+        lines += [f"  FAILED: {violation}" for violation in self.violations()]
+        return "\n".join(lines)
+
+
+def parse_slopes(values: list) -> dict:
+    """['rss_kb=256', 'fds=0.5'] -> {'rss_kb': 256.0, 'fds': 0.5}"""
+    slopes = {}
+    for value in values or []:
+        metric, _, limit = value.partition("=")
+        slopes[metric] = float(limit)
+    return slopes
@@ -0,0 +1,97 @@
+from sys import intern
+
+from src.models.base import Model
+
+
+class Category(Model):
+    __slots__ = ("id", "name")
+
+    def __init__(self, id: int = None, name: str = None):
+        self.id = id
+        self.name = name
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Category":
+        get = data.get
+        entity = object.__new__(cls)
+        entity.id = get("id")
+        entity.name = get("name")
+        return entity
+
+    def to_json(self) -> dict:
+        data = {}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.name is not None:
+            data["name"] = self.name
+        return data
+
+
+class Tag(Category):
+    __slots__ = ()
+
+
+def _tags(tags: list) -> tuple:
+    return tuple(map(Tag.from_json, tags))
+
+
+class Pet(Model):
+    """
+    A pet as the API sends it. Fields missing from the JSON are None and
+    left out again by to_json(), so Pet.from_json(body).to_json() == body
+    for any well-formed body. photo_urls and tags are tuples, shared by the
+    copies replace()/merge() make.
+    """
+
+    __slots__ = ("id", "category", "name", "photo_urls", "tags", "status")
+    JSON_NAMES = {"photoUrls": "photo_urls"}
+    NESTED = {"category": Category.from_json, "photoUrls": tuple, "tags": _tags}
+
+    def __init__(
+        self,
+        id: int = None,
+        category: Category = None,
+        name: str = None,
+        photo_urls: tuple = None,
+        tags: tuple = None,
+        status: str = None,
+    ):
+        self.id = id
+        self.category = category
+        self.name = name
+        self.photo_urls = photo_urls
+        self.tags = tags
+        self.status = status
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Pet":
+        get = data.get
+        pet = object.__new__(cls)
+        pet.id = get("id")
+        category = get("category")
+        pet.category = None if category is None else Category.from_json(category)
+        pet.name = get("name")
+        urls = get("photoUrls")
+        pet.photo_urls = None if urls is None else tuple(urls)
+        tags = get("tags")
+        pet.tags = None if tags is None else _tags(tags)
+        status = get("status")
+        # a listing repeats the same few statuses; one string each instead of one per pet
+        pet.status = intern(status) if type(status) is str else status
+        return pet
+
+    def to_json(self) -> dict:
+        data = {}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.category is not None:
+            data["category"] = self.category.to_json()
+        if self.name is not None:
+            data["name"] = self.name
+        if self.photo_urls is not None:
+            data["photoUrls"] = list(self.photo_urls)
+        if self.tags is not None:
+            data["tags"] = [tag.to_json() for tag in self.tags]
+        if self.status is not None:
+            data["status"] = self.status
+        return data
@@ -0,0 +1,101 @@
+from sys import intern
+
+from src.models.base import Model
+
+
+class Order(Model):
+    """An order as the API sends it; missing fields are None and left out by to_json()"""
+
+    __slots__ = ("id", "pet_id", "quantity", "ship_date", "status", "complete")
+    JSON_NAMES = {"petId": "pet_id", "shipDate": "ship_date"}
+
+    def __init__(
+        self,
+        id: int = None,
+        pet_id: int = None,
+        quantity: int = None,
+        ship_date: str = None,
+        status: str = None,
+        complete: bool = None,
+    ):
+        self.id = id
+        self.pet_id = pet_id
+        self.quantity = quantity
+        self.ship_date = ship_date
+        self.status = status
+        self.complete = complete
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Order":
+        get = data.get
+        order = object.__new__(cls)
+        order.id = get("id")
+        order.pet_id = get("petId")
+        order.quantity = get("quantity")
+        order.ship_date = get("shipDate")
+        status = get("status")
+        order.status = intern(status) if type(status) is str else status
+        order.complete = get("complete")
+        return order
+
+    def to_json(self) -> dict:
+        data = {}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.pet_id is not None:
+            data["petId"] = self.pet_id
+        if self.quantity is not None:
+            data["quantity"] = self.quantity
+        if self.ship_date is not None:
+            data["shipDate"] = self.ship_date
+        if self.status is not None:
+            data["status"] = self.status
+        if self.complete is not None:
+            data["complete"] = self.complete
+        return data
+
+
+class Inventory(Model):
+    """
+    GET /store/inventory: counts of the pet statuses as attributes, plus
+    the arbitrary statuses the public server accumulates in `other`
+    (None when there are none). inventory["sold"] reads either.
+    """
+
+    __slots__ = ("available", "pending", "sold", "other")
+    KNOWN = ("available", "pending", "sold")
+
+    def __init__(self, available: int = None, pending: int = None, sold: int = None, other: dict = None):
+        self.available = available
+        self.pending = pending
+        self.sold = sold
+        self.other = other
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Inventory":
+        get = data.get
+        inventory = object.__new__(cls)
+        inventory.available = get("available")
+        inventory.pending = get("pending")
+        inventory.sold = get("sold")
+        other = {status: count for status, count in data.items() if status not in cls.KNOWN}
+        inventory.other = other or None
+        return inventory
+
+    def to_json(self) -> dict:
+        data = {status: getattr(self, status) for status in self.KNOWN if getattr(self, status) is not None}
+        if self.other:
+            data.update(self.other)
+        return data
+
+    def __getitem__(self, status: str) -> int:
+        count = getattr(self, status) if status in self.KNOWN else (self.other or {}).get(status)
+        if count is None:
+            raise KeyError(status)
+        return count
+
+    def get(self, status: str, default: int = None) -> int:
+        try:
+            return self[status]
+        except KeyError:
+            return default
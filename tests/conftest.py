@@ -1,28 +1,462 @@
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import random
+import tempfile
+
 import pytest
 
-from src.api.base_api import ApiClient
+from src.api.async_base_api import AsyncApiClient
+from src.api.async_pet_api import AsyncPetApi
+from src.api.async_store_api import AsyncStoreApi
+from src.api.base_api import DEFAULT_BASE_URL, ApiClient
 from src.api.files_api import FilesApi
 from src.api.store_api import StoreApi
 from src.api.pet_api import PetApi
+from src.api.rate_limiter import AdaptiveLimiter
+from src.api.response_cache import ResponseCache
+from src.api.single_flight import AsyncSingleFlight, SingleFlight
 from src.factories.order_factory import OrderFactory
-from src.factories.pet_factory import PetFactory
-from utils.logger import Logger
+from src.factories.pet_factory import PetFactory, fake
+from utils.allure_merge import SHARD_DURATIONS
+from utils.cassette import Cassette, VirtualClock
+from utils.entity_pool import EntityPool
+from utils.logger import LogFormat, LogLevel, Logger
+from utils.durations import DEFAULT_HISTORY, DEFAULT_INDEX, DurationIndex, RunDurations, assign_shards
+from utils.metrics import ApiMetrics
+from utils.petstore_stub import PetstoreStub
+from utils.lazy import lazy_import
+from utils.resource_tracker import ResourceTracker
+from utils.waiters import Poller
+
+allure = lazy_import("allure")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("petstore")
+    group.addoption(
+        "--petstore-url",
+        default=DEFAULT_BASE_URL,
+        help="Petstore base URL (default: $PETSTORE_BASE_URL or the public server)",
+    )
+    group.addoption(
+        "--local-petstore",
+        action="store_true",
+        help="run the suite against the in-process Petstore emulator",
+    )
+    group.addoption("--petstore-latency", type=float, default=0.0)
+    group.addoption("--petstore-consistency-delay", type=float, default=0.0)
+    group.addoption(
+        "--api-log-level", default=LogLevel.DEBUG, choices=list(LogLevel.ORDER)
+    )
+    group.addoption(
+        "--api-log-format",
+        default=LogFormat.TEXT,
+        choices=[LogFormat.TEXT, LogFormat.JSONL],
+    )
+    group.addoption(
+        "--api-log-max-body",
+        type=int,
+        default=None,
+        help="truncate logged response bodies to this many characters",
+    )
+    group.addoption(
+        "--api-cache-ttl",
+        type=float,
+        default=0,
+        help="serve repeated GETs from a per-session response cache for this many seconds",
+    )
+    group.addoption(
+        "--api-single-flight",
+        action="store_true",
+        help="let concurrent identical GETs (pool fillers, pollers) share one request",
+    )
+    group.addoption(
+        "--api-rate-limit",
+        type=float,
+        default=0,
+        help="start at this many requests/s shared by all xdist workers, adapting to errors and latency",
+    )
+    group.addoption(
+        "--api-max-concurrency",
+        type=int,
+        default=8,
+        help="most requests in flight per worker while --api-rate-limit is on",
+    )
+    group.addoption(
+        "--soak-duration",
+        type=float,
+        default=0,
+        help="run the soak test for this many seconds (skipped otherwise)",
+    )
+    group.addoption("--soak-concurrency", type=int, default=4, help="virtual users of the soak test")
+    group.addoption("--soak-interval", type=float, default=10, help="seconds between resource samples")
+    group.addoption("--soak-warmup", type=float, default=60, help="seconds left out of the slope fit")
+    group.addoption("--soak-series", help="JSONL file for the soak samples (default: the test's tmp_path)")
+    group.addoption(
+        "--max-slope",
+        action="append",
+        default=[],
+        help="metric=limit growth per minute the soak test tolerates, e.g. rss_kb=256; repeatable",
+    )
+    group.addoption(
+        "--cleanup-concurrency",
+        type=int,
+        default=16,
+        help="parallel deletes of the pets and orders left behind, at the end of the session",
+    )
+    group.addoption(
+        "--entity-pool-size",
+        type=int,
+        default=8,
+        help="pets and orders pre-created for exclusive leases, split across xdist workers",
+    )
+    group.addoption(
+        "--cassette",
+        default="off",
+        choices=["off", Cassette.RECORD, Cassette.REPLAY],
+        help="record API traffic per test, or replay it without network or waiter sleeps",
+    )
+    group.addoption("--cassette-dir", default="tests/cassettes")
+    group.addoption(
+        "--lpt-schedule",
+        action="store_true",
+        help="with -n: hand out tests longest predicted duration first, one at a time",
+    )
+    group.addoption("--duration-index", default=DEFAULT_INDEX)
+    group.addoption("--duration-history", default=DEFAULT_HISTORY, help="allure history.json fallback")
+    group.addoption(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="split the suite across this many nodes, balanced by the duration index",
+    )
+    group.addoption("--shard-index", type=int, default=0, help="0-based shard this node runs")
+
+
+METRICS_DIR = "output/metrics"
+
+
+def pytest_configure(config):
+    if not hasattr(config, "workerinput"):
+        for stale in glob.glob(f"{METRICS_DIR}/latency_*.json"):
+            with contextlib.suppress(FileNotFoundError):  # another local shard got there first
+                os.remove(stale)
+    Logger.configure(
+        level=config.getoption("--api-log-level"),
+        log_format=config.getoption("--api-log-format"),
+        max_body_chars=config.getoption("--api-log-max-body"),
+    )
+    mode = config.getoption("--cassette")
+    config.cassette = None if mode == "off" else Cassette(config.getoption("--cassette-dir"), mode)
+    if mode == Cassette.REPLAY:
+        clock = VirtualClock()
+        Poller.sleep = staticmethod(clock.sleep)
+        Poller.clock = staticmethod(clock.time)
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(RunDurations(), "run_durations")
+        config.rate_limit_file = None
+        if config.getoption("--api-rate-limit"):
+            descriptor, config.rate_limit_file = tempfile.mkstemp(prefix="petstore-rate-", suffix=".bin")
+            os.close(descriptor)
+
+
+def pytest_unconfigure(config):
+    Logger.close()  # here, after the session fixtures' teardown has logged its stats
+    if getattr(config, "rate_limit_file", None):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(config.rate_limit_file)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Every xdist worker shares the controller's rate limit budget"""
+    node.workerinput["rate_limit_file"] = node.config.rate_limit_file
+
+
+def pytest_collection_modifyitems(config, items):
+    count, shard = config.getoption("--shard-count"), config.getoption("--shard-index")
+    if count <= 1:
+        return
+    if not 0 <= shard < count:
+        raise pytest.UsageError(f"--shard-index must be in [0, {count}), got {shard}")
+    index = DurationIndex(config.getoption("--duration-index"), config.getoption("--duration-history"))
+    selected = set(assign_shards([item.nodeid for item in items], count, index)[shard])
+    config.hook.pytest_deselected(items=[item for item in items if item.nodeid not in selected])
+    items[:] = [item for item in items if item.nodeid in selected]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption("--lpt-schedule"):
+        return None
+    from utils.lpt_scheduling import LPTScheduling, supported  # controller only, workers never load it
+
+    if not supported():
+        config.pluginmanager.get_plugin("terminalreporter").write_line(
+            "--lpt-schedule: unsupported pytest-xdist version, using the default load scheduler", yellow=True
+        )
+        return None
+    index = DurationIndex(config.getoption("--duration-index"), config.getoption("--duration-history"))
+    scheduler = LPTScheduling(config, log, index=index)
+    config.pluginmanager.get_plugin("run_durations").scheduler = scheduler
+    return scheduler
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Before any fixture: point the cassette at this test's tape and seed the test data"""
+    if item.config.cassette is not None:
+        item.config.cassette.use(item.nodeid)
+        random.seed(item.nodeid)
+        fake.seed_instance(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_teardown(item):
+    yield
+    if item.config.cassette is not None:
+        item.config.cassette.use(None)
+
+
+def pytest_sessionfinish(session):
+    if session.config.cassette is not None:
+        session.config.cassette.close()
+    if not hasattr(session.config, "workerinput"):
+        """xdist controller (or a plain run): merge the per-worker histograms, update the duration index"""
+        run_durations = session.config.pluginmanager.get_plugin("run_durations")
+        if run_durations.tests and not (session.config.cassette and session.config.cassette.replaying):
+            if session.config.getoption("--shard-count") > 1:
+                # every node must split with the same index: hand the timings to the merge instead
+                alluredir = session.config.getoption("allure_report_dir")
+                if alluredir:
+                    with open(os.path.join(alluredir, SHARD_DURATIONS), "w", encoding="utf-8") as file:
+                        json.dump(run_durations.tests, file, indent=1)
+            else:
+                index = run_durations.scheduler.index if run_durations.scheduler else DurationIndex(
+                    session.config.getoption("--duration-index"), None
+                )
+                index.update(run_durations.tests)
+                index.save()
+        merged = ApiMetrics()
+        for worker_file in glob.glob(f"{METRICS_DIR}/latency_*.json"):
+            if not worker_file.endswith("latency_summary.json"):
+                merged.merge(ApiMetrics.load(worker_file))
+        if merged.endpoints:
+            with open(f"{METRICS_DIR}/latency_summary.json", "w", encoding="utf-8") as file:
+                json.dump(merged.summary(), file, indent=2)
+
+
+@pytest.fixture(scope="session")
+def petstore_stub():
+    """Zero-latency emulator for tests of the client machinery itself"""
+    with PetstoreStub() as stub:
+        yield stub
+
+
+@pytest.fixture(scope="session")
+def base_url(pytestconfig):
+    if pytestconfig.cassette is not None and pytestconfig.cassette.replaying:
+        yield pytestconfig.getoption("--petstore-url")  # never contacted
+        return
+    if not pytestconfig.getoption("--local-petstore"):
+        yield pytestconfig.getoption("--petstore-url")
+        return
+    with PetstoreStub(
+        latency=pytestconfig.getoption("--petstore-latency"),
+        consistency_delay=pytestconfig.getoption("--petstore-consistency-delay"),
+    ) as stub:
+        yield stub.base_url
+
+
+@pytest.fixture(scope="session")
+def api_metrics():
+    metrics = ApiMetrics()
+    yield metrics
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    metrics.save(f"{METRICS_DIR}/latency_{worker}.json")
+    allure.attach(
+        json.dumps(metrics.summary(), indent=2),
+        name=f"latency_summary_{worker}",
+        attachment_type=allure.attachment_type.JSON,
+    )
 
 
 @pytest.fixture(scope="session")
-def api_client():
+def rate_limiter(pytestconfig):
+    rate = pytestconfig.getoption("--api-rate-limit")
+    if not rate:
+        yield None
+        return
+    workerinput = getattr(pytestconfig, "workerinput", None)
+    limiter = AdaptiveLimiter(
+        rate=rate,
+        max_concurrency=pytestconfig.getoption("--api-max-concurrency"),
+        shared_path=workerinput["rate_limit_file"] if workerinput else pytestconfig.rate_limit_file,
+    )
+    yield limiter
+    Logger.info(f"rate limiter: {limiter.stats()}")
+    limiter.close()
+
+
+@pytest.fixture(scope="session")
+def api_client(pytestconfig, base_url, api_metrics, rate_limiter):
     logger = Logger()
-    return ApiClient(logger)
+    ttl = pytestconfig.getoption("--api-cache-ttl")
+    cache = ResponseCache(ttl=ttl) if ttl else None
+    single_flight = SingleFlight() if pytestconfig.getoption("--api-single-flight") else None
+    client = ApiClient(
+        logger,
+        base_url=base_url,
+        metrics=api_metrics,
+        cache=cache,
+        cassette=pytestconfig.cassette,
+        limiter=rate_limiter,
+        single_flight=single_flight,
+    )
+    yield client
+    client.close()
+    if single_flight is not None:
+        Logger.info(f"single flight: {single_flight.stats()}")
+    if cache is not None:
+        Logger.info(f"response cache: {cache.stats()}")
+
+
+@pytest.fixture(scope="session")
+def resource_tracker(pytestconfig, api_client):
+    """Pets and orders created through pet_api/store_api; what is still alive is deleted at the end"""
+    tracker = ResourceTracker()
+    yield tracker
+    if pytestconfig.cassette is not None and pytestconfig.cassette.replaying:
+        return  # nothing was really created
+    # a client of its own, so the cleanup isn't recorded into a cassette
+    client = ApiClient(
+        api_client.logger, base_url=api_client.base_url, session=api_client.session, limiter=api_client.limiter
+    )
+    report = tracker.cleanup(
+        PetApi(client), StoreApi(client), concurrency=pytestconfig.getoption("--cleanup-concurrency")
+    )
+    Logger.info(f"cleanup: {report}")
+    allure.attach(
+        json.dumps(report, indent=2),
+        name=f"cleanup_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+@pytest.fixture(scope="session")
+def store_api(api_client, resource_tracker):
+    return StoreApi(api_client, tracker=resource_tracker)
+
+
+@pytest.fixture(scope="session")
+def pet_api(api_client, resource_tracker):
+    return PetApi(api_client, tracker=resource_tracker)
+
+
+def entity_pool(pytestconfig, factory, api) -> EntityPool:
+    size = EntityPool.per_worker(pytestconfig.getoption("--entity-pool-size"))
+    return factory(api, size=size, shared_size=1).fill()
+
+
+def cassette_entity(name: str, payload: dict, create, probe) -> dict:
+    """
+    With a cassette the session pools are bypassed: each test provisions its
+    own entity from payloads seeded by its node id, so that traffic lands on
+    the test's own tape and the tape replays alone, in any order and on any
+    xdist worker
+    """
+    pool = EntityPool(name, [payload], create, probe, size=1, shared_size=0, background=False)
+    return pool.fill().acquire()
+
+
+def pooled_pet(request, lease: str) -> dict:
+    if request.config.cassette is not None:
+        pet_api = request.getfixturevalue("pet_api")
+        return cassette_entity("pet", PetFactory.default_pet(), pet_api.add_pet, pet_api.find_pet_by_id)
+    return getattr(request.getfixturevalue("pet_pool"), lease)()
+
+
+def pooled_order(request, lease: str) -> dict:
+    if request.config.cassette is not None:
+        store_api = request.getfixturevalue("store_api")
+        return cassette_entity(
+            "order",
+            OrderFactory.default_order(quantity=3),
+            store_api.place_order,
+            store_api.get_info_about_placed_order_by_id,
+        )
+    return getattr(request.getfixturevalue("order_pool"), lease)()
+
+
+@pytest.fixture(scope="session")
+def pet_pool(pytestconfig, pet_api):
+    pool = entity_pool(pytestconfig, EntityPool.for_pets, pet_api)
+    yield pool
+    pool.close()
+    Logger.info(f"pet pool: {pool.summary()}")
+
+
+@pytest.fixture(scope="session")
+def order_pool(pytestconfig, store_api):
+    pool = entity_pool(pytestconfig, EntityPool.for_orders, store_api)
+    yield pool
+    pool.close()
+    Logger.info(f"order pool: {pool.summary()}")
+
+
+@pytest.fixture
+def leased_pet(request):
+    """A consistent pet owned by this test alone; it may be updated or deleted"""
+    return pooled_pet(request, "acquire")
+
+
+@pytest.fixture
+def shared_pet(request):
+    """A consistent pet shared between read-only tests; do not modify it"""
+    return pooled_pet(request, "share")
+
+
+@pytest.fixture
+def leased_order(request):
+    return pooled_order(request, "acquire")
+
+
+@pytest.fixture
+def shared_order(request):
+    return pooled_order(request, "share")
+
+
+@pytest.fixture(scope="session")
+def async_loop():
+    """One event loop for the session, so async clients keep their connection pool"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def async_api_client(pytestconfig, async_loop, base_url):
+    if pytestconfig.cassette is not None and pytestconfig.cassette.replaying:
+        pytest.skip("the async client has no cassette support")
+    single_flight = AsyncSingleFlight() if pytestconfig.getoption("--api-single-flight") else None
+    client = AsyncApiClient(Logger(), base_url=base_url, single_flight=single_flight)
+    yield client
+    async_loop.run_until_complete(client.aclose())
+    if single_flight is not None:
+        Logger.info(f"async single flight: {single_flight.stats()}")
 
 
 @pytest.fixture(scope="session")
-def store_api(api_client):
-    return StoreApi(api_client)
+def async_store_api(async_api_client):
+    return AsyncStoreApi(async_api_client)
 
 
 @pytest.fixture(scope="session")
-def pet_api(api_client):
-    return PetApi(api_client)
+def async_pet_api(async_api_client):
+    return AsyncPetApi(async_api_client)
 
 
 @pytest.fixture(scope="session")
@@ -38,8 +472,17 @@ def pet_payload(pet_api):
 
 
 @pytest.fixture(scope="session")
-def files_client(logger):
-    return FilesApi(base_url="https://petstore.swagger.io/v2", logger=logger)
+def files_client(logger, api_client):
+    return FilesApi(
+        base_url=api_client.base_url,
+        logger=logger,
+        session=api_client.session,
+        cassette=api_client.cassette,
+        cache=api_client.cache,  # an upload must evict the pet the other client cached
+        single_flight=api_client.single_flight,
+        limiter=api_client.limiter,  # uploads draw from, and adapt, the shared budget
+        metrics=api_client.metrics,
+    )
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,26 @@
+from src.api.base_api import ApiClient
+from src.api.files_api import FilesApi
+from src.api.pet_api import PetApi
+from src.factories.file_factory import FileFactory
+from src.factories.pet_factory import PetFactory
+
+
+def test_clients_share_one_connection_pool(petstore_stub, logger):
+    client = ApiClient(logger, base_url=petstore_stub.base_url, pool_size=4)
+    files_client = FilesApi(logger, base_url=client.base_url, session=client.session)
+    assert files_client.session is client.session
+
+    pet_payload = PetFactory.default_pet()
+    add_pet_response = PetApi(client).add_pet(pet_payload)
+    assert add_pet_response.status_code == 200
+    assert add_pet_response.json()["id"] == pet_payload["id"]
+
+    upload_response = files_client.upload_pet_image(
+        pet_payload["id"], FileFactory.pet_image("test_dog.png")
+    )
+    assert upload_response.status_code == 200
+
+    adapter = client.session.get_adapter(client.base_url)
+    assert adapter._pool_maxsize == 4
+    assert len(adapter.poolmanager.pools) == 1, "Expected the keep-alive pool to be reused"
+    client.close()
@@ -0,0 +1,109 @@
+import asyncio
+import contextlib
+import subprocess
+import sys
+
+import pytest
+
+from src.api import async_base_api
+from src.api.async_base_api import AsyncApiClient, async_step
+from src.api.async_files_api import AsyncFilesApi
+from src.api.async_pet_api import AsyncPetApi
+from src.api.async_store_api import AsyncStoreApi
+from src.factories.file_factory import FileFactory
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+
+
+async def create_get_delete_pet(pet_api: AsyncPetApi) -> int:
+    pet_payload = PetFactory.default_pet()
+    add_pet_response = await pet_api.add_pet(pet_payload)
+    assert add_pet_response.status_code == 200, "unsuccessful attempt to add a pet"
+    assert add_pet_response.json()["id"] == pet_payload["id"]
+
+    found_pet = await pet_api.find_pet_by_id(pet_payload["id"])
+    assert found_pet.status_code == 200, "unsuccessful attempt to get a pet"
+
+    delete_response = await pet_api.delete_pet(pet_payload["id"])
+    return delete_response.status_code
+
+
+def test_concurrent_pet_flows(async_pet_api, async_loop):
+    async def scenario():
+        return await asyncio.gather(*(create_get_delete_pet(async_pet_api) for _ in range(50)))
+
+    statuses = async_loop.run_until_complete(scenario())
+    assert statuses == [200] * 50
+
+
+def test_async_store_and_files(async_store_api, async_api_client, logger, async_loop):
+    async def scenario():
+        order_payload = OrderFactory.default_order(quantity=3)
+        order = await async_store_api.place_order(order_payload)
+        assert order.json()["petId"] == order_payload["petId"]
+        assert (await async_store_api.get_inventory()).status_code == 200
+        async with AsyncFilesApi(logger, base_url=async_api_client.base_url) as files_client:
+            upload = await files_client.upload_pet_image(
+                order_payload["petId"], FileFactory.pet_image("test_dog.png")
+            )
+        assert upload.status_code == 200, "unsuccessful to upload pet image"
+
+    async_loop.run_until_complete(scenario())
+
+
+def test_async_fixtures_are_skipped_in_replay(tmp_path):
+    run = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-o", "addopts=",
+         "tests/test_async_api.py::test_concurrent_pet_flows", "--cassette=replay", f"--cassette-dir={tmp_path}"],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=120,
+    )
+    assert run.returncode == 0 and "1 skipped" in run.stdout, run.stdout
+
+
+def test_async_step_reports_calls_that_raise(monkeypatch):
+    steps = []
+
+    @contextlib.contextmanager
+    def step(title):
+        try:
+            yield
+        except BaseException as error:
+            steps.append((title, type(error).__name__))
+            raise
+        steps.append((title, "passed"))
+
+    monkeypatch.setattr(async_base_api, "allure", type("Allure", (), {"step": staticmethod(step)}))
+
+    @async_step("GET /pet/{pet_id}")
+    async def find(pet_id):
+        await asyncio.sleep(0)
+        if pet_id < 0:
+            raise ValueError(pet_id)
+        return pet_id
+
+    assert asyncio.run(find(1)) == 1
+    with pytest.raises(ValueError):
+        asyncio.run(find(-1))
+    assert steps == [("GET /pet/1", "passed"), ("GET /pet/-1", "ValueError")]
+
+
+def test_each_loop_gets_its_own_session_closed_with_the_loop(petstore_stub, logger):
+    client = AsyncApiClient(logger, base_url=petstore_stub.base_url)
+
+    async def inventory():
+        response = await client.get("/store/inventory")
+        return response.status_code, await client._get_session()
+
+    first_status, first = asyncio.run(inventory())
+    second_status, second = asyncio.run(inventory())
+    assert first_status == second_status == 200
+    assert first is not second and first.closed and second.closed
+
+    loop = asyncio.new_event_loop()
+    try:
+        third = loop.run_until_complete(inventory())[1]
+        assert loop.run_until_complete(inventory())[1] is third and not third.closed
+        loop.run_until_complete(client.aclose())
+        assert third.closed and not client._sessions
+    finally:
+        loop.close()
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+import time
+from collections import deque
+
+import pytest
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from src.factories.pet_factory import PetFactory
+from utils.cassette import Cassette, CassetteMissError, VirtualClock
+from utils.enums import PetStatus
+from utils.logger import NullLogger
+from utils.petstore_stub import PetstoreStub
+from utils.waiters import PetWaiter, Poller
+
+
+def test_replay_serves_recorded_responses_in_order(tmp_path, logger):
+    test_name = "tests/test_x.py::test_flow"
+    pet_payload = PetFactory.default_pet()
+    with PetstoreStub(consistency_delay=0.3) as stub:
+        recorder = Cassette(str(tmp_path), Cassette.RECORD)
+        recorder.use(test_name)
+        pet_api = PetApi(ApiClient(logger, base_url=stub.base_url, cassette=recorder))
+        pet_api.add_pet(pet_payload)
+        PetWaiter.wait_for_pet(pet_api, pet_payload["id"], delay=0.1)
+        statuses = [pet["status"] for pet in pet_api.iter_pets_by_status(PetStatus.SOLD)]
+        recorder.close()
+
+    player = Cassette(str(tmp_path), Cassette.REPLAY)
+    player.use(test_name)
+    pet_api = PetApi(ApiClient(NullLogger, base_url="http://unreachable.invalid/v2", cassette=player))
+    assert pet_api.add_pet(pet_payload).json()["id"] == pet_payload["id"]
+    first_lookup = pet_api.find_pet_by_id(pet_payload["id"])
+    assert first_lookup.status_code == 404, "Recorded consistency delay should be replayed"
+    assert [pet["status"] for pet in pet_api.iter_pets_by_status(PetStatus.SOLD)] == statuses
+    with pytest.raises(CassetteMissError):
+        pet_api.find_pet_by_id(-1)
+
+
+def test_waiters_replay_without_sleeping(tmp_path, monkeypatch):
+    clock = VirtualClock()
+    monkeypatch.setattr(Poller, "sleep", staticmethod(clock.sleep))
+    monkeypatch.setattr(Poller, "clock", staticmethod(clock.time))
+    player = Cassette(str(tmp_path), Cassette.REPLAY)
+    not_found = {"status": 404, "reason": "Not Found", "headers": {}, "text": ""}
+    found = {"status": 200, "reason": "OK", "headers": {}, "text": '{"id": 7}'}
+    player.tape = {Cassette.key("GET", "/pet/7"): deque([not_found, not_found, found])}
+    pet_api = PetApi(ApiClient(NullLogger, cassette=player))
+
+    started = time.perf_counter()
+    response = PetWaiter.wait_for_pet(pet_api, 7, delay=4)
+    assert response.json() == {"id": 7}
+    assert time.perf_counter() - started < 0.5
+    assert clock.now > 0, "Backoff should advance the virtual clock instead of sleeping"
+    assert pet_api.find_pet_by_id(7).status_code == 200, "The last response repeats"
+
+
+def test_one_test_replays_alone_from_a_multi_test_recording(tmp_path):
+    """Pooled entities are provisioned per test under a cassette, so no tape depends on another test"""
+
+    def pytest_run(*args):
+        run = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-o", "addopts=",
+             f"--cassette-dir={tmp_path}", *args],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=120,
+        )
+        assert run.returncode == 0, run.stdout
+        return run.stdout
+
+    pytest_run("tests/test_pet_api.py", "tests/test_store_api.py", "--local-petstore", "--cassette=record")
+    for test in ("tests/test_pet_api.py::test_delete_pet", "tests/test_store_api.py::test_delete_purchase_order_by_id"):
+        assert "1 passed" in pytest_run(test, "--cassette=replay")
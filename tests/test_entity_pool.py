@@ -0,0 +1,17 @@
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from utils.entity_pool import EntityPool
+
+
+def test_entity_pool_leases_each_pet_once_and_refills(petstore_stub, logger):
+    pet_api = PetApi(ApiClient(logger, base_url=petstore_stub.base_url))
+    pool = EntityPool.for_pets(pet_api, size=2, shared_size=1).fill()
+
+    shared = {pool.share()["id"] for _ in range(3)}
+    leased = [pool.acquire()["id"] for _ in range(5)]
+    pool.close()
+
+    assert len(shared) == 1 and shared.isdisjoint(leased)
+    assert len(set(leased)) == len(leased), "An exclusive lease was handed out twice"
+    assert all(pet_api.find_pet_by_id(pet_id).status_code == 200 for pet_id in leased)
+    assert pool.summary()["leased"] == 5 and pool.summary()["created"] >= 6
@@ -0,0 +1,33 @@
+import itertools
+
+from src.factories.id_allocator import IdAllocator
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+
+
+def test_pet_batch_is_reproducible_from_seed():
+    first = list(PetFactory.batch(50, seed=7, status=("available", "sold")))
+    second = list(PetFactory.batch(50, seed=7, status=("available", "sold")))
+    assert first == second
+    assert set(first[0]) == set(PetFactory.default_pet())
+    assert {pet["status"] for pet in first} == {"available", "sold"}
+
+
+def test_batches_are_lazy_and_ids_unique():
+    pets = PetFactory.batch()
+    assert len(list(itertools.islice(pets, 3))) == 3, "Unbounded batch must be consumable lazily"
+
+    orders = list(OrderFactory.batch(20000, pet_ids=[1, 2]))
+    assert len({order["id"] for order in orders}) == len(orders)
+    assert {order["petId"] for order in orders} == {1, 2}
+
+
+def test_worker_id_slices_do_not_overlap():
+    count = 4
+    allocators = [IdAllocator(worker_index=index, worker_count=count, seed=1) for index in range(count)]
+    slices = [(allocator.low, allocator.low + allocator.span) for allocator in allocators]
+    for allocator, (low, high) in zip(allocators, slices):
+        ids = list(itertools.islice(allocator, 1000))
+        assert all(low <= pet_id < high for pet_id in ids)
+    assert all(slices[index][1] <= slices[index + 1][0] for index in range(count - 1))
+    assert slices[-1][1] <= IdAllocator.LIMIT + 1
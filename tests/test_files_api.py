@@ -0,0 +1,50 @@
+import tracemalloc
+
+import pytest
+
+from src.api.files_api import FilesApi
+from src.factories.file_factory import FileFactory
+from utils.multipart import MultipartStream
+from utils.petstore_stub import iter_multipart
+
+
+def test_multipart_stream_round_trip_without_buffering(tmp_path):
+    image_path = tmp_path / "big.png"
+    image_path.write_bytes(FileFactory.synthetic_image(8_000_000)[1])
+
+    tracemalloc.start()
+    with MultipartStream({"additionalMetadata": "meta"}, {"file": str(image_path)}) as body:
+        total = 0
+        for block in iter(lambda: body.read(65536), b""):
+            total += len(block)
+        peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert total == len(body)
+    assert peak < 1_000_000, f"Streaming held {peak} bytes in memory"
+
+    with MultipartStream({"additionalMetadata": "meta"}, {"file": str(image_path)}) as body:
+        data = body.read()
+    parts = list(iter_multipart(body.content_type, data))
+    assert [end - start for _, start, end in parts] == [4, 8_000_000]
+    assert data[parts[1][1]:parts[1][1] + 8] == b"\x89PNG\r\n\x1a\n"
+
+
+def test_upload_images_reports_throughput(petstore_stub, logger):
+    files_api = FilesApi(logger, base_url=petstore_stub.base_url, pool_size=4)
+    image = FileFactory.synthetic_image(256 * 1024, "dog.png")
+    report = files_api.upload_images(
+        [(pet_id, image) for pet_id in range(1, 9)], concurrency=4, additional_metadata="bulk"
+    )
+    files_api.close()
+
+    assert not report.failures, report.summary()
+    assert all("dog.png, 262144 bytes" in response.json()["message"] for response in report.responses)
+    assert report.total_bytes > 8 * 256 * 1024 and report.mb_per_s > 0
+
+
+def test_suite_uploads_reach_the_latency_summary(pytestconfig, files_client, api_metrics, shared_pet):
+    if pytestconfig.cassette is not None and pytestconfig.cassette.replaying:
+        pytest.skip("replayed requests are not timed")
+    response = files_client.upload_image(shared_pet["id"], FileFactory.synthetic_image(1024, "dog.png"))
+    assert response.status_code == 200
+    assert api_metrics.summary()["POST /pet/{petId}/uploadImage"]["total"]["count"] >= 1
@@ -0,0 +1,98 @@
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from utils.enums import PetStatus
+from utils.json_stream import iter_json_array, merge_parallel
+
+
+def chunked(data: bytes, size: int):
+    return (data[index:index + size] for index in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_items_survive_any_chunk_boundary(chunk_size):
+    items = [{"id": index, "name": "Ékö", "tags": [{"id": 1}]} for index in range(20)]
+    items += [2.5, -12e3, "text, with ]", None, True, []]
+    data = json.dumps(items).encode()
+    assert list(iter_json_array(chunked(data, chunk_size))) == items
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(data[:-1], chunk_size)))
+
+
+@pytest.mark.parametrize("body", ['[{"a": 1}{"b": 2}]', "[1,,2]", "[1,]", "[,1]", '["a" "b"]', "[1 2]"])
+def test_separators_are_required_between_items(body):
+    for chunk_size in (1, 1 << 10):
+        with pytest.raises(ValueError, match="Expected ',' or ']'|Invalid JSON"):
+            list(iter_json_array(chunked(body.encode(), chunk_size)))
+
+
+def test_syntax_error_is_reported_without_reading_the_rest():
+    consumed = []
+
+    def body():
+        for chunk in [b'[{"a": 1}, {"a": tru', b'e}, {"a": tru}, ', *[b'{"a": 1}, '] * 1000, b"{}]"]:
+            consumed.append(chunk)
+            yield chunk
+
+    with pytest.raises(ValueError, match="Invalid JSON array item"):
+        list(iter_json_array(body()))
+    assert len(consumed) == 2
+
+
+def test_peak_memory_does_not_grow_with_list_size():
+    def body(count: int):
+        yield b"["
+        for index in range(count):
+            yield (b"," if index else b"") + json.dumps(
+                {"id": index, "name": "Rex", "photoUrls": ["url"], "status": "available"}
+            ).encode()
+        yield b"]"
+
+    peaks = []
+    for count in (1000, 20000):
+        tracemalloc.start()
+        assert sum(1 for _ in iter_json_array(body(count))) == count
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    # the 20000-pet body is ~1.7 MB; parsing it must not hold more than a few items
+    assert peaks[1] < max(peaks[0] * 4, 100_000), f"Peak memory grew with the list: {peaks}"
+
+
+def test_merge_parallel_stops_producers_on_early_exit():
+    produced = []
+
+    def endless(name):
+        def source():
+            for index in range(10 ** 9):
+                produced.append(name)
+                yield name, index
+        return source
+
+    merged = merge_parallel([endless("a"), endless("b")], max_buffered=8)
+    assert len([next(merged) for _ in range(5)]) == 5
+    merged.close()
+    stopped_at = len(produced)
+    time.sleep(0.1)
+    assert len(produced) == stopped_at < 100, "Producers kept running after close()"
+
+
+def test_iter_pets_by_status_merges_statuses(petstore_stub, logger):
+    pet_api = PetApi(ApiClient(logger, base_url=petstore_stub.base_url))
+    statuses = [PetStatus.AVAILABLE, PetStatus.PENDING, PetStatus.SOLD]
+    expected = {
+        pet["id"] for status in statuses for pet in pet_api.find_pet_by_status(status).json()
+    }
+
+    streamed = [pet["id"] for pet in pet_api.iter_pets_by_status(statuses)]
+    assert sorted(streamed) == sorted(expected)
+
+    first_two = list(pet_api.iter_pets_by_status(statuses, limit=2))
+    assert len(first_two) == 2
+    sold = list(pet_api.iter_pets_by_status(statuses, until=lambda pet: pet["status"] == "sold"))
+    assert sold[-1]["status"] == "sold"
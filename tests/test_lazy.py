@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+
+def test_importing_the_harness_builds_nothing_heavy():
+    probe = (
+        "import sys\n"
+        "import src.api.async_files_api, src.api.store_api, src.factories.pet_factory, utils.logger\n"
+        "from src.factories.pet_factory import fake\n"
+        "from utils.logger import Logger\n"
+        "print(fake.created, Logger.file_name, 'aiohttp.client' in sys.modules, 'allure_commons' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "None", "False", "False"]
+
+
+def test_lazy_module_is_complete_for_threads_racing_to_first_use():
+    probe = (
+        "from concurrent.futures import ThreadPoolExecutor\n"
+        "from utils.lazy import lazy_import\n"
+        "faker = lazy_import('faker')\n"
+        "with ThreadPoolExecutor(16) as pool:\n"
+        "    print(all(pool.map(lambda _: callable(faker.Faker), range(64))))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["True"]
@@ -0,0 +1,54 @@
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from src.api.store_api import StoreApi
+from src.factories.id_allocator import IdAllocator
+from src.load.runner import LoadRunner, LoadStats, ScenarioContext
+from src.load.scenarios import SCENARIOS
+from utils.logger import NullLogger
+
+
+class FakeResponse:
+    status_code = 200
+
+
+class FakeApi:
+    def __getattr__(self, name):
+        return name
+
+
+def test_open_loop_run_reports_every_endpoint(petstore_stub):
+    client = ApiClient(NullLogger, base_url=petstore_stub.base_url)
+    runner = LoadRunner(
+        PetApi(client),
+        StoreApi(client),
+        {name: (1, scenario) for name, scenario in SCENARIOS.items()},
+        duration=1,
+        rps=60,
+        seed=7,
+    )
+    report = runner.run()
+    client.close()
+
+    assert sum(report["scenarios"].values()) == 60
+    assert "GET /pet/{petId}" in report["endpoints"]
+    assert "GET /store/inventory" in report["endpoints"]
+    for endpoint, data in report["endpoints"].items():
+        assert data["statuses"].get("200", 0) > 0, f"No successful {endpoint}: {data}"
+        assert data["latency_ms"]["p50"] <= data["latency_ms"]["p99"]
+
+
+def test_scenarios_never_reuse_an_entity_id():
+    created = []
+
+    class RecordingContext(ScenarioContext):
+        def call(self, endpoint, func, *args):
+            if endpoint.startswith("POST"):
+                created.append((endpoint, args[0]["id"]))
+            return FakeResponse()
+
+    ctx = RecordingContext(FakeApi(), FakeApi(), LoadStats(), 0, IdAllocator(seed=3))
+    for _ in range(2000):
+        SCENARIOS["pet_lifecycle"](ctx)
+        SCENARIOS["order_lifecycle"](ctx)
+
+    assert len(set(created)) == len(created) == 4000
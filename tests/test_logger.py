@@ -0,0 +1,76 @@
+import json
+import random
+
+from utils.logger import LogFormat, LogLevel, LogRecord, LogWriter, Logger
+
+
+class FakeResponse:
+    status_code = 200
+    _content = b'[{"id": 1, "status": "available"}, {"id": 2, "status": "sold"}]'
+    content = _content
+
+
+def test_log_writer_batches_and_flushes(tmp_path):
+    writer = LogWriter(str(tmp_path / "log.log"), batch_size=10, flush_interval=60)
+    for number in range(25):
+        writer.put(LogRecord(LogLevel.INFO, message=f"line {number}"))
+    writer.flush()
+    lines = (tmp_path / "log.log").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 25, f"Expected every record after flush, got {len(lines)}"
+    assert lines[-1].startswith("[INFO]") and lines[-1].endswith("line 24")
+    writer.close()
+
+
+def test_log_writer_drop_policy_counts_overflow(tmp_path):
+    writer = LogWriter(str(tmp_path / "log.log"), max_queue=1, overflow="drop")
+    writer._ensure_started = lambda: None  # no consumer, so the queue stays full
+    for number in range(5):
+        writer.put(LogRecord(LogLevel.INFO, message=f"line {number}"))
+    assert writer.dropped == 4
+
+
+def test_response_record_is_truncated_and_rendered_once():
+    record = LogRecord(LogLevel.INFO, response=FakeResponse(), max_body_chars=10)
+    entry = json.loads(record.render(LogFormat.JSONL))
+    assert entry["status"] == 200
+    assert entry["body"].startswith('[{"id": 1,') and "truncated" in entry["body"]
+    assert record.render(LogFormat.JSONL) is record.render(LogFormat.JSONL)
+    assert "Response status: 200" in record.render(LogFormat.TEXT)
+
+
+def test_queued_response_records_hold_only_the_logged_bytes(tmp_path):
+    listing = FakeResponse()
+    listing._content = listing.content = b"x" * (1 << 20)
+    record = LogRecord(LogLevel.INFO, response=listing, max_body_chars=100)
+    assert record.size == 400 and not hasattr(record, "response")
+    assert record.response_text.endswith(f"<truncated, {1 << 20} bytes>")
+
+    writer = LogWriter(str(tmp_path / "log.log"), max_queue_bytes=1000, overflow="drop")
+    writer._ensure_started = lambda: None  # no consumer, so the queued bytes stay queued
+    for _ in range(5):
+        writer.put(LogRecord(LogLevel.INFO, response=listing, max_body_chars=100))
+    assert writer.dropped == 3 and writer.queued_bytes == 800
+
+
+def test_level_filter_skips_record_creation(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(Logger, "emit", classmethod(lambda cls, record: emitted.append(record)))
+    monkeypatch.setattr(Logger, "level", LogLevel.ERROR)
+    Logger.add_request("http://127.0.0.1/v2/pet", method="GET", body=None)
+    Logger.add_response(FakeResponse())
+    assert emitted == []
+
+
+def test_body_sampling_leaves_the_global_random_alone(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(Logger, "emit", classmethod(lambda cls, record: emitted.append(record)))
+    monkeypatch.setattr(Logger, "level", LogLevel.INFO)
+    for rate in (1.0, 0.5):
+        monkeypatch.setattr(Logger, "body_sample_rate", rate)
+        random.seed("cassette")
+        expected = random.random()
+        random.seed("cassette")
+        for _ in range(10):
+            Logger.add_response(FakeResponse())
+        assert random.random() == expected
+    assert len(emitted) == 20
@@ -0,0 +1,81 @@
+import json
+
+from utils.durations import DurationIndex, allure_history_id, predicted_makespan
+from utils.lpt_scheduling import LPTScheduling, supported
+
+
+class FakeConfig:
+    """What LoadScheduling reads from the config: two popen workers, no --maxschedchunk"""
+
+    def getvalue(self, name):
+        return ["2*popen"]
+
+    def getoption(self, name):
+        return None
+
+
+class FakeNode:
+    """A worker that records the test indices it is sent"""
+
+    def __init__(self, name):
+        self.gateway = type("Gateway", (), {"id": name})()
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def test_duration_index_prefers_local_then_allure_history(tmp_path):
+    history = tmp_path / "history.json"
+    history.write_text(json.dumps({
+        allure_history_id("tests/test_pet_api.py::test_delete_pet"): {
+            "items": [{"time": {"duration": ms}} for ms in (3000, 9000, 4000)]
+        }
+    }))
+    index = DurationIndex(str(tmp_path / "durations.json"), str(history))
+    assert index.predict("tests/test_pet_api.py::test_delete_pet") == 4.0
+    assert index.predict("tests/test_pet_api.py::test_unknown") == index.default == 4.0
+
+    index.update({"tests/test_pet_api.py::test_delete_pet": 1.0})
+    index.update({"tests/test_pet_api.py::test_delete_pet": 2.0})
+    index.save()
+    reloaded = DurationIndex(index.path, None)
+    assert reloaded.predict("tests/test_pet_api.py::test_delete_pet") == 1.5
+    assert allure_history_id("tests/test_x.py::test_y[1]") is None
+
+
+def test_longest_first_beats_collection_order():
+    durations = [1, 1, 1, 1, 1, 1, 6]
+    assert predicted_makespan(durations, 2) == 9
+    assert predicted_makespan(sorted(durations, reverse=True), 2) == 6
+
+
+def test_scheduler_hands_out_longest_first_one_at_a_time(tmp_path):
+    assert supported()
+    durations = {"t.py::a": 1, "t.py::b": 5, "t.py::c": 3, "t.py::d": 2, "t.py::e": 4}
+    index = DurationIndex(str(tmp_path / "durations.json"), None)
+    index.update(durations)
+    collection = list(durations)
+    scheduler = LPTScheduling(FakeConfig(), index=index)
+    first, second = FakeNode("gw0"), FakeNode("gw1")
+    for node in (first, second):
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+
+    def names(node):
+        return [collection[index] for index in node.sent]
+
+    # each worker holds the test it runs plus the next one; "a" waits for whoever frees up first
+    assert names(first) == ["t.py::b", "t.py::c"]
+    assert names(second) == ["t.py::e", "t.py::d"]
+    assert scheduler.predicted == predicted_makespan([5, 4, 3, 2, 1], 2) == 8
+
+    scheduler.mark_test_complete(second, collection.index("t.py::e"))
+    assert names(second) == ["t.py::e", "t.py::d", "t.py::a"]
+    scheduler.mark_test_complete(first, collection.index("t.py::b"))
+    assert first.shutting_down and not scheduler.pending
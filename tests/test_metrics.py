@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from utils.logger import NullLogger
+from utils.metrics import ApiMetrics, LatencyHistogram, route_template
+
+
+@pytest.mark.parametrize(
+    "resource, template",
+    [
+        ("/pet/123", "/pet/{petId}"),
+        ("pet/123", "/pet/{petId}"),
+        ("/pet/findByStatus?status=sold", "/pet/findByStatus"),
+        ("/pet/5/uploadImage", "/pet/{petId}/uploadImage"),
+        ("/store/order/-7", "/store/order/{orderId}"),
+        ("/user/42/items", "/user/{id}/items"),
+    ],
+)
+def test_route_template(resource, template):
+    assert route_template(resource) == template
+
+
+def test_histogram_percentiles_and_merge():
+    samples = [random.uniform(0.001, 0.5) for _ in range(20000)]
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index, sample in enumerate(samples):
+        whole.record(sample)
+        (first if index % 2 else second).record(sample)
+
+    merged = LatencyHistogram.from_dict(first.to_dict()).merge(second)
+    assert merged.buckets == whole.buckets
+    assert (merged.count, merged.min, merged.max) == (whole.count, whole.min, whole.max)
+    exact_p95 = sorted(samples)[int(0.95 * len(samples)) - 1]
+    assert merged.percentile(0.95) == pytest.approx(exact_p95, rel=0.02)
+    assert len(merged.buckets) < 400, "Histogram memory must not grow with the sample count"
+
+
+def test_client_records_phases_per_route(petstore_stub):
+    metrics = ApiMetrics()
+    pet_api = PetApi(ApiClient(NullLogger, base_url=petstore_stub.base_url, metrics=metrics))
+    for pet_id in (1, 2, 3):
+        pet_api.find_pet_by_id(pet_id)
+
+    histograms = metrics.endpoints["GET /pet/{petId}"]
+    assert histograms["total"].count == 3
+    assert histograms["connect"].count == 1, "Only the first request should open a connection"
+    assert histograms["ttfb"].max <= histograms["total"].max
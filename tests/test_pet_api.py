@@ -1,23 +1,23 @@
-import time
-
 import pytest
 
 from src.factories.file_factory import FileFactory
 from src.factories.pet_factory import UpdatePetFactory
+from src.models.pet import Pet
 from tests.conftest import pet_api
 from tests.conftest import pet_payload
 from utils.enums import PetStatus
+from utils.schemas import API_RESPONSE, PET, Schema, ValidationReport
 from utils.waiters import PetWaiter
 from utils.waiters import UpdateWaiter
 
+FULL_PET = PET.require("id", "category", "name", "photoUrls", "tags", "status")
+
 
 def test_add_pet(pet_api, pet_payload):
     add_pet_response = pet_api.add_pet(pet_payload)
     assert add_pet_response.status_code == 200, f"unsuccessful attempt to add a pet"
 
-    pet_data = add_pet_response.json()
-    for key in ["id", "category", "name", "photoUrls", "tags", "status"]:
-        assert key in pet_data, f"Missing key in response: {key}"
+    pet_data = FULL_PET.validate(add_pet_response.json())
     assert (
         pet_data["status"] == pet_payload["status"]
     ), f"Expected status '{pet_payload['status']}', but got '{pet_data['status']}' for pet {pet_data['name']}"
@@ -34,19 +34,13 @@ def test_add_pet(pet_api, pet_payload):
     assert pet_data["name"], f"Pet name should not be empty"
 
 
-def test_update_pet(pet_api, pet_payload):
-    add_pet_response = pet_api.add_pet(pet_payload)
-    assert add_pet_response.status_code == 200, f"unsuccessful attempt to create a pet"
-    original_pet_data = dict(add_pet_response.json())
+def test_update_pet(pet_api, leased_pet):
+    original_pet = Pet.from_json(FULL_PET.validate(dict(leased_pet)))
 
     update_fields = UpdatePetFactory.update_pet_with_name_and_status(
         name="Alfredicus", status="sold"
     )
-    copied_pet_data = original_pet_data.copy()
-    for key in ["id", "category", "name", "photoUrls", "tags", "status"]:
-        assert key in copied_pet_data, f"Missing key in response: {copied_pet_data}"
-    copied_pet_data.update(update_fields)
-    updated_pet = pet_api.update_pet(copied_pet_data)
+    updated_pet = pet_api.update_pet(original_pet.merge(update_fields))
     assert (
         updated_pet.status_code == 200
     ), f"Update failed, got {updated_pet.status_code}:{updated_pet.text}"
@@ -60,45 +54,39 @@ def test_update_pet(pet_api, pet_payload):
     ), f"Expected name: {update_fields['status']}, got {updated_pet_data['status']}"
 
 
-def test_get_pets_by_status(pet_api, pet_payload):
-    find_pet_by_response = pet_api.find_pet_by_status(status=PetStatus.AVAILABLE)
-    assert (
-        find_pet_by_response.status_code == 200
-    ), f"unsuccessful attempt to get a pet by status"
-    pets_data = find_pet_by_response.json()
+# the public server's listings hold pets other users posted (missing or null names and the like),
+# so outside the local emulator only the field this test is about is checked
+LISTED_PET = Schema("Pet", required=("status",))
 
-    assert isinstance(pets_data, list), f"Expected list of pets"
-    assert len(pets_data) > 0, f"Empty list of pets"
 
-    for pet in pets_data:
-        assert "status" in pet, f"Missing key 'status' in pet: {pet}"
+def test_get_pets_by_status(pet_api, pytestconfig):
+    schema = PET.require("status") if pytestconfig.getoption("--local-petstore") else LISTED_PET
+    report = ValidationReport(schema)
+    pets_seen = sum(
+        1 for _ in pet_api.iter_pets_by_status(PetStatus.AVAILABLE, validate=report)
+    )
+    assert pets_seen > 0, f"Empty list of pets"
+    report.raise_for_errors()
 
 
-def test_find_pet_by_id(pet_api, pet_payload):
-    creating_pet = pet_api.add_pet(pet_payload)
-    assert creating_pet.status_code == 200, f"unsuccessful attempt to create a pet"
+def test_find_pet_by_id(pet_api, shared_pet):
+    found_pet = pet_api.find_pet_by_id(shared_pet["id"])
+    assert found_pet.status_code == 200, f"unsuccessful attempt to find a pet"
 
-    created_pet = creating_pet.json()
-    assert isinstance(created_pet, dict), f"Expected list of pets"
-    assert len(created_pet) > 0, f"Empty list of pets"
-    print(f"Sent ID: {pet_payload['id']}, received ID: {created_pet['id']}")
+    found_pet_data = found_pet.json()
+    assert isinstance(found_pet_data, dict), f"Expected dict of pet data"
+    assert len(found_pet_data) > 0, f"Empty pet data"
+    assert (
+        found_pet_data["id"] == shared_pet["id"]
+    ), f"Sent ID: {shared_pet['id']}, received ID: {found_pet_data['id']}"
 
 
 @pytest.mark.flaky(reruns=5, reruns_delay=5)
-def test_update_pet_with_form(pet_api, pet_payload):
+def test_update_pet_with_form(pet_api, leased_pet):
     """Update test with handling unstable Petstore API"""
 
-    creating_pet = pet_api.add_pet(pet_payload)
-    assert creating_pet.status_code == 200, f"unsuccessful attempt to add a pet"
-
-    created_pet_data = creating_pet.json()
-    pet_id = created_pet_data["id"]
-    print(f"✅ Created pet with ID: {pet_id}")
-
-    PetWaiter.wait_for_pet(pet_api, pet_id, expected_status=200)
-    print(f"✅ Pet {pet_id} confirmed available")
-
-    time.sleep(3)
+    pet_id = leased_pet["id"]
+    print(f"✅ Leased pet {pet_id}, already confirmed available")
 
     new_name = "Lopik"
     new_status = "sold"
@@ -117,13 +105,16 @@ def test_update_pet_with_form(pet_api, pet_payload):
         str(pet_id) in response_with_update_data["message"]
     ), f"Wrong pet ID in response: {response_with_update_data}"
 
-    """Waiting for the updated pet (may take longer)"""
-    print(f"⏳ Waiting for updated pet {pet_id} to be available...")
-    time.sleep(10)
-
     """Checking for updates with handling of possible 404s"""
     try:
-        get_pet_by_id = pet_api.find_pet_by_id(pet_id)
+        """Waiting for the updated pet (may take longer)"""
+        print(f"⏳ Waiting for updated pet {pet_id} to be available...")
+        get_pet_by_id = PetWaiter.wait_for_pet(
+            pet_api,
+            pet_id,
+            until=lambda response: response.json()["name"] == new_name,
+            timeout=15,
+        )
 
         if get_pet_by_id.status_code == 200:
             updated_pet_data = get_pet_by_id.json()
@@ -150,12 +141,8 @@ def test_update_pet_with_form(pet_api, pet_payload):
 
 
 @pytest.mark.flaky(reruns=3, reruns_delay=2)
-def test_delete_pet(pet_api, pet_payload):
-    creating_pet = pet_api.add_pet(pet_payload)
-    assert creating_pet.status_code == 200, f"unsuccessful attempt to add a pet"
-
-    pet_id = creating_pet.json()["id"]
-    PetWaiter.wait_for_pet(pet_api, pet_id, expected_status=200)
+def test_delete_pet(pet_api, leased_pet):
+    pet_id = leased_pet["id"]
     delete_response = pet_api.delete_pet(pet_id)
     assert delete_response.status_code == 200, f"unsuccessful attempt to delete a pet"
 
@@ -167,25 +154,15 @@ def test_delete_pet(pet_api, pet_payload):
 
 
 @pytest.mark.flaky(reruns=3, reruns_delay=2)
-def test_upload_pet_image(pet_payload, files_client, pet_api):
-    creating_pet = pet_api.add_pet(pet_payload)
-    assert creating_pet.status_code == 200, f"unsuccessful attempt to add a pet"
-
-    created_pet = creating_pet.json()
-    pet_id = created_pet["id"]
-    PetWaiter.wait_for_pet(pet_api, pet_id, expected_status=200)
+def test_upload_pet_image(leased_pet, files_client, pet_api):
+    pet_id = leased_pet["id"]
 
     image_path = "test_dog.png"
     file_path = FileFactory.pet_image(image_path)
 
     response = files_client.upload_pet_image(pet_id=pet_id, file_path=file_path)
     assert response.status_code == 200, f"unsuccessful to upload pet image"
-    upload_data = response.json()
-    assert (
-        "message" in upload_data
-    ), f"No 'message' in form update response: {upload_data}"
-    for key in ["code", "type", "message"]:
-        assert key in upload_data, f"Missing {key} in response: {upload_data}"
+    API_RESPONSE.require("code", "type", "message").validate(response.json())
 
     get_response = pet_api.find_pet_by_id(pet_id)
     assert get_response.status_code == 200, f"Failed to get pet after image upload"
@@ -0,0 +1,41 @@
+import time
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from src.api.store_api import StoreApi
+from src.factories.pet_factory import PetFactory
+from utils.enums import PetStatus
+from utils.petstore_stub import PetstoreStub
+
+
+def test_writes_become_visible_after_consistency_delay(logger):
+    with PetstoreStub(consistency_delay=0.2, seed_pets=0) as stub:
+        pet_api = PetApi(ApiClient(logger, base_url=stub.base_url))
+        pet_payload = PetFactory.default_pet(status="pending")
+        assert pet_api.add_pet(pet_payload).status_code == 200
+
+        assert pet_api.find_pet_by_id(pet_payload["id"]).status_code == 404
+        time.sleep(0.25)
+        assert pet_api.find_pet_by_id(pet_payload["id"]).status_code == 200
+
+        pet_api.update_pet_with_form_data(pet_payload["id"], "Lopik", "sold")
+        pending = pet_api.find_pet_by_status(PetStatus.PENDING).json()
+        assert [pet["id"] for pet in pending] == [pet_payload["id"]]
+        time.sleep(0.25)
+        assert pet_api.find_pet_by_status(PetStatus.PENDING).json() == []
+        sold = pet_api.find_pet_by_status(PetStatus.SOLD).json()
+        assert sold[0]["name"] == "Lopik"
+
+
+def test_inventory_and_order_lifecycle(petstore_stub, logger):
+    store_api = StoreApi(ApiClient(logger, base_url=petstore_stub.base_url))
+    inventory = store_api.get_inventory().json()
+    for status in PetStatus:
+        assert status.value in inventory, f"Missing {status.value} in {inventory}"
+
+    order = {"id": 424242, "petId": 1, "quantity": 1, "status": "placed"}
+    assert store_api.place_order(order).json() == order
+    assert store_api.get_info_about_placed_order_by_id(424242).status_code == 200
+    assert store_api.delete_placed_order(424242).status_code == 200
+    assert store_api.get_info_about_placed_order_by_id(424242).status_code == 404
+    assert petstore_stub.requests_served["GET /store/order/{id}"] >= 2
@@ -0,0 +1,117 @@
+from src.api.base_api import ApiClient
+from src.api.rate_limiter import AdaptiveLimiter
+from src.api.store_api import StoreApi
+from utils.logger import NullLogger
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = ""
+        self.headers = {}
+        self.content = b""
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def request(self, method, url, **kwargs):
+        return FakeResponse(self.statuses.pop(0))
+
+
+def limiter(clock: FakeClock, **kwargs) -> AdaptiveLimiter:
+    return AdaptiveLimiter(clock=clock.time, sleep=clock.sleep, **kwargs)
+
+
+def test_token_bucket_paces_requests_after_the_burst():
+    clock = FakeClock()
+    bucket = limiter(clock, rate=10, burst=2, increase=0)
+    for _ in range(4):
+        bucket.acquire()
+        bucket.release(0.01, 200)
+    assert clock.sleeps == [0.1, 0.1]
+    assert bucket.stats()["requests"] == 4
+
+
+def test_overload_cuts_once_per_cooldown_and_recovers_additively():
+    clock = FakeClock()
+    bucket = limiter(clock, rate=10, max_concurrency=8, backoff=0.5, increase=1.0, cooldown=1.0)
+    for status in (500, 503, 429):
+        bucket.acquire()
+        bucket.release(0.01, status)
+    assert bucket.rate == 5.0 and bucket.limit == 4.0
+    assert bucket.stats()["overloads"] == 3 and bucket.stats()["rate_cuts"] == 1
+
+    clock.now += 1.0
+    bucket.acquire()
+    bucket.release(0.01, None)  # no response at all
+    assert bucket.rate == 2.5 and bucket.limit == 2.0
+
+    for _ in range(50):
+        bucket.acquire()
+        bucket.release(0.01, 200)
+    assert 10 < bucket.rate < 11 and bucket.limit == 8.0
+
+
+def test_latency_spike_counts_as_overload():
+    clock = FakeClock()
+    bucket = limiter(clock, rate=50, backoff=0.5, latency_factor=3.0, latency_floor=0.05, increase=0)
+    for latency in (0.04, 0.05, 0.12, 0.2):
+        bucket.acquire()
+        bucket.release(latency, 200)
+    assert bucket.stats()["overloads"] == 1 and bucket.rate == 25.0
+
+
+def test_latency_is_compared_per_route():
+    clock = FakeClock()
+    bucket = limiter(clock, rate=50, backoff=0.5, latency_factor=3.0, latency_floor=0.05, increase=0)
+    for latency, route in ((0.02, "GET /pet/{petId}"), (0.03, "GET /pet/{petId}"), (0.5, "GET /pet/findByStatus"),
+                           (0.6, "GET /pet/findByStatus"), (0.04, "GET /pet/{petId}")):
+        bucket.acquire()
+        bucket.release(latency, 200, route)
+    assert bucket.stats()["overloads"] == 0 and bucket.rate == 50.0
+
+    bucket.acquire()
+    bucket.release(0.2, 200, "GET /pet/{petId}")
+    assert bucket.stats()["overloads"] == 1 and bucket.rate == 25.0
+
+
+def test_budget_is_shared_through_the_file(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "budget.bin")
+    first = limiter(clock, rate=10, burst=1, increase=0, shared_path=path)
+    second = limiter(clock, rate=10, burst=1, increase=0, shared_path=path)
+
+    first.acquire()
+    second.acquire()
+    assert clock.sleeps == [0.1]  # the second worker waits for the first one's token
+    second.release(0.01, 502)
+    first.release(0.01, 200)
+    assert first.rate == second.rate == 7.0
+    first.close()
+    second.close()
+
+
+def test_client_reports_every_network_response_to_the_limiter():
+    clock = FakeClock()
+    bucket = limiter(clock, rate=100, backoff=0.5, increase=0)
+    client = ApiClient(NullLogger, session=FakeSession([500, 200, 200]), limiter=bucket)
+    store_api = StoreApi(client)
+    assert [store_api.get_inventory().status_code for _ in range(3)] == [500, 200, 200]
+    assert bucket.stats()["requests"] == 3 and bucket.rate == 50.0
+    assert bucket.in_flight == 0
+    assert list(bucket.latency) == ["GET /store/inventory"]
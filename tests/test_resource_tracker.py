@@ -0,0 +1,60 @@
+from collections import Counter
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from src.api.store_api import StoreApi
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+from utils.resource_tracker import ResourceTracker
+from utils.waiters import Poller
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+def test_cleanup_deletes_what_the_tests_left_behind(petstore_stub, logger):
+    tracker = ResourceTracker()
+    client = ApiClient(logger, base_url=petstore_stub.base_url)
+    pet_api, store_api = PetApi(client, tracker=tracker), StoreApi(client, tracker=tracker)
+    pets = list(PetFactory.batch(6, seed="tracker"))
+    orders = list(OrderFactory.batch(4, seed="tracker"))
+    for pet in pets:
+        assert pet_api.add_pet(pet).status_code == 200
+    for order in orders:
+        assert store_api.place_order(order).status_code == 200
+    assert pet_api.delete_pet(pets[0]["id"]).status_code == 200
+    assert store_api.delete_placed_order(orders[0]["id"]).status_code == 200
+
+    report = tracker.cleanup(PetApi(client), StoreApi(client), concurrency=4)
+
+    assert report["pet"] == {"created": 6, "deleted_by_tests": 1, "cleaned_up": 5, "left": []}
+    assert report["order"] == {"created": 4, "deleted_by_tests": 1, "cleaned_up": 3, "left": []}
+    assert {pet_api.find_pet_by_id(pet["id"]).status_code for pet in pets} == {404}
+    assert not tracker.pending(ResourceTracker.PET) and not tracker.pending(ResourceTracker.ORDER)
+
+
+def test_cleanup_retries_and_reports_what_is_left():
+    tracker = ResourceTracker()
+    for pet_id in (1, 2, 3):
+        tracker.track(ResourceTracker.PET, FakeResponse(200), pet_id)
+    tracker.track(ResourceTracker.ORDER, FakeResponse(500), 9)  # never created
+    attempts = Counter()
+
+    class FlakyPetApi:
+        @staticmethod
+        def delete_pet(pet_id):
+            attempts[pet_id] += 1
+            if pet_id == 3 or attempts[pet_id] < 3:
+                return FakeResponse(503)
+            return FakeResponse(200 if pet_id == 1 else 404)
+
+    class UnusedStoreApi:
+        delete_placed_order = None
+
+    report = tracker.cleanup(FlakyPetApi, UnusedStoreApi, timeout=0.3, poller=Poller(initial_delay=0.01))
+
+    assert report["pet"] == {"created": 3, "deleted_by_tests": 0, "cleaned_up": 2, "left": [3]}
+    assert report["order"]["created"] == 0
+    assert attempts[1] == attempts[2] == 3 and attempts[3] > 3
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+import requests
+
+from src.api.base_api import ApiClient
+from src.api.files_api import FilesApi
+from src.api.pet_api import PetApi
+from src.api.response_cache import ResponseCache
+from src.api.store_api import StoreApi
+from src.factories.file_factory import FileFactory
+from src.factories.pet_factory import PetFactory
+from utils.enums import PetStatus
+from utils.logger import LogFormat, LogLevel, Logger
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, size: int):
+        self.content = b"x" * size
+
+
+def test_repeated_gets_are_served_from_cache(petstore_stub, logger):
+    cache = ResponseCache(ttl=60)
+    client = ApiClient(logger, base_url=petstore_stub.base_url, cache=cache)
+    store_api = StoreApi(client)
+    before = petstore_stub.requests_served["GET /store/inventory"]
+
+    responses = [store_api.get_inventory() for _ in range(5)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert petstore_stub.requests_served["GET /store/inventory"] - before == 1
+    assert cache.stats()["hits"] == 4 and cache.stats()["misses"] == 1
+
+
+def test_writes_invalidate_affected_routes(petstore_stub, logger):
+    cache = ResponseCache(ttl=60, settle=0)
+    pet_api = PetApi(ApiClient(logger, base_url=petstore_stub.base_url, cache=cache))
+    pet_payload = PetFactory.default_pet()
+    pet_id = pet_payload["id"]
+    assert pet_api.add_pet(pet_payload).status_code == 200
+    assert pet_api.find_pet_by_id(pet_id).status_code == 200
+    assert pet_api.find_pet_by_status(PetStatus.AVAILABLE).status_code == 200
+    StoreApi(pet_api.client).get_inventory()
+
+    assert pet_api.delete_pet(pet_id).status_code == 200
+
+    assert cache.stats()["invalidations"] == 3
+    assert pet_api.find_pet_by_id(pet_id).status_code == 404, "Deleted pet served from cache"
+    listed = [pet["id"] for pet in pet_api.find_pet_by_status(PetStatus.AVAILABLE).json()]
+    assert pet_id not in listed
+
+
+class WriteFailsSession:
+    """GETs answer 200, writes time out after the server may have applied them"""
+
+    def request(self, method, url, **kwargs):
+        if method != "GET":
+            raise requests.Timeout(url)
+        return FakeResponse(10)
+
+
+def test_a_write_that_raises_still_invalidates(logger):
+    cache = ResponseCache(ttl=60, settle=0)
+    pet_api = PetApi(ApiClient(logger, session=WriteFailsSession(), cache=cache))
+    pet_api.find_pet_by_id(7)
+    assert cache.get("/pet/7") is not None
+
+    with pytest.raises(requests.Timeout):
+        pet_api.delete_pet(7)
+    assert cache.get("/pet/7") is None
+
+
+def test_settle_window_and_memory_cap():
+    cache = ResponseCache(ttl=60, max_bytes=250, settle=60)
+    cache.invalidate("DELETE", "/pet/7")
+    cache.put("/pet/7", None, FakeResponse(10))
+    assert cache.get("/pet/7") is None, "Read right after a write must not be cached"
+
+    for pet_id in range(3):
+        cache.put(f"/pet/{100 + pet_id}", None, FakeResponse(100))
+    assert cache.get("/pet/100") is None, "Least recently used entry must be evicted"
+    assert cache.get("/pet/102") is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 200
+
+
+def test_upload_through_a_files_client_sharing_the_cache_evicts_the_pet(petstore_stub, logger):
+    cache = ResponseCache(ttl=60, settle=0)
+    client = ApiClient(logger, base_url=petstore_stub.base_url, cache=cache)
+    files_api = FilesApi(logger, base_url=petstore_stub.base_url, session=client.session, cache=cache)
+    pet_api = PetApi(client)
+    pet_payload = PetFactory.default_pet()
+    assert pet_api.add_pet(pet_payload).status_code == 200
+    pet_api.find_pet_by_id(pet_payload["id"])
+    assert cache.stats()["bytes"] > 0
+
+    assert files_api.upload_image(pet_payload["id"], FileFactory.synthetic_image(1024)).status_code == 200
+    assert cache.get(f"/pet/{pet_payload['id']}") is None
+
+
+def test_cache_hits_are_logged_as_cached(petstore_stub, monkeypatch):
+    emitted = []
+    monkeypatch.setattr(Logger, "emit", classmethod(lambda cls, record: emitted.append(record)))
+    monkeypatch.setattr(Logger, "level", LogLevel.INFO)
+    store_api = StoreApi(ApiClient(Logger(), base_url=petstore_stub.base_url, cache=ResponseCache(ttl=60)))
+    store_api.get_inventory()
+    store_api.get_inventory()
+
+    responses = [record for record in emitted if record.event == "response"]
+    assert [record.cached for record in responses] == [False, True]
+    assert "Response status: 200 (cached)" in responses[1].render()
+    assert json.loads(responses[1].render(LogFormat.JSONL))["cached"] is True
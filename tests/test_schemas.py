@@ -0,0 +1,45 @@
+import pytest
+
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+from utils.schemas import INVENTORY, ORDER, PET, Schema, SchemaError
+
+
+def test_schemas_accept_factory_payloads():
+    assert not PET.errors(PetFactory.default_pet())
+    assert not ORDER.errors(OrderFactory.default_order())
+    assert not INVENTORY.errors({"available": 3, "sold": 0})
+    assert not Schema("Empty").errors({"anything": 1})
+
+
+def test_errors_name_the_path_of_every_problem():
+    pet = {
+        "id": "7",
+        "category": [],
+        "photoUrls": ["a", 3],
+        "tags": [{"id": 1, "name": 2}, 5],
+        "status": "gone",
+    }
+    assert PET.errors(pet) == [
+        "id: expected integer, got '7'",
+        "category: expected object, got list",
+        "name: missing",
+        "photoUrls[1]: expected string, got 3",
+        "tags[0].name: expected string, got 2",
+        "tags[1]: expected object, got int",
+        "status: expected one of ['available', 'pending', 'sold'], got 'gone'",
+    ]
+    assert INVENTORY.errors({"sold": "1"}) == ["sold: expected integer, got '1'"]
+    with pytest.raises(SchemaError, match="id: missing"):
+        PET.require("id").validate({"name": "Rex", "photoUrls": []})
+
+
+def test_batch_collects_errors_without_stopping():
+    pets = list(PetFactory.batch(10, seed=3))
+    pets[2]["status"] = None
+    del pets[7]["name"]
+    report = PET.batch(iter(pets), max_errors=1)
+    assert (report.checked, report.invalid) == (10, 2)
+    assert report.failures == [(2, ["status: expected one of ['available', 'pending', 'sold'], got None"])]
+    with pytest.raises(SchemaError, match="8/10 valid"):
+        report.raise_for_errors()
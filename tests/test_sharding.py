@@ -0,0 +1,81 @@
+import json
+import re
+import subprocess
+import sys
+
+from utils.allure_merge import merge_history, merge_results
+from utils.durations import DurationIndex, assign_shards
+
+SHARDED_TESTS = ["tests/test_schemas.py", "tests/test_lpt_scheduling.py"]
+
+
+def test_shards_are_disjoint_complete_and_balanced(tmp_path):
+    index = DurationIndex(str(tmp_path / "durations.json"), None)
+    index.durations = {f"tests/test_x.py::test_{n}": float(n) for n in range(1, 11)}
+    nodeids = list(reversed(index.durations))
+    shards = assign_shards(nodeids, 3, index)
+    assert sorted(sum(shards, [])) == sorted(nodeids)
+    assert assign_shards(sorted(nodeids), 3, index) == shards
+    loads = [sum(index.predict(nodeid) for nodeid in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 1
+
+
+def test_local_shards_merge_into_one_result_set(tmp_path):
+    """Two processes stand in for two nodes; the merge sees every test exactly once"""
+    index = tmp_path / "durations.json"
+    nodes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "pytest", *SHARDED_TESTS, "-q", "-p", "no:cacheprovider", "-o", "addopts=",
+             "--shard-count", "2", "--shard-index", str(shard), f"--alluredir={tmp_path / f'shard{shard}'}",
+             f"--duration-index={index}"],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        for shard in range(2)
+    ]
+    passed = 0
+    for node in nodes:
+        output = node.communicate(timeout=120)[0]
+        assert node.returncode == 0, output
+        passed += int(re.search(r"(\d+) passed", output).group(1))
+    assert not index.exists()
+
+    summary = merge_results(str(tmp_path / "merged"), [str(tmp_path / f"shard{shard}") for shard in range(2)],
+                            duration_index=str(index))
+    names = []
+    for result in (tmp_path / "merged").glob("*-result.json"):
+        names.append(json.loads(result.read_text())["fullName"])
+    assert summary["results"] == len(names) == len(set(names)) == summary["statuses"]["passed"] == passed > 2
+    assert summary["durations"] == passed
+    assert len(DurationIndex(str(index), None).durations) == passed
+    assert not (tmp_path / "merged" / "durations.json").exists()
+
+
+def test_history_merge_unions_tests_and_adds_up_trends(tmp_path):
+    def shard(name, history, trend):
+        directory = tmp_path / name
+        directory.mkdir()
+        (directory / "history.json").write_text(json.dumps(history))
+        (directory / "history-trend.json").write_text(json.dumps(trend))
+        (directory / "duration-trend.json").write_text(json.dumps([{"data": {"duration": 10}}]))
+        return str(directory)
+
+    item = {"uid": "a", "status": "passed", "time": {"start": 1}}
+    first = shard("first", {"x": {"statistic": {"passed": 1, "total": 1}, "items": [item]}},
+                  [{"buildOrder": 2, "data": {"passed": 1, "total": 1}}])
+    second = shard("second", {
+        "x": {"statistic": {"failed": 1, "total": 2}, "items": [{"uid": "b", "status": "failed", "time": {"start": 2}}]},
+        "y": {"statistic": {"passed": 1, "total": 1}, "items": []},
+    }, [{"buildOrder": 2, "data": {"passed": 2, "failed": 1, "total": 3}}])
+
+    out = tmp_path / "merged"
+    assert merge_history(str(out), [first, second, str(tmp_path / "missing")]) == [
+        "history.json", "history-trend.json", "duration-trend.json"
+    ]
+    history = json.loads((out / "history.json").read_text())
+    assert set(history) == {"x", "y"}
+    assert [entry["uid"] for entry in history["x"]["items"]] == ["b", "a"]
+    assert history["x"]["statistic"] == {"passed": 1, "failed": 1, "broken": 0, "skipped": 0, "unknown": 0, "total": 3}
+    assert json.loads((out / "history-trend.json").read_text()) == [
+        {"buildOrder": 2, "data": {"passed": 3, "total": 4, "failed": 1}}
+    ]
+    assert json.loads((out / "duration-trend.json").read_text()) == [{"data": {"duration": 10}}]
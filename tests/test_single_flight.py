@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.api.async_base_api import AsyncApiClient
+from src.api.async_pet_api import AsyncPetApi
+from src.api.base_api import ApiClient
+from src.api.single_flight import AsyncSingleFlight, SingleFlight
+from src.api.store_api import StoreApi
+from utils.logger import NullLogger
+from utils.petstore_stub import PetstoreStub
+
+
+@pytest.fixture(scope="module")
+def slow_stub():
+    with PetstoreStub(latency=0.2) as stub:
+        yield stub
+
+
+def test_concurrent_identical_gets_share_one_request(slow_stub):
+    single_flight = SingleFlight()
+    store_api = StoreApi(ApiClient(NullLogger, base_url=slow_stub.base_url, single_flight=single_flight))
+    before = slow_stub.requests_served["GET /store/inventory"]
+    start = threading.Barrier(20)
+
+    def poll(_):
+        start.wait()
+        return store_api.get_inventory()
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(poll, range(20)))
+
+    assert all(response.status_code == 200 for response in responses)
+    served = slow_stub.requests_served["GET /store/inventory"] - before
+    assert served == single_flight.stats()["flights"] < 5
+    assert single_flight.stats()["coalesced"] == 20 - served
+    assert single_flight.stats()["in_flight"] == 0
+
+
+def test_followers_get_the_leaders_error_and_writes_start_a_new_flight():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        release.wait()
+        raise ConnectionError("reset")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(single_flight.do, "/pet/1", None, send)
+        while not single_flight.calls:
+            pass
+        follower = pool.submit(single_flight.do, "pet/1", None, send)
+        while single_flight.coalesced == 0:
+            pass
+        single_flight.invalidate()
+        after_write = pool.submit(single_flight.do, "/pet/1", None, lambda: "fresh")
+        assert after_write.result(timeout=5) == "fresh"
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ConnectionError, match="reset"):
+                future.result(timeout=5)
+    assert len(calls) == 1
+    assert single_flight.stats()["flights"] == 2
+
+
+def test_async_gets_coalesce_and_survive_a_cancelled_caller(slow_stub, async_loop):
+    single_flight = AsyncSingleFlight()
+
+    async def scenario():
+        async with AsyncApiClient(NullLogger, base_url=slow_stub.base_url, single_flight=single_flight) as client:
+            pet_api = AsyncPetApi(client)
+            before = slow_stub.requests_served["GET /pet/{id}"]
+            callers = [asyncio.ensure_future(pet_api.find_pet_by_id(1)) for _ in range(30)]
+            await asyncio.sleep(0.05)
+            callers[0].cancel()
+            results = await asyncio.gather(*callers, return_exceptions=True)
+            assert isinstance(results[0], asyncio.CancelledError)
+            assert all(response is results[1] for response in results[1:])
+            assert slow_stub.requests_served["GET /pet/{id}"] - before == 1
+
+            abandoned = asyncio.ensure_future(pet_api.find_pet_by_id(2))
+            await asyncio.sleep(0.05)
+            abandoned.cancel()
+            await asyncio.gather(abandoned, return_exceptions=True)
+            await asyncio.sleep(0)
+            assert not single_flight.calls
+
+    async_loop.run_until_complete(scenario())
+    assert single_flight.stats()["coalesced"] == 29
+
+
+def test_async_caller_after_the_last_one_cancelled_starts_a_new_flight(slow_stub, async_loop):
+    single_flight = AsyncSingleFlight()
+
+    async def scenario():
+        async with AsyncApiClient(NullLogger, base_url=slow_stub.base_url, single_flight=single_flight) as client:
+            pet_api = AsyncPetApi(client)
+            abandoned = asyncio.ensure_future(pet_api.find_pet_by_id(1))
+            await asyncio.sleep(0.05)
+            abandoned.cancel()
+            await asyncio.sleep(0)  # the caller's finally cancels the flight, which isn't done yet
+            return await pet_api.find_pet_by_id(1)
+
+    assert async_loop.run_until_complete(scenario()).status_code in (200, 404)
+    assert single_flight.stats()["flights"] == 2 and single_flight.stats()["coalesced"] == 0
@@ -0,0 +1,79 @@
+import json
+import time
+
+import allure
+import pytest
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from src.api.store_api import StoreApi
+from src.load.runner import LoadRunner
+from src.load.scenarios import SCENARIOS
+from src.load.soak import METRICS, SoakMonitor, parse_slopes, slope
+from utils.logger import Logger
+from utils.resource_tracker import ResourceTracker
+
+
+def test_monitor_flags_a_growing_heap_and_streams_its_samples(tmp_path):
+    series = tmp_path / "soak.jsonl"
+    leak = []
+    with SoakMonitor(
+        interval=0.05, warmup=0, max_slopes={"traced_kb": 1, "fds": 1000}, series_path=str(series), top=3
+    ) as monitor:
+        deadline = time.perf_counter() + 0.6
+        while time.perf_counter() < deadline:
+            leak.append(bytearray(4096))
+            time.sleep(0.002)
+
+    report = monitor.report()
+    lines = [json.loads(line) for line in series.read_text().splitlines()]
+    assert len(lines) == report["samples"] >= 5
+    assert all(set(METRICS) <= set(sample) for sample in lines)
+    assert [violation.split()[0] for violation in report["violations"]] == ["traced_kb"]
+    assert any(__file__ in entry["at"] for entry in monitor.top_growth)
+    assert "FAILED: traced_kb" in monitor.summary()
+
+
+def test_slope_and_limits():
+    assert slope([(0, 1), (1, 3), (2, None), (3, 7)]) == 2
+    assert slope([(0, 1), (1, 3)]) is None
+    assert parse_slopes(["rss_kb=256", "fds=0.5"]) == {"rss_kb": 256.0, "fds": 0.5}
+    with pytest.raises(ValueError, match="rss"):
+        SoakMonitor(max_slopes={"rss": 1})
+
+
+@pytest.mark.soak
+def test_soak(pytestconfig, base_url, rate_limiter, tmp_path):
+    duration = pytestconfig.getoption("--soak-duration")
+    if not duration:
+        pytest.skip("soak runs only with --soak-duration")
+    series = pytestconfig.getoption("--soak-series") or str(tmp_path / "soak.jsonl")
+    tracker = ResourceTracker()
+    # the real Logger, so its queue and writer are part of what is measured
+    client = ApiClient(Logger(), base_url=base_url, limiter=rate_limiter)
+    runner = LoadRunner(
+        PetApi(client, tracker=tracker),
+        StoreApi(client, tracker=tracker),
+        {name: (1, scenario) for name, scenario in SCENARIOS.items()},
+        duration=duration,
+        concurrency=pytestconfig.getoption("--soak-concurrency"),
+    )
+    monitor = SoakMonitor(
+        interval=pytestconfig.getoption("--soak-interval"),
+        warmup=pytestconfig.getoption("--soak-warmup"),
+        max_slopes=parse_slopes(pytestconfig.getoption("--max-slope")),
+        series_path=series,
+    )
+    with allure.step(f"Soak {duration:.0f}s"), monitor:
+        report = runner.run()
+    report["cleanup"] = tracker.cleanup(PetApi(client), StoreApi(client))
+    client.close()
+
+    allure.attach(monitor.summary(), name="soak_summary", attachment_type=allure.attachment_type.TEXT)
+    allure.attach.file(series, name="soak_series", extension="jsonl")
+    allure.attach(
+        json.dumps({**report, "soak": monitor.report()}, indent=2),
+        name="soak_report",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    assert not monitor.violations(), monitor.summary()
@@ -1,5 +1,6 @@
 import pytest
 
+from utils.schemas import INVENTORY, ORDER
 from utils.waiters import StoreWaiter
 from tests.conftest import store_api
 
@@ -9,11 +10,7 @@ def test_create_first_order(store_api, store_payload):
     assert (
         create_order_response.status_code == 200
     ), f"unsuccessful attempt to create an order"
-    store_data = create_order_response.json()
-    assert isinstance(store_data, dict), f"Expected disct of pets"
-    assert len(store_data) > 0, f"Empty dict of pets"
-    for key in ["id", "petId", "quantity", "shipDate", "status", "complete"]:
-        assert key in store_data, f"Missing key in response: {key}"
+    store_data = ORDER.validate(create_order_response.json())
     assert (
         store_data["id"] == store_payload["id"]
     ), f"Wrong pet ID in response message: {store_data}"
@@ -25,25 +22,13 @@ def test_create_first_order(store_api, store_payload):
 
 @pytest.mark.flaky(reruns=3, reruns_delay=2)
 @pytest.mark.unstable(reason="Petstore API sometimes returns 404 after order creation")
-def test_find_store_order_by_id(store_api, store_payload):
-    create_order_response = store_api.place_order(store_payload)
-    assert (
-        create_order_response.status_code == 200
-    ), f"unsuccessful attempt to create an order"
-
-    store_data = create_order_response.json()
-    assert isinstance(store_data, dict), "Expected dict of pets"
-    assert len(store_data) > 0, "Empty order data"
+def test_find_store_order_by_id(store_api, shared_order):
+    store_data = shared_order
     order_id = store_data["id"]
     assert order_id is not None, "Order ID should not be None"
-    StoreWaiter.wait_for_order(store_api, order_id, expected_status=200)
     find_order = store_api.get_info_about_placed_order_by_id(order_id)
     assert find_order.status_code == 200, f"Failed to get order by : {order_id}"
-    find_order_data = find_order.json()
-    for key in ["id", "petId", "quantity", "shipDate", "status", "complete"]:
-        assert (
-            key in find_order_data
-        ), f"Missing {key} in found order: {find_order_data}"
+    find_order_data = ORDER.validate(find_order.json())
     assert (
         find_order_data["id"] == store_data["id"]
     ), f"Expected id: {store_data['id']}, but got {find_order_data['id']}"
@@ -58,9 +43,7 @@ def test_get_store_inventory(store_api):
     assert (
         get_inventories.status_code == 200
     ), f"unsuccessful to get information about inventory"
-    assert isinstance(
-        get_inventories_data, dict
-    ), "unsuccessful attempt to get pet inventories by status"
+    INVENTORY.validate(get_inventories_data)
     assert len(get_inventories_data) > 0, "Empty inventories data"
     assert (
         len(str(get_inventories_data["available"])) > 0
@@ -68,15 +51,9 @@ def test_get_store_inventory(store_api):
 
 
 @pytest.mark.flaky(reruns=3, reruns_delay=2)
-def test_delete_purchase_order_by_id(store_payload, store_api):
-    create_order_response = store_api.place_order(store_payload)
-    assert (
-        create_order_response.status_code == 200
-    ), f"unsuccessful attempt to create an order"
-    store_data = create_order_response.json()
-    store_id = store_data["id"]
+def test_delete_purchase_order_by_id(leased_order, store_api):
+    store_id = leased_order["id"]
 
-    StoreWaiter.wait_for_order(store_api, store_id, expected_status=[200, 404])
     delete_store_order = store_api.delete_placed_order(store_id)
     assert (
         delete_store_order.status_code == 200
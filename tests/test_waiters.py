@@ -0,0 +1,84 @@
+import pytest
+
+from src.api.base_api import ApiClient
+from src.api.pet_api import PetApi
+from src.factories.pet_factory import PetFactory
+from utils.waiters import BatchWaiter, Poller, UpdateWaiter, WaitTimeoutError, status_in
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(Poller, "sleep", staticmethod(clock.sleep))
+    monkeypatch.setattr(Poller, "clock", staticmethod(lambda: clock.now))
+    return clock
+
+
+def test_poller_backs_off_until_success(fake_clock):
+    statuses = iter([404, 404, 404, 200])
+    response = Poller(timeout=60, jitter=0).poll(
+        lambda: FakeResponse(next(statuses)), status_in([200]), target=1
+    )
+    assert response.status_code == 200
+    assert fake_clock.sleeps == [0.1, 0.2, 0.4]
+    stats = Poller.history[-1]
+    assert stats.succeeded and stats.attempts == 4 and stats.elapsed == pytest.approx(0.7)
+
+
+def test_poller_respects_deadline(fake_clock):
+    with pytest.raises(WaitTimeoutError) as error:
+        Poller(timeout=5, max_delay=2, jitter=0).poll(lambda: FakeResponse(404), status_in(200))
+    assert sum(fake_clock.sleeps) == pytest.approx(5)
+    assert max(fake_clock.sleeps) <= 2
+    assert not error.value.stats.succeeded and error.value.stats.last_status == 404
+
+
+def test_update_waiter_retries_404s_but_not_errors(fake_clock):
+    statuses = iter([404, 404, 200])
+    response = UpdateWaiter.wait_for_update_success(None, 1, lambda: FakeResponse(next(statuses)))
+    assert response.status_code == 200 and len(fake_clock.sleeps) == 2
+
+    calls = []
+
+    def broken_update():
+        calls.append(1)
+        raise ConnectionError("reset by peer")
+
+    with pytest.raises(ConnectionError, match="reset by peer"):
+        UpdateWaiter.wait_for_update_success(None, 1, broken_update)
+    assert len(calls) == 1
+
+
+def test_batch_waiter_streams_ready_ids_and_reports_stragglers(petstore_stub, logger):
+    pet_api = PetApi(ApiClient(logger, base_url=petstore_stub.base_url))
+    pet_ids = []
+    for _ in range(30):
+        pet_payload = PetFactory.default_pet()
+        assert pet_api.add_pet(pet_payload).status_code == 200
+        pet_ids.append(pet_payload["id"])
+    missing_id = -1
+
+    waiter = BatchWaiter(concurrency=8, timeout=1)
+    ready = [pet_id for pet_id, _ in waiter.wait_for_pets(pet_api, pet_ids + [missing_id])]
+
+    assert sorted(ready) == sorted(pet_ids)
+    assert list(waiter.stragglers) == [missing_id]
+    assert waiter.stragglers[missing_id].last_status == 404
+    assert waiter.elapsed < 2, f"Batch wait took {waiter.elapsed:.2f}s"
+    with pytest.raises(AssertionError):
+        waiter.raise_for_stragglers()
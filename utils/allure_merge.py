@@ -0,0 +1,172 @@
+"""
+Merges the allure results of several shards (one --alluredir per node) into
+one directory for `allure generate`. Result, container and attachment files
+are copied one at a time and each result is parsed on its own for the
+summary, so memory stays flat however many files there are.
+
+history/ is merged as well. It is not streamed: history.json is one JSON
+object, loaded one shard at a time into the merged union, which is as large
+as the output (allure keeps at most 20 items per test). An entry several
+shards have gets its items de-duplicated by uid and its statistics added up.
+A trend file that is identical on every shard (the usual case, because each
+node got the same copy) is kept once. Trend files that differ are added up
+build by build, and the duration trend takes the longest shard.
+
+A sharded run leaves its measured test durations in durations.json of its
+results directory instead of updating the duration index (each node has to
+split with the same index). With --duration-index the merge folds them into
+that index, ready to hand to every node of the next run.
+
+    python -m utils.allure_merge output/allure/merged shard-0/ shard-1/ shard-2/ \
+        --duration-index output/durations/durations.json
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import shutil
+from collections import Counter
+
+from utils.durations import DurationIndex
+
+HISTORY = "history"
+TREND_FILES = ("history-trend.json", "retry-trend.json", "categories-trend.json", "duration-trend.json")
+STATUSES = ("failed", "broken", "skipped", "passed", "unknown")
+FIRST_SHARD_WINS = ("executor.json", "categories.json")
+SHARD_DURATIONS = "durations.json"
+
+
+def merge_results(out_dir: str, shard_dirs, duration_index: str = None) -> dict:
+    os.makedirs(out_dir, exist_ok=True)
+    statuses = Counter()
+    seen_tests = set()
+    summary = {"shards": len(shard_dirs), "files": 0, "results": 0, "retried_tests": 0}
+    environment = {}
+    durations = {}
+    for shard_dir in shard_dirs:
+        with os.scandir(shard_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name == "environment.properties":
+                    environment.update((k, v) for k, v in _read_properties(entry.path).items() if k not in environment)
+                    continue
+                if entry.name == SHARD_DURATIONS:
+                    durations.update(_load(entry.path, {}))
+                    continue
+                target = os.path.join(out_dir, entry.name)
+                if os.path.exists(target):
+                    if entry.name in FIRST_SHARD_WINS:
+                        continue
+                    if not filecmp.cmp(entry.path, target, shallow=False):
+                        raise ValueError(f"{entry.name} differs between shards")
+                    continue
+                shutil.copyfile(entry.path, target)
+                summary["files"] += 1
+                if entry.name.endswith("-result.json"):
+                    with open(entry.path, encoding="utf-8") as file:
+                        result = json.load(file)
+                    statuses[result.get("status", "unknown")] += 1
+                    summary["results"] += 1
+                    history_id = result.get("historyId")
+                    if history_id in seen_tests:
+                        summary["retried_tests"] += 1
+                    seen_tests.add(history_id)
+    if environment:
+        with open(os.path.join(out_dir, "environment.properties"), "w", encoding="utf-8") as file:
+            file.writelines(f"{key}={value}\n" for key, value in environment.items())
+    summary["statuses"] = dict(statuses)
+    if duration_index and durations:
+        index = DurationIndex(duration_index, None)
+        index.update(durations)
+        index.save()
+        summary["durations"] = len(durations)
+    summary["history"] = merge_history(
+        os.path.join(out_dir, HISTORY), [os.path.join(shard_dir, HISTORY) for shard_dir in shard_dirs]
+    )
+    return summary
+
+
+def merge_history(out_dir: str, history_dirs) -> list:
+    """Merged history files, by name"""
+    history_dirs = [path for path in history_dirs if os.path.isdir(path)]
+    if not history_dirs:
+        return []
+    os.makedirs(out_dir, exist_ok=True)
+    merged = []
+
+    entries = {}
+    for history_dir in history_dirs:
+        for history_id, entry in _load(os.path.join(history_dir, "history.json"), {}).items():
+            entries[history_id] = entry if history_id not in entries else _merge_entry(entries[history_id], entry)
+    if entries:
+        _dump(os.path.join(out_dir, "history.json"), entries)
+        merged.append("history.json")
+
+    for name in TREND_FILES:
+        paths = [os.path.join(path, name) for path in history_dirs if os.path.exists(os.path.join(path, name))]
+        if not paths:
+            continue
+        if all(filecmp.cmp(paths[0], path, shallow=False) for path in paths[1:]):
+            shutil.copyfile(paths[0], os.path.join(out_dir, name))
+        else:
+            combine = max if name == "duration-trend.json" else sum
+            _dump(os.path.join(out_dir, name), _merge_trend([_load(path, []) for path in paths], combine))
+        merged.append(name)
+    return merged
+
+
+def _merge_entry(first: dict, second: dict) -> dict:
+    if first == second:
+        return first
+    items = {item["uid"]: item for item in first.get("items", []) + second.get("items", [])}
+    ordered = sorted(items.values(), key=lambda item: item.get("time", {}).get("start", 0), reverse=True)
+    statistic = {
+        key: first.get("statistic", {}).get(key, 0) + second.get("statistic", {}).get(key, 0)
+        for key in STATUSES + ("total",)
+    }
+    return {"statistic": statistic, "items": ordered}
+
+
+def _merge_trend(trends: list, combine) -> list:
+    """Build i of every shard's trend (newest first) combined into build i of the result"""
+    merged = []
+    for position in range(max(len(trend) for trend in trends)):
+        builds = [trend[position] for trend in trends if position < len(trend)]
+        build = dict(builds[0])
+        keys = dict.fromkeys(key for other in builds for key in other.get("data", {}))
+        build["data"] = {key: combine(other.get("data", {}).get(key, 0) for other in builds) for key in keys}
+        merged.append(build)
+    return merged
+
+
+def _read_properties(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        pairs = (line.rstrip("\n").split("=", 1) for line in file if "=" in line)
+        return {key.strip(): value.strip() for key, value in pairs}
+
+
+def _load(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _dump(path: str, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", help="merged allure-results directory")
+    parser.add_argument("shard_dirs", nargs="+", help="allure-results directory of each shard")
+    parser.add_argument("--duration-index", help="duration index to update with the shards' timings")
+    args = parser.parse_args()
+    print(json.dumps(merge_results(args.out_dir, args.shard_dirs, args.duration_index), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import base64
+import datetime
+import gzip
+import io
+import json
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class CassetteMissError(AssertionError):
+    pass
+
+
+class VirtualClock:
+    """Stands in for Poller.clock/Poller.sleep in replay: sleeping only moves the clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        with self.lock:
+            self.now += max(seconds, 0.0)
+
+
+class Cassette:
+    """
+    Record/replay of ApiClient traffic, one gzip'ed JSON tape per test.
+    A tape maps a request key ("GET /pet/5?status=sold", see key()) to
+    the responses recorded for it in order, so replay is a dict lookup plus
+    a popleft: the n-th identical request gets the n-th recorded response,
+    and the last one repeats if the test asks more often than it recorded
+    (e.g. a waiter polling). Replay never touches the network.
+
+        cassette = Cassette("tests/cassettes", Cassette.REPLAY)
+        cassette.use("tests/test_pet_api.py::test_add_pet")
+        client = ApiClient(logger, cassette=cassette)
+    """
+
+    RECORD = "record"
+    REPLAY = "replay"
+    SESSION_TAPE = "_session"
+
+    def __init__(self, directory: str, mode: str):
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.directory = directory
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.name = None
+        self.tape = None
+        self.use(None)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == self.REPLAY
+
+    def path_for(self, name: str) -> str:
+        module, _, test = (name or self.SESSION_TAPE).partition("::")
+        module = os.path.splitext(os.path.basename(module))[0]
+        file_name = re.sub(r"[^\w.\[\]-]+", "_", test or module)
+        return os.path.join(self.directory, module if test else "", f"{file_name}.json.gz")
+
+    def use(self, name: str):
+        """Switches to the tape of test `name` (None: the session tape), saving a recorded one"""
+        with self.lock:
+            if self.mode == self.RECORD and self.tape:
+                self._save()
+            self.name = name
+            self.tape = defaultdict(list) if self.mode == self.RECORD else self._load()
+
+    def _load(self) -> dict:
+        path = self.path_for(self.name)
+        if not os.path.exists(path):
+            return {}
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            data = json.load(file)
+        return {key: deque(responses) for key, responses in data["interactions"].items()}
+
+    def _save(self):
+        path = self.path_for(self.name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {"version": 1, "test": self.name or self.SESSION_TAPE, "interactions": self.tape}
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    def close(self):
+        with self.lock:
+            if self.mode == self.RECORD and self.tape:
+                self._save()
+            self.tape = None
+
+    @staticmethod
+    def key(method: str, resource: str, params: dict = None, body=None) -> str:
+        """
+        Method, path and sorted query; for a JSON body only its id, so concurrent
+        writes on one route (e.g. POST /pet from a pool) still match their own
+        response while volatile fields like shipDate don't break the match
+        """
+        path, _, query = resource.partition("?")
+        items = parse_qsl(query) + [(str(k), str(v)) for k, v in (params or {}).items()]
+        key = f"{method} /{path.strip('/')}" + (f"?{urlencode(sorted(items))}" if items else "")
+        if isinstance(body, dict) and "id" in body:
+            key += f" id={body['id']}"
+        return key
+
+    def record(self, method: str, resource: str, params, body, response: requests.Response):
+        content = response.content
+        try:
+            stored = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            stored = {"base64": base64.b64encode(content).decode()}
+        entry = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+            **stored,
+        }
+        with self.lock:
+            self.tape[self.key(method, resource, params, body)].append(entry)
+
+    def replay(self, method: str, url: str, resource: str, params, body, stream: bool = False):
+        key = self.key(method, resource, params, body)
+        with self.lock:
+            responses = self.tape.get(key)
+            if not responses:
+                raise CassetteMissError(
+                    f"No recorded response for {key} on tape {self.path_for(self.name)}"
+                )
+            entry = responses.popleft() if len(responses) > 1 else responses[0]
+
+        content = entry["text"].encode("utf-8") if "text" in entry else base64.b64decode(entry["base64"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response.request = requests.Request(method, url).prepare()
+        response.elapsed = datetime.timedelta(0)
+        if stream:
+            response.raw = io.BytesIO(content)
+        else:
+            response._content = content
+        return response
@@ -0,0 +1,126 @@
+"""
+Per-test durations for scheduling and sharding: a local index updated
+after every run (EWMA of setup + call + teardown, reruns included) that
+falls back to the median of the allure history for tests it hasn't seen
+yet, and the actual per-worker totals of the current run.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import statistics
+import time
+from collections import defaultdict
+
+DEFAULT_INDEX = "output/durations/durations.json"
+DEFAULT_HISTORY = "output/allure/history/history.json"
+
+
+def allure_history_id(nodeid: str):
+    """historyId allure-pytest gives a non-parametrized test, None for parametrized ones"""
+    if "[" in nodeid:
+        return None
+    path, *names = nodeid.split("::")
+    package = path[:-3] if path.endswith(".py") else path
+    *classes, test = names
+    class_part = ("." + ".".join(classes)) if classes else ""
+    # allure_commons.utils.md5, without importing allure into every process
+    return hashlib.md5(f"{package.replace('/', '.')}{class_part}#{test}".encode("utf-8")).hexdigest()
+
+
+class DurationIndex:
+    """nodeid -> predicted seconds"""
+
+    ALPHA = 0.5
+
+    def __init__(self, path: str = DEFAULT_INDEX, history_path: str = DEFAULT_HISTORY):
+        self.path = path
+        self.durations = {}
+        self.history = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.durations = json.load(file)
+        if history_path and os.path.exists(history_path):
+            with open(history_path, encoding="utf-8") as file:
+                for history_id, entry in json.load(file).items():
+                    runs = [item["time"]["duration"] / 1000 for item in entry.get("items", [])]
+                    if runs:
+                        self.history[history_id] = statistics.median(runs)
+        known = list(self.durations.values()) or list(self.history.values())
+        self.default = statistics.median(known) if known else 1.0
+
+    def predict(self, nodeid: str) -> float:
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        return self.history.get(allure_history_id(nodeid), self.default)
+
+    def update(self, actual: dict):
+        for nodeid, seconds in actual.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = (
+                seconds if previous is None else self.ALPHA * seconds + (1 - self.ALPHA) * previous
+            )
+
+    def save(self):
+        """Atomic, so concurrent shards on one machine never leave a torn file"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(dict(sorted(self.durations.items())), file, indent=1)
+        os.replace(temporary, self.path)
+
+
+def predicted_makespan(durations, workers: int) -> float:
+    """Makespan of greedy list scheduling of durations (in the given order) on `workers`"""
+    finish = [0.0] * max(workers, 1)
+    for duration in durations:
+        heapq.heappush(finish, heapq.heappop(finish) + duration)
+    return max(finish)
+
+
+def assign_shards(nodeids, count: int, index: DurationIndex) -> list:
+    """
+    Splits tests into `count` shards of balanced predicted duration (longest
+    first onto the least loaded shard). Deterministic for the same collection
+    and index, so every node computes the same split on its own.
+    """
+    shards = [[] for _ in range(count)]
+    loads = [(0.0, shard) for shard in range(count)]
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-index.predict(nodeid), nodeid)):
+        load, shard = heapq.heappop(loads)
+        shards[shard].append(nodeid)
+        heapq.heappush(loads, (load + index.predict(nodeid), shard))
+    return shards
+
+
+class RunDurations:
+    """
+    Plugin for the xdist controller (or a plain run): sums the actual
+    setup + call + teardown time per test and per worker, and prints
+    predicted versus actual makespan at the end of the run
+    """
+
+    def __init__(self):
+        self.tests = defaultdict(float)
+        self.workers = defaultdict(float)
+        self.started = time.perf_counter()
+        self.scheduler = None
+
+    def pytest_runtest_logreport(self, report):
+        self.tests[report.nodeid] += report.duration
+        node = getattr(report, "node", None)
+        self.workers[node.gateway.id if node is not None else "main"] += report.duration
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.tests:
+            terminalreporter.write_sep("-", "makespan")
+            terminalreporter.write_line(self.summary(self.scheduler.predicted if self.scheduler else None))
+
+    def summary(self, predicted: float = None) -> str:
+        busy = max(self.workers.values(), default=0.0)
+        line = f"actual makespan {busy:.1f}s (wall {time.perf_counter() - self.started:.1f}s)"
+        if predicted is not None:
+            line = f"predicted makespan {predicted:.1f}s, " + line
+        workers = ", ".join(f"{worker} {seconds:.1f}s" for worker, seconds in sorted(self.workers.items()))
+        return f"{line}; per worker: {workers}"
@@ -0,0 +1,183 @@
+import itertools
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.factories.order_factory import OrderFactory
+from src.factories.pet_factory import PetFactory
+from utils.logger import Logger
+from utils.waiters import BatchWaiter, status_in
+
+
+class EntityPool:
+    """
+    Pets/orders created up front, concurrently, and handed to tests only
+    once they are consistent, so a test doesn't pay for create-and-wait.
+
+    acquire() gives an exclusive lease: the entity is never handed out
+    again, so mutating tests (update, delete, upload) may do anything to it.
+    When the free list runs low it is refilled in the background (or, with
+    background=False, synchronously once it is empty, which keeps the
+    traffic inside the test that needed it, e.g. for cassette recording).
+    share() gives a shared lease on one of a few entities reserved for
+    read-only tests; they must not modify it.
+
+        pool = EntityPool.for_pets(pet_api, size=4)
+        pet = pool.acquire()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        payloads,
+        create,
+        probe,
+        size: int = 4,
+        shared_size: int = 2,
+        refill_size: int = None,
+        concurrency: int = 16,
+        timeout: float = 60,
+        background: bool = True,
+    ):
+        self.name = name
+        self.payloads = iter(payloads)
+        self.create = create
+        self.probe = probe
+        self.size = size
+        self.shared_size = shared_size
+        self.refill_size = refill_size or max(size // 2, 1)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.background = background
+
+        self.cond = threading.Condition()
+        self.free = deque()
+        self.shared = []
+        self.shared_cycle = None
+        self.refilling = False
+        self.last_refill = None
+        self.created = 0
+        self.leased = 0
+        self.shared_leases = 0
+
+    @classmethod
+    def for_pets(cls, pet_api, seed=None, **kwargs) -> "EntityPool":
+        return cls(
+            "pet", PetFactory.batch(seed=seed), pet_api.add_pet, pet_api.find_pet_by_id, **kwargs
+        )
+
+    @classmethod
+    def for_orders(cls, store_api, seed=None, **kwargs) -> "EntityPool":
+        return cls(
+            "order",
+            OrderFactory.batch(seed=seed, quantity=3),
+            store_api.place_order,
+            store_api.get_info_about_placed_order_by_id,
+            **kwargs,
+        )
+
+    @staticmethod
+    def per_worker(total: int, minimum: int = 2) -> int:
+        """Share of `total` pooled entities for this process under xdist"""
+        workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+        return max(math.ceil(total / workers), minimum)
+
+    def provision(self, count: int) -> list:
+        """Creates `count` entities concurrently and returns the ones that became consistent"""
+        if count <= 0:
+            return []
+        with self.cond:
+            payloads = list(itertools.islice(self.payloads, count))
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, count)) as pool:
+            responses = list(pool.map(self.create, payloads))
+        created = {}
+        for response in responses:
+            if response.status_code == 200:
+                body = response.json()
+                created[body["id"]] = body
+        with self.cond:
+            self.created += len(created)
+
+        waiter = BatchWaiter(concurrency=self.concurrency, timeout=self.timeout)
+        consistent = {
+            entity_id
+            for entity_id, _ in waiter.iter_ready(
+                self.probe, created, status_in(200), f"provision_{self.name}"
+            )
+        }
+        # creation order rather than readiness order, so a seeded pool leases the same entities
+        ready = [entity for entity_id, entity in created.items() if entity_id in consistent]
+        Logger.info(f"{self.name} pool: provisioned {len(ready)}/{count}. {waiter.summary()}")
+        return ready
+
+    def fill(self) -> "EntityPool":
+        entities = self.provision(self.shared_size + self.size)
+        with self.cond:
+            self.shared = entities[: self.shared_size]
+            self.shared_cycle = itertools.cycle(self.shared) if self.shared else None
+            self.free.extend(entities[self.shared_size:])
+        return self
+
+    def acquire(self) -> dict:
+        with self.cond:
+            while not self.free:
+                if self.last_refill == 0 and not self.refilling:
+                    raise RuntimeError(f"{self.name} pool: refill produced no consistent entities")
+                if self.background or self.refilling:
+                    self._start_refill()
+                    self.cond.wait(self.timeout)
+                else:
+                    self.refilling = True
+                    self.cond.release()
+                    try:
+                        self._refill()
+                    finally:
+                        self.cond.acquire()
+            entity = self.free.popleft()
+            self.leased += 1
+            if self.background and len(self.free) < self.refill_size:
+                self._start_refill()
+            return entity
+
+    def share(self) -> dict:
+        with self.cond:
+            if self.shared_cycle is None:
+                raise RuntimeError(f"{self.name} pool has no shared entities, call fill() first")
+            self.shared_leases += 1
+            return next(self.shared_cycle)
+
+    def _start_refill(self):
+        """Called with self.cond held"""
+        if self.refilling:
+            return
+        self.refilling = True
+        threading.Thread(target=self._refill, name=f"{self.name}-pool-refill", daemon=True).start()
+
+    def _refill(self):
+        entities = []
+        try:
+            entities = self.provision(self.refill_size)
+        finally:
+            with self.cond:
+                self.free.extend(entities)
+                self.last_refill = len(entities)
+                self.refilling = False
+                self.cond.notify_all()
+
+    def close(self):
+        """Waits for a background refill, so it doesn't outlive the API client"""
+        with self.cond:
+            while self.refilling:
+                self.cond.wait(self.timeout)
+
+    def summary(self) -> dict:
+        with self.cond:
+            return {
+                "created": self.created,
+                "free": len(self.free),
+                "shared": len(self.shared),
+                "leased": self.leased,
+                "shared_leases": self.shared_leases,
+            }
@@ -7,4 +7,7 @@ class PetStatus(Enum):
     SOLD = "sold"
 
 
-print(PetStatus.AVAILABLE)
+class OrderStatus(Enum):
+    PLACED = "placed"
+    APPROVED = "approved"
+    DELIVERED = "delivered"
@@ -0,0 +1,167 @@
+import codecs
+import itertools
+import json
+import queue
+import re
+import threading
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_SCALAR_END = re.compile(r"[,\]\s]")
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+
+
+def _value_end(buffer: str, pos: int):
+    """
+    Where the JSON value starting at pos ends, judged by its brackets and
+    strings only, or None when it continues past the buffer. Tells an item
+    cut off by a chunk boundary from one that is complete but invalid.
+    """
+    if buffer[pos] not in '"[{':
+        delimiter = _SCALAR_END.search(buffer, pos)
+        return None if delimiter is None else delimiter.start()
+    depth = 0
+    while True:
+        match = _STRUCTURE.search(buffer, pos)
+        if match is None:
+            return None
+        pos = match.end()
+        char = match.group()
+        if char == '"':
+            while True:
+                match = _STRING_END.search(buffer, pos)
+                if match is None:
+                    return None
+                pos = match.end() + (match.group() == "\\")  # skip the escaped character
+                if match.group() == '"':
+                    break
+        elif char in "[{":
+            depth += 1
+        else:
+            depth -= 1
+        if depth <= 0:
+            return pos
+
+
+def iter_json_array(chunks):
+    """
+    Yields the items of a top-level JSON array from an iterable of bytes/str
+    chunks (e.g. response.iter_content()) without building the whole list:
+    only the unparsed tail of the body and the current item are in memory.
+    Raises ValueError on invalid JSON (including a missing or doubled
+    separator) as soon as the offending item is complete, and on a
+    truncated body. An item that spans chunks is parsed again only once
+    the buffer has doubled, so a large item costs linear time.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos = "", 0
+    waiting, waiting_size = [], 0  # chunks received while an item waits for retry_at
+    expect = "["  # then "first" (an item or "]"), "separator" (, or ]), "item" (after a comma)
+    retry_at = 0  # buffer length before an item cut off by the chunk boundary is parsed again
+
+    def skip(pos: int) -> int:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    for chunk in itertools.chain(chunks, [None]):
+        if expect == "done":
+            break
+        if chunk is None:  # end of the body: parse what is pending
+            chunk, retry_at = "", 0
+        waiting.append(text.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        waiting_size += len(waiting[-1])
+        if len(buffer) + waiting_size < retry_at:
+            continue
+        buffer = buffer[pos:] + "".join(waiting)
+        waiting, waiting_size, pos = [], 0, 0
+        while True:
+            pos = skip(pos)
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if expect == "[":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {buffer[pos:pos + 40]!r}")
+                expect, pos = "first", pos + 1
+                continue
+            if expect == "separator" or (expect == "first" and char == "]"):
+                if char == "]":
+                    expect = "done"
+                    break
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' between array items, got {buffer[pos:pos + 40]!r}")
+                expect, pos = "item", pos + 1
+                continue
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as error:
+                if _value_end(buffer, pos) is not None:
+                    raise ValueError(f"Invalid JSON array item: {error.msg}: {buffer[pos:pos + 40]!r}") from None
+                retry_at = pos + 2 * (len(buffer) - pos)
+                break  # item continues in the next chunks
+            if not isinstance(item, (dict, list, str)):
+                # a number may be cut off ("2" of "2.5"): parse it once its delimiter arrived
+                delimiter = _SCALAR_END.search(buffer, end)
+                if delimiter is None:
+                    break
+                end = delimiter.start()
+                try:
+                    item = json.loads(buffer[pos:end])
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"Invalid JSON array item: {error.msg}: {buffer[pos:end]!r}") from None
+            expect, pos, retry_at = "separator", end, 0
+            yield item
+
+    if expect != "done":
+        raise ValueError("JSON array is truncated")
+
+
+def merge_parallel(sources, max_buffered: int = 1024):
+    """
+    Runs each zero-argument callable in `sources` on its own thread, each
+    returning an iterable, and yields their items in arrival order. At most
+    max_buffered items wait in memory; closing the generator early stops the
+    producers. An exception in any producer is re-raised to the consumer.
+    """
+    items = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+    done = object()
+
+    def produce(source):
+        try:
+            for item in source():
+                while not stop.is_set():
+                    try:
+                        items.put((item, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        except Exception as e:
+            items.put((done, e))
+            return
+        items.put((done, None))
+
+    threads = [threading.Thread(target=produce, args=(source,), daemon=True) for source in sources]
+    for thread in threads:
+        thread.start()
+    running = len(threads)
+    try:
+        while running:
+            item, error = items.get()
+            if item is done:
+                running -= 1
+                if error is not None:
+                    raise error
+            else:
+                yield item
+    finally:
+        stop.set()
+        while any(thread.is_alive() for thread in threads):
+            try:
+                items.get(timeout=0.05)
+            except queue.Empty:
+                pass
@@ -0,0 +1,63 @@
+"""
+Deferred imports and objects: every xdist worker imports the harness again,
+so heavy modules and instances are only paid for once something uses them.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Placeholder that imports the real module on first attribute access.
+    importlib.import_module holds the module's import lock, so threads that
+    get there together all wait for one complete import (the stdlib
+    LazyLoader lets them see a half-executed module before 3.12).
+    """
+
+    def __getattr__(self, attr):
+        module = self.__dict__.get("_module")
+        if module is None:
+            module = self.__dict__["_module"] = importlib.import_module(self.__name__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str):
+    """
+    Module `name`, imported on its first attribute access.
+    An already imported module is returned as is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
+
+
+class Lazy:
+    """Stands in for factory(), which is called (once, thread-safely) on first attribute access"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    @property
+    def created(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __repr__(self) -> str:
+        return repr(self._get()) if self.created else f"<Lazy {self._factory!r}>"
@@ -1,5 +1,11 @@
+import atexit
+import json
 import os
 import datetime
+import queue
+import random
+import threading
+import time
 
 
 class LogLevel:
@@ -8,29 +14,383 @@ class LogLevel:
     WARNING = "WARNING"
     ERROR = "ERROR"
 
+    ORDER = {DEBUG: 10, INFO: 20, WARNING: 30, ERROR: 40}
+
+
+class LogFormat:
+    TEXT = "text"
+    JSONL = "jsonl"
+
+
+def response_bytes(response, max_chars: int = None) -> tuple:
+    """
+    (the body bytes needed for max_chars characters, full body length);
+    (None, 0) for a streamed body, which is never consumed here
+    """
+    if getattr(response, "_content", None) is False:
+        return None, 0
+    content = response.content or b""
+    if max_chars is not None and len(content) > max_chars * 4:
+        # utf-8 needs at most 4 bytes per char, so this slice is enough
+        return content[: max_chars * 4], len(content)
+    return content, len(content)
+
+
+def body_text(content: bytes, length: int, max_chars: int = None) -> str:
+    if content is None:
+        return "<streamed body>"
+    text = content.decode("utf-8", "replace")
+    if max_chars is not None and len(text) > max_chars:
+        return f"{text[:max_chars]}... <truncated, {length} bytes>"
+    return text
+
+
+class LogRecord:
+    """
+    One log event with its raw inputs. Nothing is formatted until render() is
+    called (normally on the writer thread); the result is cached, so a record
+    that also feeds an allure attachment is only rendered once per format.
+    Of a response only the status and the body bytes that will be logged are
+    kept, so a queued record never holds the Response (or a multi-MB body)
+    and the writer thread never touches an object the caller still uses.
+    """
+
+    __slots__ = (
+        "level",
+        "created",
+        "event",
+        "message",
+        "test",
+        "method",
+        "url",
+        "body",
+        "status",
+        "cached",
+        "content",
+        "length",
+        "max_body_chars",
+        "_response_text",
+        "_rendered",
+    )
+
+    def __init__(
+        self,
+        level: str,
+        message: str = None,
+        test: str = None,
+        method: str = None,
+        url: str = None,
+        body=None,
+        response=None,
+        max_body_chars: int = None,
+        cached: bool = False,
+    ):
+        self.level = level
+        self.created = time.time()
+        if response is not None:
+            self.event = "response"
+        else:
+            self.event = "request" if method else "message"
+        self.message = message
+        self.test = test
+        self.method = method
+        self.url = url
+        self.body = body
+        self.status = response.status_code if response is not None else None
+        self.cached = cached
+        self.content, self.length = (
+            response_bytes(response, max_body_chars) if response is not None else (b"", 0)
+        )
+        self.max_body_chars = max_body_chars
+        self._response_text = None
+        self._rendered = {}
+
+    @property
+    def response_text(self) -> str:
+        if self._response_text is None:
+            self._response_text = body_text(self.content, self.length, self.max_body_chars)
+            self.content = b""  # decoded once, don't keep the bytes alive
+        return self._response_text
+
+    @property
+    def size(self) -> int:
+        """Bytes of body this record holds while queued"""
+        return len(self.content) if self.content else 0
+
+    def render(self, fmt: str = LogFormat.TEXT) -> str:
+        if fmt not in self._rendered:
+            render = self._render_json if fmt == LogFormat.JSONL else self._render_text
+            self._rendered[fmt] = render()
+        return self._rendered[fmt]
+
+    def _render_text(self) -> str:
+        body_line = f"Request body: {self.body}\n" if self.body is not None else ""
+        if self.event == "request":
+            data = (
+                f"\n-----\n"
+                f"Test:  {self.test}\n"
+                f"Time:  {datetime.datetime.fromtimestamp(self.created)}\n"
+                f"Request method:  {self.method}\n"
+                f"Request URL:  {self.url}\n"
+                f"\n{body_line}\n"
+            )
+        elif self.event == "response":
+            endpoint_line = f"Endpoint: {self.message}\n" if self.message else ""
+            data = (
+                f"{endpoint_line}"
+                f"Response status: {self.status}{' (cached)' if self.cached else ''}\n"
+                f"Response body: {self.response_text}\n"
+                f"{body_line}"
+                "-----\n"
+            )
+        else:
+            data = self.message
+        return f"[{self.level}] {datetime.datetime.fromtimestamp(self.created)} - {data}\n"
+
+    def _render_json(self) -> str:
+        entry = {
+            "time": self.created,
+            "level": self.level,
+            "event": self.event,
+            "test": self.test,
+        }
+        if self.event == "request":
+            entry.update(method=self.method, url=self.url, body=self.body)
+        elif self.event == "response":
+            entry.update(
+                status=self.status,
+                body=self.response_text,
+                request_body=self.body,
+                endpoint=self.message,
+            )
+            if self.cached:
+                entry["cached"] = True
+        else:
+            entry["message"] = self.message
+        return json.dumps(entry, default=str) + "\n"
+
+
+class LogWriter:
+    """
+    Background thread that owns the log file. Producers only enqueue records;
+    the thread formats them into a buffered file handle it keeps open, and
+    flushes it to disk when batch_size records are pending, every
+    flush_interval seconds, or on flush()/close().
+    The queue holds at most max_queue records and max_queue_bytes of
+    response bodies (one oversized record still goes through an empty
+    queue). When it is full, overflow="block" waits for room and "drop"
+    counts the record in self.dropped and moves on.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(
+        self,
+        file_name: str,
+        fmt: str = LogFormat.TEXT,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+        overflow: str = "block",
+        max_queue_bytes: int = 64 << 20,
+    ):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.file_name = file_name
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.dropped = 0
+        self.max_queue_bytes = max_queue_bytes
+        self.queued_bytes = 0
+        self._room = threading.Condition()
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="log-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def put(self, record: LogRecord):
+        self._ensure_started()
+        size = record.size
+        with self._room:
+            if self.overflow == "drop":
+                if self.queued_bytes and self.queued_bytes + size > self.max_queue_bytes:
+                    self.dropped += 1
+                    return
+            else:
+                while self.queued_bytes and self.queued_bytes + size > self.max_queue_bytes:
+                    self._room.wait()
+            self.queued_bytes += size
+        if self.overflow == "drop":
+            try:
+                self.queue.put_nowait((record, size))
+            except queue.Full:
+                self.dropped += 1
+                self._release(size)
+        else:
+            self.queue.put((record, size))
+
+    def _release(self, size: int):
+        if size:
+            with self._room:
+                self.queued_bytes -= size
+                self._room.notify_all()
+
+    def flush(self):
+        if self._thread is not None and self._thread.is_alive():
+            done = threading.Event()
+            self.queue.put((self._FLUSH, done))
+            done.wait()
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.put((self._STOP, None))
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        logger_file = None
+        pending = 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                record = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                record = None
+            if record is None or record[0] is self._FLUSH or record[0] is self._STOP:
+                if logger_file is not None:
+                    logger_file.flush()
+                pending = 0
+                deadline = time.monotonic() + self.flush_interval
+                if record is not None:
+                    if record[0] is self._STOP:
+                        if logger_file is not None:
+                            logger_file.close()
+                        return
+                    record[1].set()
+                continue
+            if logger_file is None:
+                logger_file = open(
+                    self.file_name, "a", encoding="utf-8", buffering=1 << 20
+                )
+            record, size = record
+            # rendered and written one by one, so a batch never holds every body at once
+            logger_file.write(record.render(self.fmt))
+            self._release(size)
+            pending += 1
+            if pending >= self.batch_size:
+                logger_file.flush()
+                pending = 0
+
 
 class Logger:
+    """
+    Class-level settings:
+      level           records below it are dropped before anything is built
+      log_format      LogFormat.TEXT or LogFormat.JSONL (one JSON object per line)
+      max_body_chars  response bodies are cut to this many characters (None = full)
+      body_sample_rate  fraction of successful responses that log their body at all
+      attach_to_allure  also attach each response record to the current allure step
+    """
 
     LOG_DIR = "./output/logs"
+    file_name = None  # chosen (and LOG_DIR created) by get_file_name() on the first record
 
-    if not os.path.exists(LOG_DIR):
-        os.makedirs(LOG_DIR)
+    level = LogLevel.DEBUG
+    log_format = LogFormat.TEXT
+    max_body_chars = None
+    body_sample_rate = 1.0
+    attach_to_allure = False
+    # its own generator: draws from the global one would shift the ids the factories generate
+    # from the per-test seed a cassette sets, whenever log settings differ between record and replay
+    sampler = random.Random()
 
-    file_name = (
-        f"{LOG_DIR}/log_"
-        + str(datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
-        + ".log"
-    )
+    buffered = True
+    writer = None
 
     @classmethod
-    def write_log_to_file(cls, data: str, level: str = LogLevel.INFO):
-        if "test_result" in cls.file_name:
+    def configure(
+        cls,
+        level: str = None,
+        log_format: str = None,
+        max_body_chars: int = None,
+        body_sample_rate: float = None,
+        attach_to_allure: bool = None,
+    ):
+        """Changes settings; call before the first record so the writer picks the format up"""
+        if level is not None:
+            cls.level = level
+        if log_format is not None:
+            cls.log_format = log_format
+            if log_format == LogFormat.JSONL and cls.file_name and cls.file_name.endswith(".log"):
+                cls.file_name = cls.file_name[: -len(".log")] + ".jsonl"
+        if max_body_chars is not None:
+            cls.max_body_chars = max_body_chars
+        if body_sample_rate is not None:
+            cls.body_sample_rate = body_sample_rate
+        if attach_to_allure is not None:
+            cls.attach_to_allure = attach_to_allure
+
+    @classmethod
+    def enabled_for(cls, level: str) -> bool:
+        return LogLevel.ORDER[level] >= LogLevel.ORDER[cls.level]
+
+    @classmethod
+    def get_file_name(cls) -> str:
+        if cls.file_name is None:
+            os.makedirs(cls.LOG_DIR, exist_ok=True)
+            # one file per xdist worker, so parallel workers never interleave lines
+            cls.file_name = (
+                f"{cls.LOG_DIR}/log_"
+                + str(datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+                + (f"_{os.environ['PYTEST_XDIST_WORKER']}" if "PYTEST_XDIST_WORKER" in os.environ else "")
+                + (".jsonl" if cls.log_format == LogFormat.JSONL else ".log")
+            )
+        return cls.file_name
+
+    @classmethod
+    def get_writer(cls) -> LogWriter:
+        if cls.writer is None:
+            cls.writer = LogWriter(cls.get_file_name(), fmt=cls.log_format)
+            atexit.register(cls.writer.close)
+        return cls.writer
+
+    @classmethod
+    def flush(cls):
+        if cls.writer is not None:
+            cls.writer.flush()
+
+    @classmethod
+    def close(cls):
+        if cls.writer is not None:
+            cls.writer.close()
+
+    @classmethod
+    def emit(cls, record: LogRecord):
+        if "test_result" in cls.get_file_name():
             raise ValueError(
                 "Logger is trying to write to test_result. Check configuration!"
             )
+        if cls.buffered:
+            cls.get_writer().put(record)
+            return
         with open(cls.file_name, "a", encoding="utf-8") as logger_file:
-            log_line = f"[{level}] {datetime.datetime.now()} - {data}\n"
-            logger_file.write(log_line)
+            logger_file.write(record.render(cls.log_format))
+
+    @classmethod
+    def write_log_to_file(cls, data: str, level: str = LogLevel.INFO):
+        if cls.enabled_for(level):
+            cls.emit(LogRecord(level, message=data))
 
     @classmethod
     def info(cls, message: str):
@@ -50,36 +410,56 @@ class Logger:
 
     @classmethod
     def add_request(cls, url: str, method: str, body: None, files_meta=None):
-        test_name = os.environ.get("PYTEST_CURRENT_TEST")
-
-        data_to_add = f"\n-----\n"
-        data_to_add += f"Test:  {test_name}\n"
-        data_to_add += f"Time:  {str(datetime.datetime.now())}\n"
-        data_to_add += f"Request method:  {method}\n"
-        data_to_add += f"Request URL:  {url}\n"
-        data_to_add += "\n"
-        if body is not None:
-            data_to_add += f"Request body: {body}\n"
-
-        data_to_add += "\n"
-        cls.debug(data_to_add)
+        if not cls.enabled_for(LogLevel.DEBUG):
+            return
+        cls.emit(
+            LogRecord(
+                LogLevel.DEBUG,
+                test=os.environ.get("PYTEST_CURRENT_TEST"),
+                method=method,
+                url=url,
+                body=body,
+            )
+        )
 
     @classmethod
     def add_response(
-        cls, response, body=None, endpoint_name: str = None, files_meta=None
+        cls, response, body=None, endpoint_name: str = None, files_meta=None, cached: bool = False
     ):
-        data_to_add = ""
-        if endpoint_name:
-            data_to_add += f"Endpoint: {endpoint_name}\n"
-        data_to_add += f"Response status: {response.status_code}\n"
-        data_to_add += f"Response body: {response.text}\n"
+        """cached: served from the client's ResponseCache, not the network"""
+        level = LogLevel.ERROR if response.status_code >= 400 else LogLevel.INFO  # 👈 ERROR for fails
+        if not cls.enabled_for(level):
+            return
+        max_body_chars = cls.max_body_chars
+        if level != LogLevel.ERROR and cls.body_sample_rate < 1 and cls.sampler.random() >= cls.body_sample_rate:
+            max_body_chars = 0
+        record = LogRecord(
+            level,
+            message=endpoint_name,
+            test=os.environ.get("PYTEST_CURRENT_TEST"),
+            body=body,
+            response=response,
+            max_body_chars=max_body_chars,
+            cached=cached,
+        )
+        if cls.attach_to_allure:
+            import allure
 
-        if body is not None:
-            data_to_add += f"Request body: {body}\n"
+            allure.attach(
+                record.render(cls.log_format),
+                name=f"response {response.status_code}{' (cached)' if cached else ''}",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+        cls.emit(record)
 
-        data_to_add += "-----\n"
 
-        if response.status_code >= 400:
-            cls.error(data_to_add)  # 👈 ERROR for fails
-        else:
-            cls.info(data_to_add)
+class NullLogger:
+    """Drop-in Logger replacement that discards everything (benchmarks, load runs)"""
+
+    @classmethod
+    def add_request(cls, *args, **kwargs):
+        pass
+
+    @classmethod
+    def add_response(cls, *args, **kwargs):
+        pass
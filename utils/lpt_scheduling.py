@@ -0,0 +1,72 @@
+"""
+Duration-aware xdist scheduling: tests are handed out longest predicted
+duration first (LPT), one at a time as workers free up, so a slow test
+never starts last and stretches the run while other workers idle.
+Predictions come from utils.durations.DurationIndex.
+
+LPTScheduling builds on LoadScheduling internals (maxschedchunk,
+_send_tests, _check_nodes_have_same_collection) that are not public xdist
+API; supported() says whether the installed xdist still has them, and
+requirements.txt pins the range it was written against.
+"""
+
+import xdist
+from xdist.scheduler import LoadScheduling
+
+from utils.durations import DurationIndex, predicted_makespan
+
+XDIST_VERSIONS = ((3, 3), (4, 0))  # maxschedchunk arrived in 3.3
+
+
+def supported() -> bool:
+    """True when the installed xdist has the LoadScheduling internals LPTScheduling relies on"""
+    try:
+        version = tuple(int(part) for part in xdist.__version__.split(".")[:2])
+    except (AttributeError, ValueError):
+        return False
+    low, high = XDIST_VERSIONS
+    return low <= version < high and all(
+        hasattr(LoadScheduling, name) for name in ("_send_tests", "_check_nodes_have_same_collection", "check_schedule")
+    )
+
+
+class LPTScheduling(LoadScheduling):
+    """
+    LoadScheduling with the pending list sorted by predicted duration,
+    longest first, and tests sent one at a time (each worker holds the test
+    it runs plus the next one), so whichever worker finishes early pulls
+    the next longest test.
+    """
+
+    def __init__(self, config, log=None, index: DurationIndex = None):
+        super().__init__(config, log)
+        self.index = index or DurationIndex()
+        self.maxschedchunk = 1
+        self.predicted = None
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        predictions = [self.index.predict(nodeid) for nodeid in self.collection]
+        self.pending[:] = sorted(range(len(self.collection)), key=lambda index: -predictions[index])
+        self.predicted = predicted_makespan(
+            (predictions[index] for index in self.pending), len(self.nodes)
+        )
+        self.log(f"LPT order, predicted makespan {self.predicted:.1f}s")
+        if not self.collection:
+            return
+
+        for _ in range(2):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
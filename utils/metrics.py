@@ -0,0 +1,212 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+ROUTES = [
+    (re.compile(r"/pet/findByStatus"), "/pet/findByStatus"),
+    (re.compile(r"/pet/[^/]+/uploadImage"), "/pet/{petId}/uploadImage"),
+    (re.compile(r"/pet/[^/]+"), "/pet/{petId}"),
+    (re.compile(r"/store/order/[^/]+"), "/store/order/{orderId}"),
+]
+NUMERIC_SEGMENT = re.compile(r"/-?\d+(?=/|$)")
+
+
+def route_template(resource: str) -> str:
+    """'/pet/123?x=1' or 'pet/123' -> '/pet/{petId}'; unknown numeric segments become {id}"""
+    path = "/" + resource.split("?", 1)[0].strip("/")
+    for pattern, template in ROUTES:
+        if pattern.fullmatch(path):
+            return template
+    return NUMERIC_SEGMENT.sub("/{id}", path)
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram: bucket i covers [1us * (1+PRECISION)^i, ...), so
+    percentiles are within ~1% and memory is bounded by the value range
+    (about a thousand buckets between 1us and 1h), not by the sample count.
+    Histograms merge by adding bucket counts, e.g. across xdist workers.
+    """
+
+    PRECISION = 0.02
+    UNIT = 1e-6
+    _LOG_BASE = math.log(1 + PRECISION)
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds: float):
+        index = int(math.log(max(seconds, self.UNIT) / self.UNIT) / self._LOG_BASE)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for bound, pick in (("min", min), ("max", max)):
+            values = [value for value in (getattr(self, bound), getattr(other, bound)) if value is not None]
+            setattr(self, bound, pick(values) if values else None)
+        return self
+
+    def percentile(self, fraction: float):
+        if not self.count:
+            return None
+        rank = max(math.ceil(fraction * self.count), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                midpoint = self.UNIT * (1 + self.PRECISION) ** (index + 0.5)
+                return min(max(midpoint, self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else None,
+            "p50_ms": ms(self.percentile(0.5)),
+            "p95_ms": ms(self.percentile(0.95)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "max_ms": ms(self.max),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.buckets = {int(index): count for index, count in data["buckets"].items()}
+        histogram.count, histogram.total = data["count"], data["total"]
+        histogram.min, histogram.max = data["min"], data["max"]
+        return histogram
+
+
+_connect_timer = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.seconds = getattr(_connect_timer, "seconds", 0.0) + time.perf_counter() - started
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    connect = TimedHTTPConnection.connect
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report their connect (+TLS) time to the calling thread"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def take_connect_time() -> float:
+    """Connect time spent by this thread since the last call (0 when a pooled connection was reused)"""
+    seconds = getattr(_connect_timer, "seconds", 0.0)
+    _connect_timer.seconds = 0.0
+    return seconds
+
+
+class ApiMetrics:
+    """
+    Per-endpoint latency histograms keyed by "METHOD /route/{template}", one
+    histogram per phase: total, connect (new connections only), ttfb
+    (request sent -> headers parsed) and body (body read).
+    """
+
+    PHASES = ("total", "connect", "ttfb", "body")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, method: str, resource: str, phases: dict):
+        key = f"{method} {route_template(resource)}"
+        with self.lock:
+            histograms = self.endpoints.setdefault(key, {})
+            for phase, seconds in phases.items():
+                if seconds is not None:
+                    histograms.setdefault(phase, LatencyHistogram()).record(seconds)
+
+    def merge(self, other: "ApiMetrics") -> "ApiMetrics":
+        with self.lock:
+            for key, histograms in other.endpoints.items():
+                mine = self.endpoints.setdefault(key, {})
+                for phase, histogram in histograms.items():
+                    mine.setdefault(phase, LatencyHistogram()).merge(histogram)
+        return self
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {
+                key: {phase: histograms[phase].summary() for phase in self.PHASES if phase in histograms}
+                for key, histograms in sorted(self.endpoints.items())
+            }
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                key: {phase: histogram.to_dict() for phase, histogram in histograms.items()}
+                for key, histograms in self.endpoints.items()
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ApiMetrics":
+        metrics = cls()
+        metrics.endpoints = {
+            key: {phase: LatencyHistogram.from_dict(value) for phase, value in histograms.items()}
+            for key, histograms in data.items()
+        }
+        return metrics
+
+    def save(self, file_name: str):
+        os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, file_name: str) -> "ApiMetrics":
+        with open(file_name, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
@@ -0,0 +1,95 @@
+import mmap
+import os
+import uuid
+
+
+class MultipartStream:
+    """
+    multipart/form-data body that is produced while it is sent: requests sees
+    a file-like object with a known length (so it sets Content-Length) and
+    the HTTP connection pulls it with read() in blocks. Files are mmap'ed,
+    bytes are sliced through a memoryview, so a large image is never copied
+    into one body buffer. Use as a context manager to release the files.
+
+        with MultipartStream({"additionalMetadata": "x"}, {"file": path}) as body:
+            session.post(url, data=body, headers={"Content-Type": body.content_type})
+    """
+
+    def __init__(self, fields: dict = None, files: dict = None, boundary: str = None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._handles = []
+        self._segments = []
+        try:
+            for name, value in (fields or {}).items():
+                self._add_bytes(self._part_header(name) + str(value).encode() + b"\r\n")
+            for name, source in (files or {}).items():
+                filename, content = self._open(source)
+                self._add_bytes(self._part_header(name, filename))
+                self._segments.append(content)
+                self._add_bytes(b"\r\n")
+            self._add_bytes(f"--{self.boundary}--\r\n".encode())
+        except Exception:
+            self.close()
+            raise
+        self.length = sum(len(segment) for segment in self._segments)
+        self._index = 0
+        self._offset = 0
+
+    def _part_header(self, name: str, filename: str = None) -> bytes:
+        disposition = f'form-data; name="{name}"'
+        if filename is None:
+            return f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        return (
+            f"--{self.boundary}\r\nContent-Disposition: {disposition}; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+
+    def _add_bytes(self, data: bytes):
+        self._segments.append(memoryview(data))
+
+    def _open(self, source) -> tuple:
+        """(filename, memoryview) for a path or a (filename, bytes) pair"""
+        if isinstance(source, (str, os.PathLike)):
+            file = open(source, "rb")
+            self._handles.append(file)
+            filename = os.path.basename(source)
+            if os.fstat(file.fileno()).st_size == 0:
+                return filename, memoryview(b"")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._handles.append(mapped)
+            view = memoryview(mapped)
+            self._handles.append(view)
+            return filename, view
+        filename, content = source
+        return filename, memoryview(content)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        remaining = self.length if size is None or size < 0 else size
+        while remaining > 0 and self._index < len(self._segments):
+            segment = self._segments[self._index]
+            chunk = segment[self._offset:self._offset + remaining]
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            self._offset += len(chunk)
+            if self._offset >= len(segment):
+                self._index, self._offset = self._index + 1, 0
+        return chunks[0].tobytes() if len(chunks) == 1 else b"".join(chunks)
+
+    def close(self):
+        for handle in reversed(self._handles):
+            if isinstance(handle, memoryview):
+                handle.release()
+            else:
+                handle.close()
+        self._handles = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
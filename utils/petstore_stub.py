@@ -0,0 +1,389 @@
+"""
+In-process Petstore emulator covering every endpoint used by PetApi,
+StoreApi and FilesApi. State lives in memory; writes can be made visible
+only after a consistency delay to mimic the public server.
+
+    python -m utils.petstore_stub --port 8080 --latency 0.05 --consistency-delay 1
+"""
+
+import argparse
+import itertools
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from utils.enums import PetStatus
+
+API_PREFIX = "/v2"
+
+
+def iter_multipart(content_type: str, body: bytes):
+    """
+    Yields (headers, start, end) for each part of a multipart/form-data body;
+    the part's payload is body[start:end], so large files are never copied.
+    """
+    boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not content_type.startswith("multipart/") or not boundary:
+        return
+    delimiter = b"\r\n--" + boundary.group(1).encode()
+    position = body.find(delimiter[2:])
+    while position != -1:
+        headers_at = position + len(delimiter) - 2
+        if body[headers_at:headers_at + 2] == b"--":
+            return
+        payload_at = body.find(b"\r\n\r\n", headers_at)
+        if payload_at == -1:
+            return
+        headers = {}
+        for line in body[headers_at:payload_at].decode("latin-1").split("\r\n"):
+            name, _, value = line.partition(":")
+            if value:
+                headers[name.strip().lower()] = value.strip()
+        next_part = body.find(delimiter, payload_at + 4)
+        if next_part == -1:
+            return
+        yield headers, payload_at + 4, next_part
+        position = next_part + 2
+
+
+class PetstoreState:
+    """
+    Thread-safe in-memory store. Every write is kept as a (visible_at, value)
+    version; reads return the newest version that is already visible, so with
+    consistency_delay > 0 a fresh pet 404s for a while like on the real server.
+    """
+
+    def __init__(self, consistency_delay: float = 0.0, seed_pets: int = 10):
+        self.consistency_delay = consistency_delay
+        self.lock = threading.Lock()
+        self.pets = {}
+        self.orders = {}
+        self.status_index = defaultdict(set)
+        self.ids = itertools.count(9_000_000_000)
+        for status in PetStatus:
+            for number in range(seed_pets):
+                self.save_pet(
+                    {
+                        "name": f"{status.value}-{number}",
+                        "photoUrls": [],
+                        "tags": [],
+                        "status": status.value,
+                    },
+                    delay=0,
+                )
+
+    def _write(self, table: dict, key: int, value, delay: float = None):
+        delay = self.consistency_delay if delay is None else delay
+        table.setdefault(key, []).append((time.monotonic() + delay, value))
+
+    @staticmethod
+    def _read(table: dict, key: int):
+        versions = table.get(key)
+        if not versions:
+            return None
+        now = time.monotonic()
+        visible = [index for index, (at, _) in enumerate(versions) if at <= now]
+        if not visible:
+            return None
+        del versions[: visible[-1]]  # older versions can never be read again
+        if versions[0][1] is None and len(versions) == 1:
+            del table[key]  # a visible delete with nothing after it: forget the entity
+        return versions[0][1]
+
+    def save_pet(self, pet: dict, delay: float = None) -> dict:
+        pet = dict(pet)
+        with self.lock:
+            pet.setdefault("id", next(self.ids))
+            self._write(self.pets, pet["id"], pet, delay)
+            self.status_index[pet.get("status")].add(pet["id"])
+        return pet
+
+    def get_pet(self, pet_id: int):
+        with self.lock:
+            return self._read(self.pets, pet_id)
+
+    def delete_pet(self, pet_id: int) -> bool:
+        with self.lock:
+            if self._read(self.pets, pet_id) is None:
+                return False
+            self._write(self.pets, pet_id, None)
+            self._read(self.pets, pet_id)  # forgets it at once if the delete is already visible
+            return True
+
+    def find_pets_by_status(self, statuses) -> list:
+        found = []
+        with self.lock:
+            for status in statuses:
+                for pet_id in list(self.status_index.get(status, ())):
+                    pet = self._read(self.pets, pet_id)
+                    if pet is not None and pet.get("status") == status:
+                        found.append(pet)
+                    if not any(
+                        value is not None and value.get("status") == status
+                        for _, value in self.pets.get(pet_id, ())
+                    ):
+                        self.status_index[status].discard(pet_id)
+        return found
+
+    def inventory(self) -> dict:
+        counts = Counter({status.value: 0 for status in PetStatus})
+        with self.lock:
+            for pet_id in list(self.pets):
+                pet = self._read(self.pets, pet_id)
+                if pet is not None:
+                    counts[pet.get("status")] += 1
+        return dict(counts)
+
+    def save_order(self, order: dict) -> dict:
+        order = dict(order)
+        with self.lock:
+            order.setdefault("id", next(self.ids))
+            self._write(self.orders, order["id"], order)
+        return order
+
+    def get_order(self, order_id: int):
+        with self.lock:
+            return self._read(self.orders, order_id)
+
+    def delete_order(self, order_id: int) -> bool:
+        with self.lock:
+            if self._read(self.orders, order_id) is None:
+                return False
+            self._write(self.orders, order_id, None)
+            self._read(self.orders, order_id)  # forgets it at once if the delete is already visible
+            return True
+
+
+def api_message(code: int, message, type_: str = "unknown") -> dict:
+    return {"code": code, "type": type_, "message": str(message)}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse sockets
+    disable_nagle_algorithm = True
+
+    routes = [
+        ("POST", re.compile(r"/pet"), "add_pet"),
+        ("PUT", re.compile(r"/pet"), "update_pet"),
+        ("GET", re.compile(r"/pet/findByStatus"), "find_by_status"),
+        ("GET", re.compile(r"/pet/(-?\d+)"), "get_pet"),
+        ("POST", re.compile(r"/pet/(-?\d+)"), "update_pet_with_form"),
+        ("DELETE", re.compile(r"/pet/(-?\d+)"), "delete_pet"),
+        ("POST", re.compile(r"/pet/(-?\d+)/uploadImage"), "upload_image"),
+        ("GET", re.compile(r"/store/inventory"), "inventory"),
+        ("POST", re.compile(r"/store/order"), "place_order"),
+        ("GET", re.compile(r"/store/order/(-?\d+)"), "get_order"),
+        ("DELETE", re.compile(r"/store/order/(-?\d+)"), "delete_order"),
+    ]
+
+    @property
+    def state(self) -> PetstoreState:
+        return self.server.state
+
+    def dispatch(self):
+        url = urlsplit(self.path)
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        self.query = parse_qs(url.query)
+        self.raw_body = self.read_body()
+        self.server.record(self.command, path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path.rstrip("/"))
+            if match and method == self.command:
+                args = [int(group) for group in match.groups()]
+                return self.send_json(*getattr(self, handler)(*args))
+        return self.send_json(404, api_message(404, "Not Found", "error"))
+
+    do_GET = do_POST = do_PUT = do_DELETE = dispatch
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def json_body(self):
+        try:
+            return json.loads(self.raw_body)
+        except ValueError:
+            return None
+
+    def send_json(self, status: int, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def add_pet(self):
+        pet = self.json_body()
+        if not isinstance(pet, dict):
+            return 405, api_message(405, "Invalid input", "error")
+        return 200, self.state.save_pet(pet)
+
+    def update_pet(self):
+        return self.add_pet()
+
+    def find_by_status(self):
+        statuses = [
+            status
+            for value in self.query.get("status", [])
+            for status in value.split(",")
+        ]
+        return 200, self.state.find_pets_by_status(statuses)
+
+    def get_pet(self, pet_id: int):
+        pet = self.state.get_pet(pet_id)
+        if pet is None:
+            return 404, api_message(1, "Pet not found", "error")
+        return 200, pet
+
+    def update_pet_with_form(self, pet_id: int):
+        pet = self.state.get_pet(pet_id)
+        if pet is None:
+            return 404, api_message(404, "not found")
+        pet = dict(pet)
+        form = parse_qs(self.raw_body.decode("utf-8", "replace"))
+        for field in ("name", "status"):
+            if field in form:
+                pet[field] = form[field][0]
+        self.state.save_pet(pet)
+        return 200, api_message(200, pet_id)
+
+    def delete_pet(self, pet_id: int):
+        if not self.state.delete_pet(pet_id):
+            return 404, None
+        return 200, api_message(200, pet_id)
+
+    def upload_image(self, pet_id: int):
+        metadata, uploaded = None, None
+        for headers, start, end in iter_multipart(self.headers.get("Content-Type", ""), self.raw_body):
+            disposition = headers.get("content-disposition", "")
+            filename = re.search(r'filename="([^"]*)"', disposition)
+            if filename:
+                uploaded = (filename.group(1), end - start)
+            elif 'name="additionalMetadata"' in disposition:
+                metadata = self.raw_body[start:end].decode().strip()
+        if uploaded is None:
+            return 415, api_message(415, "No file uploaded", "error")
+        return 200, api_message(
+            200,
+            f"additionalMetadata: {metadata}\n"
+            f"File uploaded to ./{uploaded[0]}, {uploaded[1]} bytes",
+        )
+
+    def inventory(self):
+        return 200, self.state.inventory()
+
+    def place_order(self):
+        order = self.json_body()
+        if not isinstance(order, dict):
+            return 400, api_message(400, "Invalid Order", "error")
+        return 200, self.state.save_order(order)
+
+    def get_order(self, order_id: int):
+        order = self.state.get_order(order_id)
+        if order is None:
+            return 404, api_message(1, "Order not found", "error")
+        return 200, order
+
+    def delete_order(self, order_id: int):
+        if not self.state.delete_order(order_id):
+            return 404, api_message(404, "Order Not Found")
+        return 200, api_message(200, order_id)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, state: PetstoreState, latency: float = 0.0):
+        super().__init__(address, StubHandler)
+        self.state = state
+        self.latency = latency
+        self.requests_served = Counter()
+        self._counter_lock = threading.Lock()
+
+    def record(self, method: str, path: str):
+        route = re.sub(r"/-?\d+", "/{id}", path)
+        with self._counter_lock:
+            self.requests_served[f"{method} {route}"] += 1
+
+
+class PetstoreStub:
+    """Local Petstore emulator running in a background thread"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        consistency_delay: float = 0.0,
+        seed_pets: int = 10,
+    ):
+        self.state = PetstoreState(consistency_delay, seed_pets)
+        self.server = StubServer((host, port), self.state, latency)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    @property
+    def requests_served(self) -> Counter:
+        return self.server.requests_served
+
+    def start(self) -> "PetstoreStub":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--consistency-delay", type=float, default=0.0)
+    parser.add_argument("--seed-pets", type=int, default=10)
+    args = parser.parse_args()
+
+    stub = PetstoreStub(
+        args.host, args.port, args.latency, args.consistency_delay, args.seed_pets
+    )
+    print(f"Petstore stub listening on {stub.base_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
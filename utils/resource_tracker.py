@@ -0,0 +1,84 @@
+import threading
+import time
+
+from utils.logger import Logger
+from utils.waiters import BatchWaiter, Poller, status_in
+
+
+class ResourceTracker:
+    """
+    Ids of the pets and orders this process created and hasn't deleted.
+    PetApi.add_pet and StoreApi.place_order register what they create,
+    delete_pet and delete_placed_order unregister it, and cleanup() deletes
+    whatever is still alive in one concurrent pass with retries, instead of
+    every test tearing down its own data one request at a time.
+
+        tracker = ResourceTracker()
+        pet_api = PetApi(client, tracker=tracker)
+        ...
+        report = tracker.cleanup(PetApi(client), StoreApi(client))
+    """
+
+    PET = "pet"
+    ORDER = "order"
+    GONE = (200, 404)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.alive = {self.PET: {}, self.ORDER: {}}  # kind -> ids in creation order
+        self.created = {self.PET: 0, self.ORDER: 0}
+        self.deleted = {self.PET: 0, self.ORDER: 0}
+
+    def track(self, kind: str, response, entity_id=None):
+        """After a create call: registers the new entity if the call succeeded"""
+        if response.status_code != 200:
+            return
+        if entity_id is None:
+            entity_id = response.json()["id"]
+        with self.lock:
+            if entity_id not in self.alive[kind]:  # a POST with an existing id overwrites it
+                self.alive[kind][entity_id] = None
+                self.created[kind] += 1
+
+    def untrack(self, kind: str, response, entity_id):
+        """After a delete call: the entity is gone if it was deleted or never found"""
+        if response.status_code not in self.GONE:
+            return
+        with self.lock:
+            if self.alive[kind].pop(entity_id, 0) is None:
+                self.deleted[kind] += 1
+
+    def pending(self, kind: str) -> list:
+        with self.lock:
+            return list(self.alive[kind])
+
+    def cleanup(
+        self, pet_api, store_api, concurrency: int = 16, timeout: float = 60, poller: Poller = None
+    ) -> dict:
+        """
+        Deletes every tracked entity still alive, `concurrency` requests at a
+        time, retrying failures with backoff until `timeout`. Returns per kind
+        how many the tests deleted themselves, how many cleanup removed and
+        the ids that are left.
+        """
+        started = time.perf_counter()
+        report = {}
+        for kind, delete in ((self.PET, pet_api.delete_pet), (self.ORDER, store_api.delete_placed_order)):
+            waiter = BatchWaiter(concurrency=concurrency, timeout=timeout, poller=poller)
+            cleaned = 0
+            deletions = waiter.iter_ready(delete, self.pending(kind), status_in(self.GONE), f"cleanup_{kind}")
+            for entity_id, response in deletions:
+                self.untrack(kind, response, entity_id)
+                cleaned += 1
+            with self.lock:
+                report[kind] = {
+                    "created": self.created[kind],
+                    "deleted_by_tests": self.deleted[kind] - cleaned,
+                    "cleaned_up": cleaned,
+                    "left": list(self.alive[kind]),
+                }
+        report["elapsed"] = round(time.perf_counter() - started, 3)
+        left = {kind: report[kind]["left"] for kind in self.alive if report[kind]["left"]}
+        if left:
+            Logger.warning(f"cleanup left entities behind: {left}")
+        return report
@@ -0,0 +1,200 @@
+"""
+Response schemas compiled once into plain Python functions. A schema lists
+its fields and their types (int, str, bool, float, an Enum, a nested
+Schema or [type] for a list); compiling generates straight-line code for
+exactly those checks, so validating a pet costs a few dict lookups and
+type() comparisons, and building error paths only happens for bad items.
+
+    PET.validate(response.json())             # raises SchemaError
+    report = PET.batch(pet_api.iter_pets_by_status())
+    assert report.ok, report.summary()
+"""
+
+from enum import Enum
+
+from utils.enums import OrderStatus, PetStatus
+
+_TYPE_NAMES = {int: "integer", str: "string", bool: "boolean", float: "number"}
+
+
+class SchemaError(AssertionError):
+    pass
+
+
+class Schema:
+    """
+    fields: name -> type; keys not listed are allowed. required: keys that
+    must be present. values: type of every value instead of fixed fields
+    (a map like the inventory). errors(item) returns what is wrong with
+    item as "path: problem" strings, an empty sequence when it is valid.
+    """
+
+    def __init__(self, name: str, fields: dict = None, required=(), values=None):
+        self.name = name
+        self.fields = dict(fields or {})
+        self.required = tuple(required)
+        self.values = values
+        self.errors = self._compile()
+
+    def require(self, *keys) -> "Schema":
+        """Same schema with more required keys, e.g. for the response to our own write"""
+        return Schema(self.name, self.fields, self.required + keys, self.values)
+
+    def validate(self, item):
+        errors = self.errors(item)
+        if errors:
+            raise SchemaError(f"{self.name} does not match its schema: {'; '.join(errors)}\n{item!r}")
+        return item
+
+    __call__ = validate
+
+    def batch(self, items, max_errors: int = 100) -> "ValidationReport":
+        """Validates every item of an iterable (e.g. a streamed listing) without stopping at the first bad one"""
+        report = ValidationReport(self, max_errors)
+        for item in items:
+            report(item)
+        return report
+
+    def _compile(self):
+        namespace = {"_add": _add, "_VALID": ()}
+        lines = ["def check(item):", "    errors = None"]
+        lines += _emit_object(self, "item", "''", 1, namespace)
+        lines.append("    return errors or _VALID")
+        exec(compile("\n".join(lines), f"<schema {self.name}>", "exec"), namespace)
+        return namespace["check"]
+
+
+def _add(errors, message: str) -> list:
+    if errors is None:
+        errors = []
+    errors.append(message)
+    return errors
+
+
+def _join(path: str, key: str) -> str:
+    """Source of the error path of `key` under the source expression `path` ('' at the root)"""
+    return repr(key) if path == "''" else f"{path} + {'.' + key!r}"
+
+
+def _emit_object(schema: Schema, var: str, path: str, depth: int, namespace: dict) -> list:
+    """
+    Nested schemas are inlined rather than called, so a valid item costs no
+    calls and no allocations; `errors` is only created on the first failure
+    """
+    pad = "    " * depth
+    inner = pad + "    "
+    prefix = "" if path == "''" else f"{path} + ': ' + "
+    lines = [
+        f"{pad}if type({var}) is not dict:",
+        f"{inner}errors = _add(errors, {prefix}'expected object, got ' + type({var}).__name__)",
+        f"{pad}else:",
+    ]
+    value = f"v{depth}"
+    if schema.values is not None:
+        key = f"k{depth}"
+        lines.append(f"{inner}for {key}, {value} in {var}.items():")
+        lines += _emit(schema.values, value, _dynamic(path, key), depth + 2, namespace)
+    for key, spec in schema.fields.items():
+        lines.append(f"{inner}if {key!r} in {var}:")
+        lines.append(f"{inner}    {value} = {var}[{key!r}]")
+        lines += _emit(spec, value, _join(path, key), depth + 2, namespace)
+        if key in schema.required:
+            lines.append(f"{inner}else:")
+            lines.append(f"{inner}    errors = _add(errors, {_join(path, key)} + ': missing')")
+    for key in schema.required:
+        if key not in schema.fields:
+            lines.append(f"{inner}if {key!r} not in {var}:")
+            lines.append(f"{inner}    errors = _add(errors, {_join(path, key)} + ': missing')")
+    if len(lines) == 3:
+        lines.append(f"{inner}pass")
+    return lines
+
+
+def _dynamic(path: str, key_var: str) -> str:
+    return key_var if path == "''" else f"{path} + '.' + {key_var}"
+
+
+def _emit(spec, var: str, path: str, depth: int, namespace: dict) -> list:
+    """Lines that record an error when `var` doesn't match spec; `path` is only evaluated on failure"""
+    pad = "    " * depth
+
+    def fail(expected: str) -> str:
+        return f"{pad}    errors = _add(errors, {path} + {': expected ' + expected + ', got '!r} + repr({var})[:40])"
+
+    if isinstance(spec, list):
+        index = f"i{depth}"
+        item = f"x{depth}"
+        return [
+            f"{pad}if type({var}) is not list:",
+            fail("array"),
+            f"{pad}else:",
+            f"{pad}    for {index}, {item} in enumerate({var}):",
+            *_emit(spec[0], item, f"{path} + '[' + str({index}) + ']'", depth + 2, namespace),
+        ]
+    if isinstance(spec, Schema):
+        return _emit_object(spec, var, path, depth, namespace)
+    if isinstance(spec, type) and issubclass(spec, Enum):
+        allowed = f"_{spec.__name__}"
+        namespace[allowed] = frozenset(member.value for member in spec)
+        return [
+            f"{pad}if type({var}) is not str or {var} not in {allowed}:",
+            fail(f"one of {sorted(namespace[allowed])}"),
+        ]
+    if spec is float:
+        return [f"{pad}if type({var}) is not float and type({var}) is not int:", fail("number")]
+    if spec in _TYPE_NAMES:
+        return [f"{pad}if type({var}) is not {spec.__name__}:", fail(_TYPE_NAMES[spec])]
+    raise TypeError(f"Unsupported schema type: {spec!r}")
+
+
+class ValidationReport:
+    """
+    Collects validation results item by item; usable as the validate callback
+    of PetApi.iter_pets_by_status. Keeps the first max_errors failures.
+    """
+
+    def __init__(self, schema: Schema, max_errors: int = 100):
+        self.schema = schema
+        self.max_errors = max_errors
+        self.checked = 0
+        self.invalid = 0
+        self.failures = []  # (index, [errors])
+
+    def __call__(self, item):
+        errors = self.schema.errors(item)
+        if errors:
+            self.invalid += 1
+            if len(self.failures) < self.max_errors:
+                self.failures.append((self.checked, errors))
+        self.checked += 1
+
+    @property
+    def ok(self) -> bool:
+        return self.invalid == 0
+
+    def summary(self) -> str:
+        lines = [f"{self.schema.name}: {self.checked - self.invalid}/{self.checked} valid"]
+        lines += [f"  [{index}] {'; '.join(errors)}" for index, errors in self.failures[:10]]
+        if self.invalid > 10:
+            lines.append(f"  ... {self.invalid - 10} more")
+        return "\n".join(lines)
+
+    def raise_for_errors(self):
+        if not self.ok:
+            raise SchemaError(self.summary())
+
+
+CATEGORY = Schema("Category", {"id": int, "name": str})
+TAG = Schema("Tag", {"id": int, "name": str})
+PET = Schema(
+    "Pet",
+    {"id": int, "category": CATEGORY, "name": str, "photoUrls": [str], "tags": [TAG], "status": PetStatus},
+    required=("name", "photoUrls"),
+)
+ORDER = Schema(
+    "Order",
+    {"id": int, "petId": int, "quantity": int, "shipDate": str, "status": OrderStatus, "complete": bool},
+    required=("id", "petId", "quantity", "shipDate", "status", "complete"),
+)
+INVENTORY = Schema("Inventory", values=int)
+API_RESPONSE = Schema("ApiResponse", {"code": int, "type": str, "message": str})
@@ -1,69 +1,285 @@
+import heapq
+import itertools
+import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+from utils.logger import Logger
 
-class PetWaiter:
-    @staticmethod
-    def wait_for_pet(pet_api, pet_id: int, expected_status=200, retries=20, delay=3):
-        last_status = None
 
-        for attempt in range(1, retries + 1):
+def status_in(expected_status):
+    """Success predicate for a single status code or a list/tuple of acceptable ones"""
+    if isinstance(expected_status, (list, tuple, set, frozenset)):
+        expected = frozenset(expected_status)
+    else:
+        expected = frozenset([expected_status])
+    return lambda response: response.status_code in expected
+
+
+class WaitStats:
+    """Outcome of one wait: how many probes it took and how long until it was consistent"""
+
+    __slots__ = ("name", "target", "attempts", "elapsed", "succeeded", "last_status")
+
+    def __init__(self, name: str, target, attempts: int, elapsed: float, succeeded: bool, last_status):
+        self.name = name
+        self.target = target
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.succeeded = succeeded
+        self.last_status = last_status
+
+    def __repr__(self):
+        outcome = "ok" if self.succeeded else "timeout"
+        return (
+            f"<{self.name} {self.target}: {outcome} after {self.attempts} attempts, "
+            f"{self.elapsed:.3f}s, last status {self.last_status}>"
+        )
+
+
+class WaitTimeoutError(AssertionError):
+    def __init__(self, message: str, stats: WaitStats):
+        super().__init__(message)
+        self.stats = stats
+
+
+class Poller:
+    """
+    Polls probe() until until(result) holds or the overall deadline passes.
+    The first probe is immediate; later delays grow from initial_delay by
+    backoff up to max_delay, with +/- jitter so parallel waiters don't poll
+    in lockstep, and are clipped to the time left before the deadline.
+    Exceptions from probe() or until() count as a failed attempt, unless
+    retry_errors=False: then they propagate at once.
+    Every finished wait is recorded in Poller.history.
+    """
+
+    history = deque(maxlen=10000)
+    _history_lock = threading.Lock()
+
+    # swapped out by replay runs, so waits don't really sleep
+    sleep = staticmethod(time.sleep)
+    clock = staticmethod(time.monotonic)
+
+    def __init__(
+        self,
+        timeout: float = 60,
+        initial_delay: float = 0.1,
+        max_delay: float = 4,
+        backoff: float = 2.0,
+        jitter: float = 0.2,
+    ):
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+
+    def delays(self):
+        delay = self.initial_delay
+        while True:
+            yield min(delay, self.max_delay) * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay *= self.backoff
+
+    def poll(
+        self, probe, until, name: str = "wait", target=None, raise_on_timeout: bool = True,
+        retry_errors: bool = True,
+    ):
+        started = self.clock()
+        deadline = started + self.timeout
+        delays = self.delays()
+        attempts, result, last_status, last_error = 0, None, None, None
+
+        while True:
+            attempts += 1
+            try:
+                result = probe()
+                last_status = getattr(result, "status_code", None)
+                if until(result):
+                    self.record(WaitStats(name, target, attempts, self.clock() - started, True, last_status))
+                    return result
+            except Exception as e:
+                if not retry_errors:
+                    self.record(WaitStats(name, target, attempts, self.clock() - started, False, last_status))
+                    raise
+                last_error = e
+
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                break
+            self.sleep(min(next(delays), remaining))
+
+        stats = WaitStats(name, target, attempts, self.clock() - started, False, last_status)
+        self.record(stats)
+        if not raise_on_timeout:
+            return result
+        raise WaitTimeoutError(
+            f"{name} {target}: condition not met within {self.timeout}s "
+            f"({attempts} attempts). API is unstable - last status: {last_status}"
+            + (f", last error: {last_error!r}" if last_error else ""),
+            stats,
+        )
+
+    @classmethod
+    def record(cls, stats: WaitStats):
+        with cls._history_lock:
+            cls.history.append(stats)
+        Logger.debug(repr(stats))
+
+    @classmethod
+    def summary(cls) -> dict:
+        with cls._history_lock:
+            waits = list(cls.history)
+        succeeded = [stats.elapsed for stats in waits if stats.succeeded]
+        return {
+            "waits": len(waits),
+            "timeouts": len(waits) - len(succeeded),
+            "attempts": sum(stats.attempts for stats in waits),
+            "mean_time_to_consistency": sum(succeeded) / len(succeeded) if succeeded else None,
+            "max_time_to_consistency": max(succeeded, default=None),
+        }
+
+
+class BatchWaiter:
+    """
+    Polls many entities at once and yields (id, response) as each one reaches
+    its expected state. Probes run on a pool of `concurrency` threads; an
+    entity waiting for its next probe holds no thread, so the total wait is
+    close to the slowest entity instead of the sum. Entities still failing at
+    the shared deadline end up in self.stragglers (id -> WaitStats).
+
+        waiter = BatchWaiter(concurrency=32, timeout=60)
+        for pet_id, response in waiter.wait_for_pets(pet_api, pet_ids):
+            ...
+        waiter.raise_for_stragglers()
+    """
+
+    def __init__(self, concurrency: int = 16, timeout: float = 60, poller: Poller = None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.poller = poller or Poller(timeout=timeout)
+        self.ready = {}
+        self.stragglers = {}
+        self.elapsed = None
+
+    def wait_for_pets(self, pet_api, pet_ids, expected_status=200, until=None):
+        return self.iter_ready(
+            pet_api.find_pet_by_id, pet_ids, until or status_in(expected_status), "wait_for_pet"
+        )
+
+    def wait_for_orders(self, store_api, order_ids, expected_status=200, until=None):
+        return self.iter_ready(
+            store_api.get_info_about_placed_order_by_id,
+            order_ids,
+            until or status_in(expected_status),
+            "wait_for_order",
+        )
+
+    def iter_ready(self, probe, ids, until, name: str = "batch_wait"):
+        clock = Poller.clock
+        started = clock()
+        deadline = started + self.timeout
+        order = itertools.count()
+        due = [(started, next(order), entity_id) for entity_id in dict.fromkeys(ids)]
+        delays = {entity_id: self.poller.delays() for _, _, entity_id in due}
+        attempts = dict.fromkeys(delays, 0)
+        last_status = dict.fromkeys(delays)
+        in_flight = {}
+
+        def check(entity_id, future) -> bool:
             try:
-                response = pet_api.find_pet_by_id(pet_id)
-                last_status = response.status_code
-
-                print(
-                    f"🔄 Attempt {attempt}/{retries} - Status: {response.status_code}"
-                )
-
-                if response.status_code == expected_status:
-                    print(f"✅ Pet {pet_id} is available")
-                    return response
-                elif response.status_code == 404:
-                    """handling 404 as a temporary error"""
-                    print(f"⚠️Pet {pet_id} not found (attempt {attempt}), continuing...")
+                response = future.result()
+                last_status[entity_id] = getattr(response, "status_code", None)
+                return bool(until(response))
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while due or in_flight:
+                now = clock()
+                while due and due[0][0] <= now and len(in_flight) < self.concurrency:
+                    entity_id = heapq.heappop(due)[2]
+                    attempts[entity_id] += 1
+                    in_flight[pool.submit(probe, entity_id)] = entity_id
+
+                if in_flight:
+                    timeout = None
+                    if due and len(in_flight) < self.concurrency:
+                        timeout = max(due[0][0] - now, 0)
+                    done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
                 else:
-                    print(f"❌ Unexpected status: {response.status_code}")
+                    Poller.sleep(max(due[0][0] - now, 0))
+                    done = ()
 
-            except Exception as e:
-                print(f"⚠️Error in attempt {attempt}: {e}")
+                for future in done:
+                    entity_id = in_flight.pop(future)
+                    succeeded = check(entity_id, future)
+                    now = clock()
+                    if succeeded or now >= deadline:
+                        stats = WaitStats(
+                            name, entity_id, attempts[entity_id], now - started,
+                            succeeded, last_status[entity_id],
+                        )
+                        Poller.record(stats)
+                        if succeeded:
+                            self.ready[entity_id] = stats
+                            yield entity_id, future.result()
+                        else:
+                            self.stragglers[entity_id] = stats
+                    else:
+                        next_probe = min(now + next(delays[entity_id]), deadline)
+                        heapq.heappush(due, (next_probe, next(order), entity_id))
+
+        self.elapsed = clock() - started
 
-            time.sleep(delay)
+    def summary(self) -> str:
+        lines = [
+            f"{len(self.ready)} ready, {len(self.stragglers)} stragglers"
+            + (f" in {self.elapsed:.2f}s" if self.elapsed is not None else "")
+        ]
+        lines += [f"  {stats!r}" for stats in self.stragglers.values()]
+        return "\n".join(lines)
 
-        """IMPROVED bug: taking into account API instability"""
-        raise AssertionError(
-            f"Pet {pet_id} not consistently available after {retries} retries. "
-            f"API is unstable - last status: {last_status}. "
-            f"This is expected behavior for test Petstore environment."
+    def raise_for_stragglers(self):
+        if self.stragglers:
+            raise AssertionError(f"Entities not consistent in {self.timeout}s: {self.summary()}")
+
+
+class PetWaiter:
+    @staticmethod
+    def wait_for_pet(
+        pet_api, pet_id: int, expected_status=200, retries=20, delay=3, until=None, timeout=None
+    ):
+        """
+        Waits until GET /pet/{pet_id} answers with expected_status (or until(response)
+        holds). retries * delay is kept as the overall deadline, delay as the backoff cap.
+        """
+        poller = Poller(timeout=timeout or retries * delay, max_delay=delay)
+        return poller.poll(
+            lambda: pet_api.find_pet_by_id(pet_id),
+            until or status_in(expected_status),
+            name="wait_for_pet",
+            target=pet_id,
         )
 
 
 class StoreWaiter:
     @staticmethod
     def wait_for_order(
-        store_api, order_id: int, expected_status=200, retries=20, delay=4
+        store_api, order_id: int, expected_status=200, retries=20, delay=4, until=None, timeout=None
     ):
         """
         Waits for order until its status code matches expected_status.
         Supports single int or list/tuple of acceptable statuses.
         """
-        for attempt in range(1, retries + 1):
-            response = store_api.get_info_about_placed_order_by_id(order_id)
-
-            if isinstance(expected_status, (list, tuple)):
-                if response.status_code in expected_status:
-                    return response
-            else:
-                if response.status_code == expected_status:
-                    return response
-
-            print(
-                f"[Retry {attempt}] Order {order_id} not found, got {response.status_code}"
-            )
-            time.sleep(delay)
-
-        raise AssertionError(
-            f"Order {order_id} not found after {retries} attempts. "
-            f"Expected {expected_status}, got last {response.status_code}"
+        poller = Poller(timeout=timeout or retries * delay, max_delay=delay)
+        return poller.poll(
+            lambda: store_api.get_info_about_placed_order_by_id(order_id),
+            until or status_in(expected_status),
+            name="wait_for_order",
+            target=order_id,
         )
 
 
@@ -75,23 +291,22 @@ class UpdateWaiter:
 
     @staticmethod
     def wait_for_update_success(pet_api, pet_id: int, update_func, *args, **kwargs):
+        """
+        Repeats update_func while it answers 404; any other status is returned
+        as is, and an exception (connection error, a bug) propagates at once
+        """
         max_retries = 5
-
-        for attempt in range(1, max_retries + 1):
-            print(f"🔄 Update attempt {attempt}/{max_retries} for pet {pet_id}")
-            """do updating"""
-            response = update_func(*args, **kwargs)
-
-            if response.status_code == 200:
-                print(f"✅ Update successful on attempt {attempt}")
-                return response
-            elif response.status_code == 404:
-                print(f"⚠️ Update failed with 404 (attempt {attempt}), retrying...")
-                time.sleep(2)
-            else:
-                print(f"❌ Update failed with status {response.status_code}")
-                return response
-
-        raise AssertionError(
-            f"Update failed after {max_retries} attempts due to API instability"
+        poller = Poller(timeout=max_retries * 2, max_delay=2)
+        response = poller.poll(
+            lambda: update_func(*args, **kwargs),
+            lambda response: response.status_code != 404,
+            name="wait_for_update_success",
+            target=pet_id,
+            raise_on_timeout=False,
+            retry_errors=False,
         )
+        if response.status_code == 404:
+            raise AssertionError(
+                f"Update failed after {max_retries * 2}s due to API instability"
+            )
+        return response